@@ -3,16 +3,21 @@
 Entry point with CLI commands: fetch, backtest, dashboard.
 """
 
+from __future__ import annotations
+
 import argparse
 import asyncio
+import json
+import math
+import os
 import sys
-import numpy as np
-
-from loguru import logger
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-from src.config import AppSettings, AssetConfig, StrategyConfig, TimeframeConfig, PaperConfig, load_config
-from src.data_loader import get_connection
-from src.fetchers.orchestrator import fetch_all_assets
+# Third-party and src.* imports live inside the command handlers so --help and
+# dashboard don't pay for pandas/duckdb/vectorbt/ccxt at startup
+if TYPE_CHECKING:
+    from src.config import AppSettings, AssetConfig, PaperConfig, StrategyConfig, TimeframeConfig
 
 # Store config globally after load_config() so subcommands can access them
 _settings: AppSettings
@@ -22,43 +27,193 @@ _timeframes: TimeframeConfig
 _paper: PaperConfig
 
 
-def cmd_fetch(args: argparse.Namespace) -> None:
-    """Fetch OHLCV data for configured assets."""
-    logger.info("Starting data fetch...")
-    import time
-    conn = get_connection(_settings)
+def _reload_strategy() -> None:
+    """Re-read strategy.toml into the module globals (cheap: _load_toml caches by mtime)."""
+    from src.config import PaperConfig, StrategyConfig
+
+    global _strategy, _paper
+    _strategy, _paper = StrategyConfig(), PaperConfig()
+
+
+def _emit_json(payload: dict) -> None:
+    """Write one JSON document to stdout (orjson when installed; NaN/inf become null)."""
+    try:
+        import orjson
+    except ImportError:
+        def finite(v):
+            if isinstance(v, float) and not math.isfinite(v):
+                return None
+            if isinstance(v, dict):
+                return {k: finite(x) for k, x in v.items()}
+            if isinstance(v, (list, tuple)):
+                return [finite(x) for x in v]
+            return v
+
+        print(json.dumps(finite(payload), default=str))
+        return
+
+    sys.stdout.flush()
+    sys.stdout.buffer.write(orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS, default=str))
+    sys.stdout.buffer.write(b"\n")
+    sys.stdout.flush()
+
+
+def _run_async(coro):
+    """Run a coroutine to completion, on uvloop when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro)
+    uvloop.install()
+    return asyncio.run(coro)
+
+
+async def _fetch_loop(conn, args: argparse.Namespace) -> None:
+    """Fetch once, or every ``args.interval`` minutes with --continuous, on one event loop.
+
+    A single ccxt client is kept open across cycles so its HTTP session and
+    loaded markets survive between fetches.
+    """
+    from loguru import logger
+
+    from src.fetchers.crypto_fetcher import create_exchange
+    from src.fetchers.orchestrator import fetch_all_assets
+    from src.signals.cache import refresh_signals
+
+    exchange = create_exchange(_assets.crypto_exchange) if _assets.crypto_symbols else None
     try:
         while True:
-            result = asyncio.run(fetch_all_assets(conn, _assets, _timeframes))
+            result = await fetch_all_assets(conn, _assets, _timeframes, exchange=exchange)
             print(f"\nFetch Summary: {result.success}/{result.total} succeeded, "
                   f"{result.rows_upserted} rows upserted in {result.elapsed_seconds:.1f}s")
             if result.failed > 0:
                 print(f"Failed: {result.failed} symbol/timeframe combinations")
-            
+
+            # Precompute cycle/Hurst for freshly updated backtest timeframes so backtests can load them
+            if result.updated and not args.no_signals:
+                backtest_tfs = set(_strategy.backtest_timeframes)
+                pairs = [(sym, tf) for sym, tf in result.updated if tf in backtest_tfs]
+                refresh_signals(conn, pairs, _strategy.cycle_lowpass_cutoff)
+
             if not getattr(args, "continuous", False):
                 break
-                
+
             logger.info(f"Waiting {args.interval} minutes before next fetch...")
-            time.sleep(args.interval * 60)
+            await asyncio.sleep(args.interval * 60)
+    finally:
+        if exchange is not None:
+            await exchange.close()
+
+
+def cmd_fetch(args: argparse.Namespace) -> None:
+    """Fetch OHLCV data for configured assets."""
+    from loguru import logger
+
+    from src.data_loader import get_connection
+
+    logger.info("Starting data fetch...")
+
+    conn = get_connection(_settings)
+    try:
+        _run_async(_fetch_loop(conn, args))
     except KeyboardInterrupt:
         logger.info("Continuous fetch stopped by user.")
     finally:
         conn.close()
 
 
+def _prepare_symbol(df, atr_values, signals, strategy, symbol=None, timeframe="", daily_ohlcv=None):
+    """Per-symbol indicator work for cmd_backtest; runs in a pool worker when --workers > 1.
+
+    Args:
+        df: One symbol's OHLCV rows as returned by query_ohlcv().
+        atr_values: That symbol's ATR, aligned with ``df``.
+        signals: Cached (phase_array, hurst_value), or None to compute them here.
+        strategy: StrategyConfig with the Bot C/D band settings and low-pass cutoff.
+        symbol: Symbol for the daily HTF cache file; None skips that cache.
+        timeframe: Timeframe for the daily HTF cache file.
+        daily_ohlcv: This symbol's daily candles from query_daily_ohlcv(), or
+            None to resample ``df`` here.
+
+    Returns:
+        (features, signals): feature name -> Series indexed by timestamp, and
+        (phase_array, hurst_value) or None if no cycle was found. Without a
+        cycle only the CHOP/ATR-Z/HTF features are returned.
+    """
+    import numpy as np
+    import pandas as pd
+
+    from src.backtest._kernels import sma
+    from src.backtest.bulk_runner import _calculate_bb_kc_series, _time_indexed
+    from src.signals.cache import compute_cycle_and_hurst, load_daily_htf
+    from src.signals.filters import calculate_atr_zscore_series
+    from src.signals.fractals import calculate_chop
+
+    df_time = _time_indexed(df)
+    features = {
+        "ltf": calculate_chop(df_time),
+        "vol_z": calculate_atr_zscore_series(df_time),
+    }
+
+    daily_df = load_daily_htf(df_time, symbol, timeframe, use_cache=symbol is not None, daily_ohlcv=daily_ohlcv)
+
+    # Previous day's CHOP and SMA-50 direction (shifted one day to avoid lookahead), mapped
+    # onto each bar via searchsorted. Slot 0 covers bars before the first day; slot d + 1 is
+    # day d, which sees day d - 1's values.
+    daily_close = daily_df["close_price"].to_numpy(np.float64)
+    n_days = len(daily_close)
+    htf_chop = np.full(n_days + 1, 50.0)
+    htf_dir = np.zeros(n_days + 1, dtype=np.int8)
+    if n_days > 1:
+        htf_chop[2:] = daily_df["chop"].to_numpy(np.float64)[:-1]
+        # Branchless +1/-1: the bool compare reinterpreted as int8, times two, minus one (NaN SMA -> -1)
+        above = np.greater(daily_close[:-1], daily_df["sma_50"].to_numpy(np.float64)[:-1]).view(np.int8)
+        htf_dir[2:] = (above << 1) - 1
+    day_slot = np.searchsorted(daily_df.index.values, df_time.index.values, side="right")
+
+    features["htf"] = pd.Series(htf_chop[day_slot], index=df_time.index)
+    features["htf_dir"] = pd.Series(htf_dir[day_slot], index=df_time.index)
+
+    if signals is None:
+        signals = compute_cycle_and_hurst(df, strategy.cycle_lowpass_cutoff)
+    if signals is None:
+        return features, None
+    features["phase"] = pd.Series(signals[0], index=df_time.index)
+
+    bbu, bbl, kcu, kcl = _calculate_bb_kc_series(df_time, strategy.bot_c_bb_window, strategy.bot_c_bb_std, strategy.bot_c_kc_window, strategy.bot_c_kc_multiplier)
+    features["bb_upper"] = bbu
+    features["bb_lower"] = bbl
+    features["kc_upper"] = kcu
+    features["kc_lower"] = kcl
+    features["atr_ma"] = pd.Series(sma(atr_values, strategy.bot_d_atr_ma_window), index=df_time.index).bfill()
+    return features, signals
+
+
 def cmd_backtest(args: argparse.Namespace) -> None:
     """Run backtesting with configured strategy."""
-    from pathlib import Path
+    from concurrent.futures import ProcessPoolExecutor
+    from itertools import repeat
 
-    from src.backtest.analyzer import export_trade_log_csv, find_best_params, recommend_config, update_strategy_config
-    from src.backtest.vbt_runner import run_backtest, run_parameter_sweep
-    from src.data_loader import query_ohlcv
-    from src.signals.cycles import detect_dominant_cycle_filtered
-    from src.signals.fractals import calculate_hurst, calculate_chop
-    from src.signals.filters import calculate_atr_zscore_series
+    import numpy as np
     import pandas as pd
-
-    from src.backtest.bulk_runner import _calculate_bb_kc_series
+    from loguru import logger
+
+    from src.backtest._kernels import _atr_sma_grouped, group_starts
+    from src.backtest.analyzer import (
+        export_trade_log_csv,
+        find_best_params,
+        recommend_config,
+        stream_sweep_results,
+        update_strategy_config,
+        write_table,
+    )
+    from src.backtest.vbt_runner import SIGNAL_DTYPE, iter_parameter_sweep, run_backtest, run_multires_sweep
+    from src.data_loader import get_connection, query_daily_ohlcv, query_ohlcv_multi
+    from src.signals.cache import lookup_cycle_and_hurst, store_cycle_and_hurst
 
     logger.info("Starting backtest...")
     conn = get_connection(_settings)
@@ -68,81 +223,123 @@ def cmd_backtest(args: argparse.Namespace) -> None:
         timeframe = args.timeframe
         vbt_freq = timeframe.replace("m", "min")
 
-        closes, highs, lows, atrs, ltf_metrics, htf_metrics = {}, {}, {}, {}, {}, {}
-        volatility_zscores, htf_directions, phase_arrays, hurst_values = {}, {}, {}, {}
-        bb_uppers, bb_lowers, kc_uppers, kc_lowers, atr_mas = {}, {}, {}, {}, {}
+        hurst_values = {}
 
+        # Every symbol in one query; rows come back contiguous per symbol, sorted by timestamp
+        raw = query_ohlcv_multi(conn, list(dict.fromkeys(symbols)), timeframe)
+        available = set(raw["symbol"]) if not raw.empty else set()
+        present = [sym for sym in symbols if sym in available]
         for sym in symbols:
-            df = query_ohlcv(conn, sym, timeframe)
-            if df.empty:
+            if sym not in present:
                 logger.warning(f"No data for {sym}/{timeframe}. Skipping.")
-                continue
-
-            df_time = df.copy()
-            df_time["timestamp"] = pd.to_datetime(df_time["timestamp"])
-            df_time.set_index("timestamp", inplace=True)
-
-            closes[sym] = df_time["close_price"]
-            highs[sym] = df_time["high_price"]
-            lows[sym] = df_time["low_price"]
-
-            tr1 = highs[sym] - lows[sym]
-            tr2 = (highs[sym] - closes[sym].shift(1)).abs()
-            tr3 = (lows[sym] - closes[sym].shift(1)).abs()
-            tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-            atrs[sym] = tr.rolling(window=14).mean().fillna(0.0)
-
-            ltf_metrics[sym] = calculate_chop(df_time)
-            volatility_zscores[sym] = calculate_atr_zscore_series(df_time)
-
-            daily_df = df_time.resample("1D").agg({
-                "open_price": "first", "high_price": "max", "low_price": "min",
-                "close_price": "last", "volume": "sum"
-            }).dropna()
-
-            daily_chop = calculate_chop(daily_df)
-            safe_daily_chop = daily_chop.shift(1)
-
-            daily_sma = daily_df["close_price"].rolling(window=50).mean()
-            daily_direction = np.where(daily_df["close_price"] > daily_sma, 1, -1)
-            safe_daily_dir = pd.Series(daily_direction, index=daily_df.index).shift(1)
+        if not present:
+            if args.json:
+                _emit_json({"error": "no data", "symbols": symbols, "timeframe": timeframe})
+            else:
+                print("No valid data available for any provided symbols.")
+            return
 
-            htf_metrics[sym] = safe_daily_chop.reindex(df_time.index).ffill().fillna(50.0)
-            htf_directions[sym] = safe_daily_dir.reindex(df_time.index).ffill().fillna(0)
+        # ATR for all symbols in one kernel call over the stacked arrays
+        starts = group_starts(raw["symbol"].to_numpy())
+        raw["atr"] = _atr_sma_grouped(
+            raw["high_price"].to_numpy(np.float64),
+            raw["low_price"].to_numpy(np.float64),
+            raw["close_price"].to_numpy(np.float64),
+            starts,
+            14,
+        )
+        raw["atr"] = raw["atr"].fillna(0.0)
+
+        segments = {raw["symbol"].iat[s]: (s, e) for s, e in zip(starts[:-1], starts[1:])}
+        cutoff = _strategy.cycle_lowpass_cutoff
+
+        # Daily HTF candles aggregated in the database; symbols it misses fall back to a pandas resample
+        daily_raw = query_daily_ohlcv(conn, present, timeframe)
+        daily_by_symbol = {
+            sym: frame.drop(columns="symbol").set_index("timestamp")
+            for sym, frame in daily_raw.groupby("symbol", sort=False)
+        }
+
+        jobs = []
+        for sym in present:
+            s, e = segments[sym]
+            df = raw.iloc[s:e].drop(columns="atr").reset_index(drop=True)
+            cached = None
+            if not args.no_cache:
+                cached = lookup_cycle_and_hurst(df, sym, timeframe, cutoff, conn=conn)
+            jobs.append((df, raw["atr"].to_numpy()[s:e], cached, None if args.no_cache else sym, daily_by_symbol.get(sym)))
+
+        # Symbols are independent; fan the indicator + cycle/Hurst work out when asked to
+        n_workers = (os.cpu_count() or 1) if args.workers <= 0 else args.workers
+        n_workers = max(1, min(n_workers, len(jobs)))
+        if n_workers > 1:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                dfs, atrs, cached_signals, cache_syms, dailies = zip(*jobs)
+                prepared = list(pool.map(
+                    _prepare_symbol, dfs, atrs, cached_signals, repeat(_strategy), cache_syms, repeat(timeframe), dailies
+                ))
+        else:
+            prepared = [
+                _prepare_symbol(df, atr, cached, _strategy, cache_sym, timeframe, daily)
+                for df, atr, cached, cache_sym, daily in jobs
+            ]
 
-            cycle_result = detect_dominant_cycle_filtered(df, cutoff=_strategy.cycle_lowpass_cutoff)
-            if cycle_result is None:
+        for sym, (df, _, cached, *_), (_, signals) in zip(present, jobs, prepared):
+            if signals is None:
                 logger.warning(f"No cycle found for {sym}")
                 continue
-            phase_arrays[sym] = pd.Series(cycle_result["phase_array"], index=df_time.index)
-            hurst_values[sym] = calculate_hurst(df)
-
-            bbu, bbl, kcu, kcl = _calculate_bb_kc_series(df_time, _strategy.bot_c_bb_window, _strategy.bot_c_bb_std, _strategy.bot_c_kc_window, _strategy.bot_c_kc_multiplier)
-            bb_uppers[sym] = bbu
-            bb_lowers[sym] = bbl
-            kc_uppers[sym] = kcu
-            kc_lowers[sym] = kcl
-            atr_mas[sym] = atrs[sym].rolling(window=_strategy.bot_d_atr_ma_window).mean().bfill()
-        if not closes:
-            print("No valid data available for any provided symbols.")
-            return
-
-        # Combine into 2D DataFrames
-        close_df = pd.DataFrame(closes).ffill().bfill()
-        high_df = pd.DataFrame(highs).ffill().bfill()
-        low_df = pd.DataFrame(lows).ffill().bfill()
-        atr_df = pd.DataFrame(atrs).fillna(0.0)
-        ltf_metric_df = pd.DataFrame(ltf_metrics).fillna(100.0)
-        htf_metric_df = pd.DataFrame(htf_metrics).fillna(50.0)
-        vol_z_df = pd.DataFrame(volatility_zscores).fillna(0.0)
-        htf_dir_df = pd.DataFrame(htf_directions).fillna(0.0)
-        phase_df = pd.DataFrame(phase_arrays).fillna(0.0)
-        
-        bb_upper_df = pd.DataFrame(bb_uppers).ffill().fillna(0.0)
-        bb_lower_df = pd.DataFrame(bb_lowers).ffill().fillna(0.0)
-        kc_upper_df = pd.DataFrame(kc_uppers).ffill().fillna(0.0)
-        kc_lower_df = pd.DataFrame(kc_lowers).ffill().fillna(0.0)
-        atr_ma_df = pd.DataFrame(atr_mas).ffill().fillna(0.0)
+            if cached is None and not args.no_cache:
+                store_cycle_and_hurst(df, sym, timeframe, cutoff, signals, conn=conn)
+            hurst_values[sym] = signals[1]
+
+        # One (layer, time, symbol) buffer over the union of timestamps. Each symbol's
+        # prices and indicators are written straight into its column; every 2-D frame
+        # below is a zero-copy view of one layer.
+        timestamps = raw["timestamp"].to_numpy()
+        common_idx = pd.DatetimeIndex(np.unique(timestamps), name="timestamp")
+        price_cols = ["close_price", "high_price", "low_price", "atr"]
+        feature_names = list(dict.fromkeys(name for sym_features, _ in prepared for name in sym_features))
+        layer = {name: k for k, name in enumerate(price_cols + feature_names)}
+        buf = np.full((len(layer), len(common_idx), len(present)), np.nan)
+        has = np.zeros((len(layer), len(present)), dtype=bool)
+        has[: len(price_cols)] = True
+        price_arrays = [raw[col].to_numpy(np.float64) for col in price_cols]
+
+        for j, (sym, (sym_features, _)) in enumerate(zip(present, prepared)):
+            s, e = segments[sym]
+            rows = np.searchsorted(common_idx.values, timestamps[s:e])
+            for k, values in enumerate(price_arrays):
+                buf[k, rows, j] = values[s:e]
+            for name, series in sym_features.items():
+                buf[layer[name], rows, j] = series.to_numpy()
+                has[layer[name], j] = True
+
+        def _layer(name: str) -> pd.DataFrame:
+            # Symbols without the feature (e.g. no cycle found) are left out, as before
+            k = layer.get(name)
+            if k is None:
+                return pd.DataFrame(index=common_idx)
+            mask = has[k]
+            if mask.all():
+                return pd.DataFrame(buf[k], index=common_idx, columns=present, copy=False)
+            return pd.DataFrame(buf[k][:, mask], index=common_idx, columns=[sym for sym, m in zip(present, mask) if m])
+
+        close_df = _layer("close_price").ffill().bfill()
+        high_df = _layer("high_price").ffill().bfill()
+        low_df = _layer("low_price").ffill().bfill()
+        atr_df = _layer("atr").fillna(0.0)
+
+        ltf_metric_df = _layer("ltf").fillna(100.0).astype(SIGNAL_DTYPE)
+        htf_metric_df = _layer("htf").fillna(50.0).astype(SIGNAL_DTYPE)
+        vol_z_df = _layer("vol_z").fillna(0.0).astype(SIGNAL_DTYPE)
+        htf_dir_df = _layer("htf_dir").fillna(0.0).astype(SIGNAL_DTYPE)
+        phase_df = _layer("phase").fillna(0.0).astype(SIGNAL_DTYPE)
+
+        bb_upper_df = _layer("bb_upper").ffill().fillna(0.0)
+        bb_lower_df = _layer("bb_lower").ffill().fillna(0.0)
+        kc_upper_df = _layer("kc_upper").ffill().fillna(0.0)
+        kc_lower_df = _layer("kc_lower").ffill().fillna(0.0)
+        atr_ma_df = _layer("atr_ma").ffill().fillna(0.0)
         
         # Strategy Routing: 0=Bot A (1D), 1=Bot B (LTFs)
         strategy_type = 2 if timeframe in _strategy.bot_c_timeframes else (
@@ -170,10 +367,14 @@ def cmd_backtest(args: argparse.Namespace) -> None:
             # Volatility-Adjusted Momentum Ranking (Phase 3.5)
             # 24-period lookback (e.g. 4 days on a 4H chart)
             lookback = 24
-            momentum = close_df.diff(lookback)
-            volatility_adjusted_momentum = momentum / atr_df
-            # Clean NaNs and Infs for Numba compatibility
-            rank_metric_df = volatility_adjusted_momentum.fillna(0).replace([np.inf, -np.inf], 0)
+            momentum = close_df.diff(lookback).to_numpy()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                volatility_adjusted_momentum = momentum / atr_df.to_numpy()
+            # Clean NaNs and Infs for Numba compatibility in one in-place pass
+            np.nan_to_num(volatility_adjusted_momentum, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+            rank_metric_df = pd.DataFrame(
+                volatility_adjusted_momentum.astype(SIGNAL_DTYPE), index=close_df.index, columns=close_df.columns
+            )
         else:
             # Extreme Oscillator Deviation (Bot B) - Use RSI
             delta = close_df.diff()
@@ -183,14 +384,14 @@ def cmd_backtest(args: argparse.Namespace) -> None:
             avg_loss = loss.ewm(com=_strategy.bot_b_rsi_period - 1, adjust=False).mean()
             rs = avg_gain / avg_loss
             rsi = 100 - (100 / (1 + rs))
-            rank_metric_df = rsi.bfill().fillna(50.0)
+            rank_metric_df = rsi.bfill().fillna(50.0).astype(SIGNAL_DTYPE)
         
         avg_hurst = np.mean(list(hurst_values.values()))
 
         if args.sweep:
-            # Parameter sweep mode
-            sweep_df = run_parameter_sweep(
-                close_df, high=high_df, low=low_df, atr=atr_df, phase_array=phase_df.values, hurst_value=avg_hurst,
+            # Parameter sweep mode: full grid, or coarse grid refined around the winner
+            sweep_kwargs = dict(
+                close=close_df, high=high_df, low=low_df, atr=atr_df, phase_array=phase_df.values, hurst_value=avg_hurst,
                 ltf_metric=ltf_metric_df.values, htf_metric=htf_metric_df.values, volatility_zscore=vol_z_df.values,
                 htf_direction=htf_dir_df.values, rank_metric=rank_metric_df.values,
                 hurst_range=_strategy.backtest_hurst_range,
@@ -218,32 +419,55 @@ def cmd_backtest(args: argparse.Namespace) -> None:
                 bot_d_take_profit_atr=_strategy.bot_d_take_profit_atr,
                 bot_d_stop_loss_atr=_strategy.bot_d_stop_loss_atr,
                 bot_d_max_holding_bars=_strategy.bot_d_max_holding_bars,
-                bot_d_rsi_oversold=_strategy.bot_d_rsi_oversold
+                bot_d_rsi_oversold=_strategy.bot_d_rsi_oversold,
+                workers=args.workers,
+                prune=args.prune,
             )
 
-            # Show top results
-            top = find_best_params(sweep_df, top_n=3)
-            print(f"\nParameter Sweep Results ({len(sweep_df)} combinations):")
-            print("Top 3 by Sharpe Ratio:")
-            for i, row in top.iterrows():
-                marker = " ← RECOMMENDED" if i == 0 else ""
-                print(f"  #{i + 1}: Hurst≥{row['hurst_threshold']:.2f}, "
-                      f"PhaseLong={row['phase_long']:.3f}, PhaseShort={row['phase_short']:.3f}, "
-                      f"Trail={row['trailing_multiplier']:.1f}xATR | "
-                      f"Sharpe={row['sharpe_ratio']:.4f}, Return={row['total_return']:.2f}%, "
-                      f"MaxDD={row['max_drawdown']:.2f}%, WinRate={row['win_rate']:.1f}%{marker}")
-
-            # Save sweep results
             output_dir = Path(_strategy.backtest_output_dir)
             output_dir.mkdir(parents=True, exist_ok=True)
             sym_label = "PORTFOLIO" if len(symbols) > 1 else symbols[0]
             safe_symbol = sym_label.replace("/", "_")
-            sweep_path = output_dir / f"sweep_{safe_symbol}_{timeframe}.csv"
-            sweep_df.to_csv(sweep_path, index=False)
+            sweep_path = output_dir / f"sweep_{safe_symbol}_{timeframe}.{args.format}"
+
+            if args.sweep_mode == "multires":
+                # Refinement needs the whole coarse stage, so this mode stays in memory
+                sweep_df = run_multires_sweep(**sweep_kwargs, refine_factor=args.refine_factor)
+                write_table(sweep_df, sweep_path)
+                top, n_results = find_best_params(sweep_df, top_n=3), len(sweep_df)
+            else:
+                # Grid mode streams rows to disk and keeps only the leaders in memory
+                top, n_results = stream_sweep_results(
+                    iter_parameter_sweep(**sweep_kwargs), sweep_path, fmt=args.format, top_n=3
+                )
+
+            rec = recommend_config(top)
+
+            if args.json:
+                # Machine-readable summary for scripted sweeps; never prompts
+                _emit_json({
+                    "top": top.to_dict(orient="records"),
+                    "recommendation": rec,
+                    "sweep_path": str(sweep_path),
+                    "combinations": n_results,
+                })
+                return
+
+            # Show top results
+            print(f"\nParameter Sweep Results ({n_results} combinations):")
+            print("Top 3 by Sharpe Ratio:")
+            cols = ["hurst_threshold", "phase_long", "phase_short", "trailing_multiplier",
+                    "sharpe_ratio", "total_return", "max_drawdown", "win_rate"]
+            for i, (h, pl, ps, tm, sr, tr, mdd, wr) in enumerate(zip(*(top[c].to_numpy() for c in cols))):
+                marker = " ← RECOMMENDED" if i == 0 else ""
+                print(f"  #{i + 1}: Hurst≥{h:.2f}, "
+                      f"PhaseLong={pl:.3f}, PhaseShort={ps:.3f}, "
+                      f"Trail={tm:.1f}xATR | "
+                      f"Sharpe={sr:.4f}, Return={tr:.2f}%, "
+                      f"MaxDD={mdd:.2f}%, WinRate={wr:.1f}%{marker}")
             print(f"\nFull results saved: {sweep_path}")
 
             # Show recommendation and prompt user to apply
-            rec = recommend_config(sweep_df)
             if rec:
                 print(f"\nRecommended config:")
                 print(f"  hurst_threshold     = {rec['hurst_threshold']}")
@@ -254,13 +478,18 @@ def cmd_backtest(args: argparse.Namespace) -> None:
                       f"Return={rec['total_return']:.2f}%, "
                       f"MaxDD={rec['max_drawdown']:.2f}%)")
 
-                try:
-                    answer = input("\nApply these parameters to strategy.toml? [y/N]: ").strip().lower()
-                except (EOFError, KeyboardInterrupt):
+                if not sys.stdin.isatty():
+                    # Scripted run: never block on a prompt
                     answer = "n"
+                else:
+                    try:
+                        answer = input("\nApply these parameters to strategy.toml? [y/N]: ").strip().lower()
+                    except (EOFError, KeyboardInterrupt):
+                        answer = "n"
 
                 if answer == "y":
                     if update_strategy_config(rec):
+                        _reload_strategy()
                         print("Strategy config updated successfully.")
                     else:
                         print("Failed to update config. Check logs for details.")
@@ -303,10 +532,24 @@ def cmd_backtest(args: argparse.Namespace) -> None:
             )
 
             if result is None:
-                print("Backtest failed.")
+                if args.json:
+                    _emit_json({"error": "backtest failed"})
+                else:
+                    print("Backtest failed.")
                 return
 
             sym_label = "PORTFOLIO" if len(symbols) > 1 else symbols[0]
+            output_dir = Path(_strategy.backtest_output_dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            safe_symbol = sym_label.replace("/", "_")
+            csv_path = output_dir / f"trades_{safe_symbol}_{timeframe}.csv"
+            export_trade_log_csv(result["portfolio"], str(csv_path), symbol=sym_label)
+
+            if args.json:
+                metrics = {k: v for k, v in result.items() if k != "portfolio"}
+                _emit_json({"symbol": sym_label, "timeframe": timeframe, **metrics, "trades_path": str(csv_path)})
+                return
+
             print(f"\nBacktest Results for {sym_label}/{timeframe}:")
             print(f"  Total Return: {result['total_return']:.2f}%")
             print(f"  Sharpe Ratio: {result['sharpe_ratio']:.4f}")
@@ -314,13 +557,6 @@ def cmd_backtest(args: argparse.Namespace) -> None:
             print(f"  Win Rate:     {result['win_rate']:.1f}%")
             print(f"  Total Trades: {result['total_trades']}")
 
-            # Export trade log
-            output_dir = Path(_strategy.backtest_output_dir)
-            output_dir.mkdir(parents=True, exist_ok=True)
-            safe_symbol = sym_label.replace("/", "_")
-            csv_path = output_dir / f"trades_{safe_symbol}_{timeframe}.csv"
-            export_trade_log_csv(result["portfolio"], str(csv_path), symbol=sym_label)
-
     finally:
         conn.close()
 
@@ -329,15 +565,68 @@ def cmd_dashboard(args: argparse.Namespace) -> None:
     """Launch Streamlit dashboard."""
     import subprocess
 
+    from loguru import logger
+
     logger.info("Launching dashboard...")
     subprocess.run([sys.executable, "-m", "streamlit", "run", "src/dashboard/app.py"], check=False)
 
 
-def main() -> None:
-    """Main entry point with CLI argument parsing."""
-    global _settings, _assets, _strategy, _timeframes, _paper
-    _settings, _assets, _strategy, _timeframes, _paper = load_config()
+def cmd_repl(args: argparse.Namespace) -> None:
+    """Run commands in a resident process so config and heavy imports load once."""
+    import cmd
+    import shlex
+
+    from loguru import logger
+
+    # Pay the vectorbt/numba import cost up front instead of on the first backtest
+    import src.backtest.vbt_runner  # noqa: F401
+
+    parser = _build_parser()
 
+    class RabbitShell(cmd.Cmd):
+        intro = "Rabbit-Quant shell. Type any CLI command (e.g. 'backtest -s BTC/USDT --sweep'), 'quit' to exit."
+        prompt = "rabbit> "
+
+        def default(self, line: str) -> bool:
+            try:
+                sub_args = parser.parse_args(shlex.split(line))
+            except SystemExit:
+                return False  # argparse already printed usage/error
+            if sub_args.command is None:
+                parser.print_help()
+            elif sub_args.command == "repl":
+                print("Already in the shell.")
+            else:
+                # Pick up strategy.toml edits (sweep "apply" or by hand) made since the last command
+                _reload_strategy()
+                try:
+                    sub_args.func(sub_args)
+                except KeyboardInterrupt:
+                    print("\nInterrupted.")
+                except Exception as e:
+                    logger.exception(f"Command failed: {e}")
+            return False
+
+        def do_help(self, arg: str) -> None:
+            parser.print_help()
+
+        def do_quit(self, arg: str) -> bool:
+            return True
+
+        do_exit = do_quit
+
+        def do_EOF(self, arg: str) -> bool:
+            print()
+            return True
+
+        def emptyline(self) -> bool:
+            return False
+
+    RabbitShell().cmdloop()
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser."""
     parser = argparse.ArgumentParser(
         prog="rabbit-quant",
         description="Quant-Rabbit Local Core — High-performance quantitative trading workstation",
@@ -348,6 +637,7 @@ def main() -> None:
     fetch_parser = subparsers.add_parser("fetch", help="Fetch OHLCV data for configured assets")
     fetch_parser.add_argument("--continuous", "-c", action="store_true", help="Run continuously in the background")
     fetch_parser.add_argument("--interval", "-i", type=int, default=5, help="Interval in minutes between fetches (default: 5)")
+    fetch_parser.add_argument("--no-signals", action="store_true", help="Skip precomputing cycle/Hurst signals after each fetch")
     fetch_parser.set_defaults(func=cmd_fetch)
 
     # backtest command
@@ -355,6 +645,13 @@ def main() -> None:
     backtest_parser.add_argument("--symbol", "-s", required=True, help="Symbol to backtest (e.g., AAPL)")
     backtest_parser.add_argument("--timeframe", "-t", default="1d", help="Timeframe (default: 1d)")
     backtest_parser.add_argument("--sweep", action="store_true", help="Run parameter sweep instead of single backtest")
+    backtest_parser.add_argument("--sweep-mode", default="grid", choices=["grid", "multires"], help="Sweep strategy: full grid or coarse-to-fine (default: grid)")
+    backtest_parser.add_argument("--refine-factor", type=int, default=3, help="Points per dimension in the multires refinement stage (default: 3)")
+    backtest_parser.add_argument("--prune", action="store_true", help="Skip sweep configs clearly dominated at the previous Hurst threshold")
+    backtest_parser.add_argument("--no-cache", action="store_true", help="Recompute cycle/Hurst signals instead of using the signal cache")
+    backtest_parser.add_argument("--format", default="parquet", choices=["parquet", "csv"], help="Sweep results file format (default: parquet)")
+    backtest_parser.add_argument("--json", action="store_true", help="Print a single JSON summary instead of the report (no prompts)")
+    backtest_parser.add_argument("--workers", "-w", type=int, default=1, help="Worker processes for per-symbol preprocessing and sweeps (0 = all cores, default: 1)")
     backtest_parser.set_defaults(func=cmd_backtest)
 
     # dashboard command
@@ -366,44 +663,89 @@ def main() -> None:
     bulk_parser.add_argument("--type", default="crypto", choices=["crypto", "stocks"], help="Asset type (default: crypto)")
     bulk_parser.add_argument("--sweep", action="store_true", help="Run parameter sweep for optimization")
     bulk_parser.add_argument("--fetch", action="store_true", help="Fetch latest data before running")
+    bulk_parser.add_argument("--workers", "-w", type=int, default=1, help="Worker processes for timeframes (0 = all cores, default: 1)")
+    bulk_parser.add_argument("--format", default="parquet", choices=["parquet", "csv"], help="Summary and trade log file format (default: parquet)")
     bulk_parser.set_defaults(func=cmd_backtest_all)
 
     # run-scheduler command
     scheduler_parser = subparsers.add_parser("run-scheduler", help="Run background data ingestion scheduler (Writer Service)")
     scheduler_parser.add_argument("--interval", "-i", type=int, default=5, help="Fetch interval in minutes (default: 5)")
+    scheduler_parser.add_argument("--no-signals", action="store_true", help="Skip precomputing cycle/Hurst signals after each fetch")
     scheduler_parser.set_defaults(func=cmd_run_scheduler)
 
+    # repl command
+    repl_parser = subparsers.add_parser("repl", help="Interactive shell that keeps config and imports loaded between commands")
+    repl_parser.set_defaults(func=cmd_repl)
+
+    return parser
+
+
+# Subcommands that read the config globals; --help, usage errors and dashboard skip load_config()
+_CONFIG_COMMANDS = {"fetch", "backtest", "backtest-all", "run-scheduler", "repl"}
+
+
+def main() -> None:
+    """Main entry point with CLI argument parsing."""
+    global _settings, _assets, _strategy, _timeframes, _paper
+
+    # Persist compiled Numba kernels (cache=True) in one per-user directory so they survive
+    # reinstalls and read-only installs. Set before any command imports numba; pool workers
+    # and the dashboard subprocess inherit it through the environment.
+    os.environ.setdefault("NUMBA_CACHE_DIR", str(Path.home() / ".cache" / "rabbit_quant_nb"))
+
+    parser = _build_parser()
     args = parser.parse_args()
 
     if args.command is None:
         parser.print_help()
         sys.exit(0)
 
+    if args.command in _CONFIG_COMMANDS:
+        from src.config import load_config
+
+        _settings, _assets, _strategy, _timeframes, _paper = load_config()
+
     args.func(args)
 
 
 def cmd_run_scheduler(args: argparse.Namespace) -> None:
     """Run the Writer Service scheduler."""
+    from loguru import logger
+
     from src.services.scheduler import run_scheduler_service
 
     logger.info(f"Launching Writer Service with {args.interval}m interval...")
-    asyncio.run(run_scheduler_service(_settings, _assets, _timeframes, _paper, interval=args.interval))
+    _run_async(run_scheduler_service(
+        _settings, _assets, _timeframes, _paper, interval=args.interval, precompute_signals=not args.no_signals
+    ))
 
 
 def cmd_backtest_all(args: argparse.Namespace) -> None:
     """Run bulk backtest command."""
-    from src.backtest.bulk_runner import run_bulk_backtest
-
-    # Run async function
-    asyncio.run(run_bulk_backtest(
-        _settings,
-        _assets,
-        _strategy,
-        _timeframes,
-        asset_type=args.type,
-        sweep=args.sweep,
-        fetch=args.fetch
-    ))
+    from concurrent.futures import ProcessPoolExecutor
+
+    from src.backtest.bulk_runner import init_bulk_worker, run_bulk_backtest
+
+    # One warm pool for the whole run instead of paying fork+import per timeframe
+    n_workers = (os.cpu_count() or 1) if args.workers <= 0 else args.workers
+    pool = ProcessPoolExecutor(
+        max_workers=n_workers, initializer=init_bulk_worker, initargs=(_settings, _strategy)
+    ) if n_workers > 1 else None
+    try:
+        _run_async(run_bulk_backtest(
+            _settings,
+            _assets,
+            _strategy,
+            _timeframes,
+            asset_type=args.type,
+            sweep=args.sweep,
+            fetch=args.fetch,
+            executor=pool,
+            output_format=args.format,
+        ))
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True)
 
 
 if __name__ == "__main__":
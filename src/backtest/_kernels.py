@@ -0,0 +1,261 @@
+"""Numba kernels and NumPy array helpers shared by the backtest entry points.
+
+Architecture boundary: functions take contiguous float64 numpy arrays
+and return numpy arrays; callers own pandas conversion and indexing.
+"""
+
+import numba
+import numpy as np
+
+
+@numba.njit(cache=True)
+def _true_range_nb(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True Range: max(h-l, |h-prev_c|, |l-prev_c|) with a NaN-skipping max.
+
+    Matches ``concat([...], axis=1).max(axis=1)``: a bar is NaN only when all
+    three legs are, and the first bar (no previous close) is ``h-l``.
+    """
+    n = len(close)
+    tr = np.empty(n)
+    for i in range(n):
+        best = high[i] - low[i]
+        if i > 0:
+            for v in (abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1])):
+                if np.isnan(best) or v > best:
+                    best = v
+        tr[i] = best
+    return tr
+
+
+@numba.njit(cache=True)
+def _rolling_mean_nb(values: np.ndarray, period: int) -> np.ndarray:
+    """Running-sum rolling mean, O(1) per bar.
+
+    Same semantics as sma(): the first ``period - 1`` outputs are NaN, and
+    so is any window containing a NaN (tracked by count, so the sum recovers
+    once the NaN leaves the window).
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    if period <= 0:
+        return out
+
+    total = 0.0
+    nans = 0
+    for i in range(n):
+        v = values[i]
+        if np.isnan(v):
+            nans += 1
+        else:
+            total += v
+        if i >= period:
+            old = values[i - period]
+            if np.isnan(old):
+                nans -= 1
+            else:
+                total -= old
+        if i >= period - 1 and nans == 0:
+            out[i] = total / period
+    return out
+
+
+@numba.njit(cache=True)
+def _chop_from_tr(high: np.ndarray, low: np.ndarray, tr: np.ndarray, period: int) -> np.ndarray:
+    """CHOP from a precomputed True Range, O(1) amortized per bar.
+
+    ``100 * log10(sum(TR) / (max(high) - min(low))) / log10(period)`` with a
+    running TR sum plus NaN count, and monotonic index deques for the rolling
+    high max / low min. Matches the pandas ``rolling(period)`` sum/max/min
+    formulation: the first ``period - 1`` bars, windows holding a NaN and
+    zero-range windows are NaN.
+    """
+    n = len(tr)
+    out = np.full(n, np.nan)
+    if period <= 0 or n < period:
+        return out
+
+    log_period = np.log10(period)
+    # Deques hold indices of valid bars only: a window with a NaN bar is skipped anyway
+    max_q = np.empty(n, dtype=np.int64)
+    min_q = np.empty(n, dtype=np.int64)
+    max_head = max_tail = min_head = min_tail = 0
+    tr_sum = 0.0
+    nans = 0
+    for i in range(n):
+        if np.isnan(tr[i]) or np.isnan(high[i]) or np.isnan(low[i]):
+            nans += 1
+        else:
+            tr_sum += tr[i]
+            while max_tail > max_head and high[max_q[max_tail - 1]] <= high[i]:
+                max_tail -= 1
+            max_q[max_tail] = i
+            max_tail += 1
+            while min_tail > min_head and low[min_q[min_tail - 1]] >= low[i]:
+                min_tail -= 1
+            min_q[min_tail] = i
+            min_tail += 1
+
+        if i >= period:
+            j = i - period
+            if np.isnan(tr[j]) or np.isnan(high[j]) or np.isnan(low[j]):
+                nans -= 1
+            else:
+                tr_sum -= tr[j]
+            while max_head < max_tail and max_q[max_head] <= j:
+                max_head += 1
+            while min_head < min_tail and min_q[min_head] <= j:
+                min_head += 1
+
+        if i < period - 1 or nans > 0:
+            continue
+        range_hl = high[max_q[max_head]] - low[min_q[min_head]]
+        if range_hl != 0.0:
+            out[i] = 100.0 * np.log10(tr_sum / range_hl) / log_period
+    return out
+
+
+@numba.njit(cache=True)
+def _atr_sma(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    """True Range fused with its simple rolling mean.
+
+    Matches ``concat([h-l, |h-c[-1]|, |l-c[-1]|]).max(axis=1).rolling(period).mean()``:
+    the first bar's TR is ``h-l``, the first ``period - 1`` outputs are NaN and
+    a NaN bar only blanks the windows that contain it.
+    """
+    return _rolling_mean_nb(_true_range_nb(high, low, close), period)
+
+
+@numba.njit(cache=True)
+def _atr_sma_grouped(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray, starts: np.ndarray, period: int
+) -> np.ndarray:
+    """_atr_sma() over several symbols stacked end to end, in one call.
+
+    ``starts`` holds each symbol's first row plus a final ``len(close)``
+    sentinel; every segment is treated as an independent series.
+    """
+    out = np.full(len(close), np.nan)
+    for g in range(len(starts) - 1):
+        s = starts[g]
+        e = starts[g + 1]
+        out[s:e] = _atr_sma(high[s:e], low[s:e], close[s:e], period)
+    return out
+
+
+@numba.njit(cache=True, error_model="numpy")
+def _rolling_zscore_nb(values: np.ndarray, period: int) -> np.ndarray:
+    """``(x - rolling mean) / rolling std`` with running Welford add/remove updates.
+
+    Sample (ddof=1) standard deviation, as pandas. Warm-up bars and windows
+    holding a NaN are NaN; NaNs are counted rather than accumulated, so the
+    mean and variance recover once the NaN leaves the window.
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    if period <= 1:
+        return out
+
+    nobs = 0
+    nans = 0
+    mean = 0.0
+    ssqdm = 0.0
+    for i in range(n):
+        v = values[i]
+        if np.isnan(v):
+            nans += 1
+        else:
+            nobs += 1
+            delta = v - mean
+            mean += delta / nobs
+            ssqdm += (nobs - 1) * delta * delta / nobs
+
+        if i >= period:
+            old = values[i - period]
+            if np.isnan(old):
+                nans -= 1
+            elif nobs == 1:
+                nobs = 0
+                mean = 0.0
+                ssqdm = 0.0
+            else:
+                nobs -= 1
+                delta = old - mean
+                mean -= delta / nobs
+                ssqdm -= (nobs + 1) * delta * delta / nobs
+
+        if i >= period - 1 and nans == 0:
+            out[i] = (v - mean) / np.sqrt(max(ssqdm, 0.0) / (period - 1))
+    return out
+
+
+@numba.njit(cache=True)
+def _ltf_indicators(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray, atr_period: int, chop_period: int, z_period: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ATR, CHOP and ATR z-score from one shared True Range pass.
+
+    Matches _atr_sma(), fractals.calculate_chop() and
+    filters.calculate_atr_zscore_series() before their NaN fills: warm-up
+    bars, windows holding a NaN and zero-range CHOP windows are NaN. Every
+    rolling statistic is a running accumulator, so each bar costs O(1).
+    """
+    tr = _true_range_nb(high, low, close)
+    atr = _rolling_mean_nb(tr, atr_period)
+    return atr, _chop_from_tr(high, low, tr, chop_period), _rolling_zscore_nb(atr, z_period)
+
+
+@numba.njit(cache=True, parallel=True)
+def _ltf_indicators_grouped(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    starts: np.ndarray,
+    atr_period: int,
+    chop_period: int,
+    z_period: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """_ltf_indicators() over several symbols stacked end to end, one symbol per thread.
+
+    ``starts`` holds each symbol's first row plus a final ``len(close)`` sentinel.
+    """
+    n = len(close)
+    atr = np.full(n, np.nan)
+    chop = np.full(n, np.nan)
+    z = np.full(n, np.nan)
+    for g in numba.prange(len(starts) - 1):
+        s = starts[g]
+        e = starts[g + 1]
+        seg_atr, seg_chop, seg_z = _ltf_indicators(high[s:e], low[s:e], close[s:e], atr_period, chop_period, z_period)
+        atr[s:e] = seg_atr
+        chop[s:e] = seg_chop
+        z[s:e] = seg_z
+    return atr, chop, z
+
+
+def sma(values: np.ndarray, window: int) -> np.ndarray:
+    """Simple moving average via the cumulative-sum difference.
+
+    Matches ``Series.rolling(window).mean()``: the first ``window - 1``
+    outputs are NaN, and so is any window containing a NaN.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    out = np.full(n, np.nan)
+    if window <= 0 or n < window:
+        return out
+
+    nan_mask = np.isnan(values)
+    csum = np.concatenate(([0.0], np.cumsum(np.where(nan_mask, 0.0, values))))
+    nan_count = np.concatenate(([0], np.cumsum(nan_mask)))
+    window_sum = csum[window:] - csum[:-window]
+    window_nans = nan_count[window:] - nan_count[:-window]
+    out[window - 1:] = np.where(window_nans > 0, np.nan, window_sum / window)
+    return out
+
+
+def group_starts(keys: np.ndarray) -> np.ndarray:
+    """Segment boundaries (plus end sentinel) for a sorted/contiguous key array."""
+    if len(keys) == 0:
+        return np.zeros(1, dtype=np.int64)
+    change = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    return np.concatenate(([0], change, [len(keys)])).astype(np.int64)
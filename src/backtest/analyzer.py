@@ -8,8 +8,14 @@ Architecture boundary: reads backtest results, computes metrics, exports CSV.
 Does NOT own backtesting execution or data fetching.
 """
 
+import csv
+import heapq
+import math
+import re
+from collections.abc import Iterable
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 from loguru import logger
 
@@ -29,24 +35,26 @@ def extract_trade_log(portfolio) -> pd.DataFrame:
         size, entry_price, entry_value_usdt, exit_price, pnl, return_pct.
     """
     try:
-        trades = portfolio.trades.records_readable
-        if trades.empty:
+        # Raw structured records; column/timestamp labels are resolved with one take() each
+        rec = portfolio.trades.records_arr
+        if len(rec) == 0:
             return pd.DataFrame(columns=[
                 "symbol", "entry_time", "exit_time", "direction",
                 "size", "entry_price", "entry_value_usdt", "exit_price", "pnl", "return_pct",
             ])
 
+        index = portfolio.wrapper.index
         log = pd.DataFrame({
-            "symbol": trades["Column"].values,
-            "entry_time": trades["Entry Timestamp"].values,
-            "exit_time": trades["Exit Timestamp"].values,
-            "direction": trades["Direction"].values,
-            "size": trades["Size"].values,
-            "entry_price": trades["Avg Entry Price"].values,
-            "entry_value_usdt": trades["Size"].values * trades["Avg Entry Price"].values,
-            "exit_price": trades["Avg Exit Price"].values,
-            "pnl": trades["PnL"].values,
-            "return_pct": trades["Return"].values * 100,
+            "symbol": portfolio.wrapper.columns.take(rec["col"]).to_numpy(dtype=object),
+            "entry_time": index.take(rec["entry_idx"]).to_numpy(),
+            "exit_time": index.take(rec["exit_idx"]).to_numpy(),
+            "direction": np.where(rec["direction"] == 0, "Long", "Short").astype(object),
+            "size": rec["size"],
+            "entry_price": rec["entry_price"],
+            "entry_value_usdt": rec["size"] * rec["entry_price"],
+            "exit_price": rec["exit_price"],
+            "pnl": rec["pnl"],
+            "return_pct": rec["return"] * 100,
         })
         return log
 
@@ -55,12 +63,35 @@ def extract_trade_log(portfolio) -> pd.DataFrame:
         return pd.DataFrame()
 
 
+def write_table(df: pd.DataFrame, path: str | Path) -> None:
+    """Write a frame with Arrow's C++ writers: zstd Parquet for ``.parquet`` paths, CSV otherwise.
+
+    Falls back to pandas.to_csv for frames Arrow cannot convert (e.g. mixed object columns).
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+
+    path = Path(path)
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if path.suffix == ".parquet":
+            pq.write_table(table, path, compression="zstd")
+        else:
+            pacsv.write_csv(table, str(path))
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+        if path.suffix == ".parquet":
+            raise
+        logger.debug(f"Arrow CSV writer rejected {path.name} ({e}); using pandas")
+        df.to_csv(path, index=False)
+
+
 def export_trade_log_csv(portfolio, output_path: str, symbol: str = "") -> str | None:
     """Export trade log to CSV file.
 
     Args:
         portfolio: VectorBT Portfolio object.
-        output_path: Path for the CSV file.
+        output_path: Path for the CSV file (a ``.parquet`` suffix writes zstd Parquet).
         symbol: Fallback symbol name if not a multi-asset portfolio.
 
     Returns:
@@ -75,7 +106,7 @@ def export_trade_log_csv(portfolio, output_path: str, symbol: str = "") -> str |
 
         path = Path(output_path)
         path.parent.mkdir(parents=True, exist_ok=True)
-        log.to_csv(path, index=False)
+        write_table(log, path)
         logger.info(f"Trade log exported: {path} ({len(log)} trades)")
         return str(path)
 
@@ -84,6 +115,32 @@ def export_trade_log_csv(portfolio, output_path: str, symbol: str = "") -> str |
         return None
 
 
+def portfolio_metrics(portfolio, group_by=None) -> pd.DataFrame:
+    """Headline metrics per column (or group) from VectorBT's direct metric accessors.
+
+    Reports what the matching ``stats()`` fields would (percentages, win rate
+    and profit factor over closed trades, trade count including open ones)
+    without stats()' full metric pass. ``group_by`` is forwarded to the
+    accessors; None keeps the portfolio's own grouping, False splits it per column.
+
+    Returns:
+        DataFrame with one row per column/group: total_return, sharpe_ratio,
+        max_drawdown, win_rate, total_trades, profit_factor.
+    """
+    trades = portfolio.get_trades(group_by=group_by)
+    total_return = portfolio.total_return(group_by=group_by)
+    metrics = {
+        "total_return": total_return * 100,
+        "sharpe_ratio": portfolio.sharpe_ratio(group_by=group_by),
+        "max_drawdown": np.abs(portfolio.max_drawdown(group_by=group_by)) * 100,
+        "win_rate": trades.closed.win_rate() * 100,
+        "total_trades": trades.count(),
+        "profit_factor": trades.closed.profit_factor(),
+    }
+    index = total_return.index if isinstance(total_return, pd.Series) else None
+    return pd.DataFrame({name: np.atleast_1d(np.asarray(value)) for name, value in metrics.items()}, index=index)
+
+
 def compute_metrics(portfolio) -> dict:
     """Compute performance metrics from VectorBT portfolio.
 
@@ -91,13 +148,13 @@ def compute_metrics(portfolio) -> dict:
         Dict with total_return, sharpe_ratio, max_drawdown, win_rate, total_trades.
     """
     try:
-        stats = portfolio.stats()
+        row = portfolio_metrics(portfolio).iloc[0]
         return {
-            "total_return": float(stats.get("Total Return [%]", 0.0)),
-            "sharpe_ratio": float(stats.get("Sharpe Ratio", 0.0)),
-            "max_drawdown": float(stats.get("Max Drawdown [%]", 0.0)),
-            "win_rate": float(stats.get("Win Rate [%]", 0.0)),
-            "total_trades": int(stats.get("Total Trades", 0)),
+            "total_return": float(row["total_return"]),
+            "sharpe_ratio": float(row["sharpe_ratio"]),
+            "max_drawdown": float(row["max_drawdown"]),
+            "win_rate": float(row["win_rate"]),
+            "total_trades": int(row["total_trades"]),
         }
     except Exception as e:
         logger.error(f"Metrics computation failed: {e}")
@@ -110,6 +167,28 @@ def compute_metrics(portfolio) -> dict:
         }
 
 
+def compute_asset_metrics(portfolio) -> pd.DataFrame:
+    """Compute per-asset metrics for a (grouped) multi-asset VectorBT portfolio.
+
+    All columns are simulated in the same from_signals() call; this breaks the
+    grouped result back out per column with one vectorized pass of portfolio_metrics().
+
+    Returns:
+        DataFrame with one row per asset: symbol, total_return, sharpe_ratio,
+        max_drawdown, win_rate, total_trades, profit_factor.
+    """
+    columns = ["symbol", "total_return", "sharpe_ratio", "max_drawdown", "win_rate", "total_trades", "profit_factor"]
+    try:
+        metrics = portfolio_metrics(portfolio, group_by=False)
+        result = metrics.drop(columns="total_trades").astype(float).fillna(0.0)
+        result["total_trades"] = metrics["total_trades"].fillna(0).astype(int)
+        result.insert(0, "symbol", metrics.index.astype(str))
+        return result[columns].reset_index(drop=True)
+    except Exception as e:
+        logger.error(f"Per-asset metrics computation failed: {e}")
+        return pd.DataFrame(columns=columns)
+
+
 def find_best_params(sweep_results: pd.DataFrame, top_n: int = 3) -> pd.DataFrame:
     """Rank parameter sweep results by Sharpe Ratio.
 
@@ -129,8 +208,94 @@ def find_best_params(sweep_results: pd.DataFrame, top_n: int = 3) -> pd.DataFram
         logger.warning("No parameter combinations produced trades")
         return sweep_results.head(top_n)
 
-    ranked = active.sort_values("sharpe_ratio", ascending=False).head(top_n)
-    return ranked.reset_index(drop=True)
+    # Partial selection: O(N) to find the top_n, then sort only those. NaN ranks
+    # last and ties keep sweep order, as a stable descending sort would.
+    sharpe = np.nan_to_num(active["sharpe_ratio"].to_numpy(dtype=np.float64), nan=-np.inf)
+    k = min(max(top_n, 0), sharpe.size)
+    if k < sharpe.size:
+        kth = np.partition(-sharpe, k - 1)[k - 1] if k else -np.inf
+        candidates = np.flatnonzero(-sharpe <= kth)
+    else:
+        candidates = np.arange(sharpe.size)
+    order = candidates[np.argsort(-sharpe[candidates], kind="stable")[:k]]
+    return active.iloc[order].reset_index(drop=True)
+
+
+def stream_sweep_results(
+    rows: Iterable[dict],
+    output_path: str | Path,
+    fmt: str = "parquet",
+    top_n: int = 3,
+    batch_size: int = 256,
+) -> tuple[pd.DataFrame, int]:
+    """Write sweep rows to disk as they arrive, keeping only the best rows in memory.
+
+    Args:
+        rows: Row dicts, e.g. from iter_parameter_sweep().
+        output_path: Destination file.
+        fmt: "parquet" (zstd, written in row groups of batch_size) or "csv".
+        top_n: Number of ranked rows to retain.
+        batch_size: Rows buffered per parquet row group.
+
+    Returns:
+        (top rows ranked like find_best_params(), total row count).
+    """
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Min-heap of (sharpe, -seq, row) holding the top_n traded rows; ties keep the earlier row
+    heap: list[tuple[float, int, dict]] = []
+    head: list[dict] = []  # Fallback when nothing traded, mirroring find_best_params()
+    count = 0
+    batch: list[dict] = []
+    csv_file = csv_writer = parquet_writer = None
+
+    def flush() -> None:
+        nonlocal parquet_writer
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pylist(batch)
+        if parquet_writer is None:
+            parquet_writer = pq.ParquetWriter(path, table.schema, compression="zstd")
+        parquet_writer.write_table(table)
+        batch.clear()
+
+    try:
+        for row in rows:
+            if fmt == "csv":
+                if csv_writer is None:
+                    csv_file = open(path, "w", newline="")
+                    csv_writer = csv.DictWriter(csv_file, fieldnames=list(row))
+                    csv_writer.writeheader()
+                csv_writer.writerow(row)
+            else:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    flush()
+
+            if len(head) < top_n:
+                head.append(row)
+            if row["total_trades"] > 0:
+                sharpe = float(row["sharpe_ratio"])
+                item = (-math.inf if math.isnan(sharpe) else sharpe, -count, row)
+                if len(heap) < top_n:
+                    heapq.heappush(heap, item)
+                else:
+                    heapq.heappushpop(heap, item)
+            count += 1
+
+        if batch:
+            flush()
+    finally:
+        if csv_file is not None:
+            csv_file.close()
+        if parquet_writer is not None:
+            parquet_writer.close()
+
+    logger.info(f"Sweep results streamed: {path} ({count} rows)")
+    retained = [row for _, _, row in sorted(heap, reverse=True)] if heap else head
+    return find_best_params(pd.DataFrame(retained), top_n=top_n), count
 
 
 def recommend_config(sweep_results: pd.DataFrame) -> dict | None:
@@ -152,8 +317,16 @@ def recommend_config(sweep_results: pd.DataFrame) -> dict | None:
     }
 
 
+# Matches "key = value  # comment" and keeps indentation, spacing, comment and line ending
+_TOML_ASSIGNMENT = re.compile(r"^(?P<indent>\s*)(?P<key>[A-Za-z0-9_-]+)(?P<eq>\s*=\s*)(?P<value>[^#\r\n]*?)(?P<tail>\s*(?:#.*)?\r?\n?)$")
+
+
 def update_strategy_config(recommendation: dict) -> bool:
-    """Update config/strategy.toml with recommended parameters."""
+    """Update config/strategy.toml with recommended parameters.
+
+    Only the exact ``[hurst] threshold`` and ``[risk] trailing_atr_multiplier``
+    keys are rewritten; comments, spacing and line endings are preserved.
+    """
     config_path = CONFIG_DIR / "strategy.toml"
 
     try:
@@ -161,28 +334,25 @@ def update_strategy_config(recommendation: dict) -> bool:
             logger.error(f"Strategy config not found: {config_path}")
             return False
 
-        content = config_path.read_text()
+        updates = {
+            ("hurst", "threshold"): recommendation["hurst_threshold"],
+            ("risk", "trailing_atr_multiplier"): recommendation["trailing_multiplier"],
+        }
 
-        # Update threshold value in TOML
-        lines = content.split("\n")
         updated_lines = []
         current_section = ""
-
-        for line in lines:
+        for line in config_path.read_text().splitlines(keepends=True):
             trimmed = line.strip()
             if trimmed.startswith("[") and trimmed.endswith("]"):
-                current_section = trimmed
-
-            if current_section == "[hurst]" and trimmed.startswith("threshold"):
-                updated_lines.append(f"threshold = {recommendation['hurst_threshold']}")
-            elif current_section == "[risk]" and trimmed.startswith("trailing_atr_multiplier"):
-                updated_lines.append(f"trailing_atr_multiplier = {recommendation['trailing_multiplier']}")
-            elif current_section == "[cycle]" and trimmed.startswith("phase_long"): # if we added it
-                 updated_lines.append(line) # keep as is or update if we add to toml
+                current_section = trimmed[1:-1].strip()
             else:
-                updated_lines.append(line)
+                match = _TOML_ASSIGNMENT.match(line)
+                if match and (current_section, match["key"]) in updates:
+                    value = updates[current_section, match["key"]]
+                    line = f"{match['indent']}{match['key']}{match['eq']}{value}{match['tail']}"
+            updated_lines.append(line)
 
-        config_path.write_text("\n".join(updated_lines))
+        config_path.write_text("".join(updated_lines))
         logger.info(f"Strategy config updated: {config_path}")
         return True
 
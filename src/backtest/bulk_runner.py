@@ -4,36 +4,50 @@ Orchestrates the execution of backtests across all configured symbols and timefr
 providing a consolidated summary report and leaderboard.
 """
 
+import asyncio
 import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from multiprocessing.util import Finalize
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
 from loguru import logger
 
-from src.backtest.analyzer import export_trade_log_csv
-from src.backtest.vbt_runner import run_backtest
+from src.backtest._kernels import _atr_sma, _ltf_indicators_grouped, group_starts, sma
+from src.backtest.analyzer import compute_asset_metrics, export_trade_log_csv, write_table
+from src.backtest.vbt_runner import SIGNAL_DTYPE, run_backtest
 from src.config import AppSettings, AssetConfig, StrategyConfig, TimeframeConfig
-from src.data_loader import get_connection, query_ohlcv
+from src.data_loader import close_shared_connections, get_connection, get_shared_connection, query_ohlcv_multi
 from src.fetchers.orchestrator import fetch_all_assets
 from src.signals.cycles import detect_dominant_cycle_filtered
-from src.signals.filters import calculate_atr_zscore_series
+from src.signals.cache import _resample_daily
 from src.signals.fractals import calculate_chop, calculate_rolling_hurst
 
 
-def _calculate_atr_series(df: pd.DataFrame, period: int = 14) -> pd.Series:
-    """Calculate Average True Range (ATR) series."""
-    high = df["high_price"]
-    low = df["low_price"]
-    close = df["close_price"]
+def _time_indexed(df: pd.DataFrame) -> pd.DataFrame:
+    """Re-index an OHLCV frame by its timestamp column.
+
+    Builds the DatetimeIndex once straight from the column and relabels the
+    remaining columns, instead of copying the whole frame first.
+    """
+    index = pd.DatetimeIndex(df["timestamp"], name="timestamp")
+    return df.drop(columns="timestamp").set_axis(index, axis=0)
 
-    tr1 = high - low
-    tr2 = (high - close.shift(1)).abs()
-    tr3 = (low - close.shift(1)).abs()
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
 
-    atr = tr.rolling(window=period).mean()
-    return atr.bfill()
+def _calculate_atr_series(df: pd.DataFrame, period: int = 14) -> pd.Series:
+    """Calculate Average True Range (ATR) series.
+
+    True Range and its rolling mean run in one fused kernel pass over the raw
+    arrays; the warm-up NaNs are back-filled as before.
+    """
+    atr = _atr_sma(
+        df["high_price"].to_numpy(np.float64),
+        df["low_price"].to_numpy(np.float64),
+        df["close_price"].to_numpy(np.float64),
+        period,
+    )
+    return pd.Series(atr, index=df.index).bfill()
 
 
 def _calculate_rsi_series(df: pd.DataFrame, period: int = 14) -> pd.Series:
@@ -72,6 +86,312 @@ def _calculate_bb_kc_series(df: pd.DataFrame, bb_window: int = 20, bb_std: float
     return bb_upper.bfill(), bb_lower.bfill(), kc_upper.bfill(), kc_lower.bfill()
 
 
+def _run_timeframe(
+    conn,
+    strategy: StrategyConfig,
+    symbols: list[str],
+    tf: str,
+    output_format: str = "parquet",
+    raw: pd.DataFrame | None = None,
+) -> tuple[list[dict], list[pd.DataFrame], list[tuple[str, str]]]:
+    """Build the indicator matrices for one timeframe and backtest every active bot.
+
+    Trade logs are written as ``output_format`` ("parquet" or "csv") files.
+    ``raw`` is the timeframe's bars if already loaded (see query_ohlcv_multi());
+    otherwise they are queried from ``conn``.
+
+    Returns:
+        (summary rows, per-symbol metric frames, skipped (timeframe, reason) pairs).
+    """
+    results: list[dict] = []
+    asset_results: list[pd.DataFrame] = []
+    skipped_timeframes: list[tuple[str, str]] = []
+
+    logger.info(f"Processing timeframe: {tf}")
+
+    # Structure of arrays: feature name -> one float64 column per eligible symbol, in ``syms`` order
+    syms: list[str] = []
+    times: list[np.ndarray] = []
+    features: dict[str, list[np.ndarray]] = {}
+
+    missing_count = 0
+    insufficient_count = 0
+    cycle_fail_count = 0
+
+    # 1. Fetch every symbol in one query (rows come back contiguous per symbol), then
+    # calculate indicators symbol by symbol
+    if raw is None:
+        raw = query_ohlcv_multi(conn, list(dict.fromkeys(symbols)), tf)
+    starts = group_starts(raw["symbol"].to_numpy()) if not raw.empty else np.zeros(1, dtype=np.int64)
+    segments = {raw["symbol"].iat[s]: (s, e) for s, e in zip(starts[:-1], starts[1:])}
+
+    # ATR(14), CHOP(14) and the ATR z-score for every symbol from one fused, symbol-parallel kernel call
+    ltf_atr = ltf_chop = ltf_vol_z = np.empty(0)
+    if segments:
+        ltf_atr, ltf_chop, ltf_vol_z = _ltf_indicators_grouped(
+            raw["high_price"].to_numpy(np.float64),
+            raw["low_price"].to_numpy(np.float64),
+            raw["close_price"].to_numpy(np.float64),
+            starts,
+            14,
+            14,
+            50,
+        )
+
+    for sym in symbols:
+        if sym not in segments:
+            missing_count += 1
+            continue
+        s, e = segments[sym]
+        df = raw.iloc[s:e].reset_index(drop=True)
+        if len(df) < strategy.hurst_min_data_points:
+            insufficient_count += 1
+            continue
+
+        cycle_result = detect_dominant_cycle_filtered(df, cutoff=strategy.cycle_lowpass_cutoff)
+        if not cycle_result:
+            cycle_fail_count += 1
+            continue
+
+        df_time = _time_indexed(df)
+        atr = pd.Series(ltf_atr[s:e], index=df_time.index).bfill()
+
+        # Bot C (Squeeze)
+        bbu, bbl, kcu, kcl = _calculate_bb_kc_series(df_time, strategy.bot_c_bb_window, strategy.bot_c_bb_std, strategy.bot_c_kc_window, strategy.bot_c_kc_multiplier)
+
+        # HTF metrics
+        daily_df = _resample_daily(df_time)
+
+        if not daily_df.empty:
+            daily_chop = calculate_chop(daily_df, period=30)
+            safe_daily_chop = daily_chop.shift(1)
+
+            daily_close = daily_df["close_price"].to_numpy(np.float64)
+            above = np.greater(daily_close, sma(daily_close, 50)).view(np.int8)
+            daily_direction = (above << 1) - 1
+            safe_daily_dir = pd.Series(daily_direction, index=daily_df.index).shift(1)
+
+            htf = safe_daily_chop.reindex(df_time.index).ffill().fillna(50.0)
+            htf_dir = safe_daily_dir.reindex(df_time.index).ffill().fillna(0)
+        else:
+            htf = np.full(len(df_time), 50.0)
+            htf_dir = np.zeros(len(df_time))
+
+        columns = {
+            "close": df_time["close_price"],
+            "high": df_time["high_price"],
+            "low": df_time["low_price"],
+            "atr": atr,
+            "phase": cycle_result["phase_array"],
+            "hurst": calculate_rolling_hurst(df_time, window=256).shift(1).ffill(),
+            "rsi": _calculate_rsi_series(df_time, period=max(strategy.bot_b_rsi_period, strategy.bot_c_rsi_period, strategy.bot_d_rsi_period)),
+            "bb_upper": bbu,
+            "bb_lower": bbl,
+            "kc_upper": kcu,
+            "kc_lower": kcl,
+            # Bot D (ATR MA)
+            "atr_ma": pd.Series(sma(atr.to_numpy(), strategy.bot_d_atr_ma_window), index=df_time.index).bfill(),
+            # LTF metrics
+            "ltf": np.where(np.isnan(ltf_chop[s:e]), 50.0, ltf_chop[s:e]),
+            "vol_z": np.where(np.isnan(ltf_vol_z[s:e]), 0.0, ltf_vol_z[s:e]),
+            "htf": htf,
+            "htf_dir": htf_dir,
+        }
+        syms.append(sym)
+        times.append(df_time.index.asi8)
+        for name, values in columns.items():
+            features.setdefault(name, []).append(np.asarray(values, dtype=np.float64))
+
+    if not syms:
+        reason = (
+            f"no eligible symbols (missing={missing_count}, "
+            f"insufficient<{strategy.hurst_min_data_points}={insufficient_count}, "
+            f"cycle_fail={cycle_fail_count})"
+        )
+        skipped_timeframes.append((tf, reason))
+        logger.warning(f"Skipping timeframe {tf}: {reason}")
+        return results, asset_results, skipped_timeframes
+
+    # 2. Build the 2D Matrices: every feature shares the union of the symbols' timestamps, so
+    # compute it (and each symbol's row positions) once and fill preallocated buffers in place
+    union_ts = np.unique(np.concatenate(times))
+    union_idx = pd.DatetimeIndex(union_ts.view("datetime64[ns]"), name="timestamp")
+    rows = [np.searchsorted(union_ts, ts) for ts in times]
+
+    def _matrix(name: str, dtype=np.float64) -> pd.DataFrame:
+        buf = np.full((len(union_ts), len(syms)), np.nan, dtype=dtype)
+        for j, values in enumerate(features[name]):
+            buf[rows[j], j] = values
+        return pd.DataFrame(buf, index=union_idx, columns=syms, copy=False)
+
+    matrix_close = _matrix("close").ffill().bfill()
+    matrix_high = _matrix("high").ffill().bfill()
+    matrix_low = _matrix("low").ffill().bfill()
+    matrix_atr = _matrix("atr").ffill().fillna(0.0)
+    # Signal-only features are built straight in the kernel's SIGNAL_DTYPE (float32); prices,
+    # ATR, bands and Hurst stay float64 for PnL, stop-level and threshold precision
+    matrix_phase = _matrix("phase", SIGNAL_DTYPE).ffill().fillna(0.0)
+
+    matrix_ltf = _matrix("ltf", SIGNAL_DTYPE).ffill().fillna(100.0)
+    matrix_htf = _matrix("htf", SIGNAL_DTYPE).ffill().fillna(50.0)
+    matrix_vol_z = _matrix("vol_z", SIGNAL_DTYPE).ffill().fillna(0.0)
+    matrix_htf_dir = _matrix("htf_dir", SIGNAL_DTYPE).ffill().fillna(0.0)
+    matrix_rsi = _matrix("rsi", SIGNAL_DTYPE).ffill().fillna(50.0)
+
+    matrix_bb_u = _matrix("bb_upper").ffill().fillna(0.0)
+    matrix_bb_l = _matrix("bb_lower").ffill().fillna(0.0)
+    matrix_kc_u = _matrix("kc_upper").ffill().fillna(0.0)
+    matrix_kc_l = _matrix("kc_lower").ffill().fillna(0.0)
+    matrix_atr_ma = _matrix("atr_ma").ffill().fillna(0.0)
+
+    matrix_hurst = _matrix("hurst").ffill().fillna(strategy.hurst_threshold).values
+
+    active_bots = []
+    if tf in strategy.bot_a_timeframes: active_bots.append(0)
+    if tf in strategy.bot_b_timeframes: active_bots.append(1)
+    if tf in strategy.bot_c_timeframes: active_bots.append(2)
+    if tf in strategy.bot_d_timeframes: active_bots.append(3)
+
+    for strategy_type in active_bots:
+        bot_names = {0: 'A (Trend)', 1: 'B (Mean Reversion)', 2: 'C (Squeeze)', 3: 'D (ATR-RSI)'}
+        logger.info(f"Using Strategy Bot {bot_names[strategy_type]}")
+
+        if strategy_type == 0:
+            active_max_concurrent = strategy.bot_a_max_concurrent_trades
+            active_risk = strategy.bot_a_risk_per_trade
+            active_hurst_threshold = strategy.bot_a_hurst_min
+            active_htf_threshold = strategy.bot_a_chop_htf_max
+            active_ltf_threshold = strategy.bot_a_ltf_chop_min
+            # Volatility-Adjusted Momentum Ranking (Bot A)
+            lookback = 24
+            momentum = matrix_close.diff(lookback)
+            volatility_adjusted_momentum = momentum / matrix_atr
+            matrix_rank = volatility_adjusted_momentum.fillna(0).replace([np.inf, -np.inf], 0).astype(SIGNAL_DTYPE)
+        elif strategy_type == 1:
+            active_max_concurrent = strategy.bot_b_max_concurrent_trades
+            active_risk = strategy.bot_b_risk_per_trade
+            active_hurst_threshold = strategy.bot_b_hurst_max
+            active_htf_threshold = 45.0  # Unused practically by bot B
+            active_ltf_threshold = strategy.bot_b_chop_min
+            # Extreme Oscillator Deviation (Bot B) - Use RSI as the rank metric
+            matrix_rank = matrix_rsi.replace([np.inf, -np.inf], 50.0)
+        elif strategy_type == 2:
+            active_max_concurrent = strategy.bot_c_max_concurrent_trades
+            active_risk = strategy.bot_c_risk_per_trade
+            active_hurst_threshold = strategy.hurst_threshold
+            active_htf_threshold = 45.0
+            active_ltf_threshold = 50.0
+            matrix_rank = matrix_rsi.replace([np.inf, -np.inf], 50.0)
+        elif strategy_type == 3:
+            active_max_concurrent = strategy.bot_d_max_concurrent_trades
+            active_risk = strategy.bot_d_risk_per_trade
+            active_hurst_threshold = strategy.hurst_threshold
+            active_htf_threshold = 45.0
+            active_ltf_threshold = 50.0
+            matrix_rank = matrix_rsi.replace([np.inf, -np.inf], 50.0)
+
+        # 3. Call the Engine EXACTLY ONCE with the full StrategyConfig
+        freq_str = tf.replace("m", "min")
+        res = run_backtest(
+            close=matrix_close,
+            high=matrix_high,
+            low=matrix_low,
+            atr=matrix_atr,
+            phase_array=matrix_phase.values,
+            hurst_value=matrix_hurst,
+            ltf_metric=matrix_ltf.values,
+            htf_metric=matrix_htf.values,
+            volatility_zscore=matrix_vol_z.values,
+            htf_direction=matrix_htf_dir.values,
+            rank_metric=matrix_rank.values,
+            bb_upper=matrix_bb_u.values,
+            bb_lower=matrix_bb_l.values,
+            kc_upper=matrix_kc_u.values,
+            kc_lower=matrix_kc_l.values,
+            atr_ma=matrix_atr_ma.values,
+            macro_filter_type=strategy.macro_filter_type,
+            htf_threshold=active_htf_threshold,
+            ltf_threshold=active_ltf_threshold,
+            veto_threshold=strategy.veto_threshold,
+            hurst_threshold=active_hurst_threshold,
+            trailing_multiplier=strategy.trailing_atr_multiplier,
+            breakeven_threshold=strategy.breakeven_atr_threshold,
+            max_concurrent_trades=active_max_concurrent,
+            risk_per_trade=active_risk,
+            initial_capital=strategy.backtest_initial_capital,
+            commission=strategy.backtest_commission,
+            freq=freq_str,
+            strategy_type=strategy_type,
+            bot_b_hurst_max=strategy.bot_b_hurst_max,
+            bot_b_chop_min=strategy.bot_b_chop_min,
+            bot_b_take_profit_atr=strategy.bot_b_take_profit_atr,
+            bot_b_stop_loss_atr=strategy.bot_b_stop_loss_atr,
+            bot_b_max_holding_bars=strategy.bot_b_max_holding_bars,
+            bot_b_rsi_oversold=strategy.bot_b_rsi_oversold,
+            bot_b_rsi_overbought=strategy.bot_b_rsi_overbought,
+            bot_c_take_profit_atr=strategy.bot_c_take_profit_atr,
+            bot_c_stop_loss_atr=strategy.bot_c_stop_loss_atr,
+            bot_c_max_holding_bars=strategy.bot_c_max_holding_bars,
+            bot_c_rsi_oversold=strategy.bot_c_rsi_oversold,
+            bot_d_take_profit_atr=strategy.bot_d_take_profit_atr,
+            bot_d_stop_loss_atr=strategy.bot_d_stop_loss_atr,
+            bot_d_max_holding_bars=strategy.bot_d_max_holding_bars,
+            bot_d_rsi_oversold=strategy.bot_d_rsi_oversold,
+        )
+
+        if res:
+            bot_letter = 'A' if strategy_type==0 else 'B' if strategy_type==1 else 'C' if strategy_type==2 else 'D'
+            res["timeframe"] = tf
+            res["symbol"] = f"PORTFOLIO_BOT_{bot_letter}"
+            res["best_hurst_threshold"] = strategy.hurst_threshold
+            results.append(res)
+
+            # Per-symbol breakdown from the same portfolio (no extra simulations)
+            per_asset = compute_asset_metrics(res["portfolio"])
+            per_asset.insert(1, "timeframe", tf)
+            per_asset.insert(2, "bot", bot_letter)
+            asset_results.append(per_asset)
+
+            # Export trade log for this timeframe
+            output_dir = Path(strategy.backtest_output_dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            log_path = output_dir / f"trades_PORTFOLIO_{tf}_BOT_{bot_letter}.{output_format}"
+            export_trade_log_csv(res["portfolio"], str(log_path), symbol=f"PORTFOLIO_BOT_{bot_letter}")
+
+            # The portfolio has been fully consumed; don't ship it back across process boundaries
+            del res["portfolio"]
+        else:
+            reason = "backtest engine returned no result"
+            skipped_timeframes.append((tf, reason))
+            logger.warning(f"Skipping timeframe {tf}: {reason}")
+
+    return results, asset_results, skipped_timeframes
+
+
+# Run-wide config cached in each pool worker by init_bulk_worker(), so jobs carry only (symbols, tf)
+_WORKER_SETTINGS: AppSettings | None = None
+_WORKER_STRATEGY: StrategyConfig | None = None
+
+
+def _run_timeframe_job(symbols: list[str], tf: str, output_format: str):
+    """Process pool entry point: run one timeframe on the worker's cached config and read-only connection."""
+    conn = get_shared_connection(_WORKER_SETTINGS, read_only=True)
+    return _run_timeframe(conn, _WORKER_STRATEGY, symbols, tf, output_format)
+
+
+def init_bulk_worker(settings: AppSettings, strategy: StrategyConfig) -> None:
+    """Process pool initializer: cache the run's config and import the backtest stack once.
+
+    Use as ``ProcessPoolExecutor(initializer=init_bulk_worker, initargs=(settings, strategy))``.
+    """
+    global _WORKER_SETTINGS, _WORKER_STRATEGY
+    _WORKER_SETTINGS, _WORKER_STRATEGY = settings, strategy
+    # Pool workers leave through os._exit(), which skips atexit hooks; multiprocessing
+    # finalizers still run, so close the worker's memoized connection there
+    Finalize(None, close_shared_connections, exitpriority=10)
+    import vectorbt  # noqa: F401
+
+
 async def run_bulk_backtest(
     settings: AppSettings,
     assets: AssetConfig,
@@ -80,8 +400,16 @@ async def run_bulk_backtest(
     asset_type: str = "crypto",
     sweep: bool = False,
     fetch: bool = False,
+    executor: Executor | None = None,
+    output_format: str = "parquet",
 ) -> None:
-    """Run bulk backtest across all symbols and timeframes."""
+    """Run bulk backtest across all symbols and timeframes.
+
+    With an ``executor`` initialized by init_bulk_worker() with the same
+    settings and strategy, timeframes run concurrently on it; otherwise they
+    run one after another in this process. Summaries and trade logs are
+    written as ``output_format`` files: zstd Parquet by default, or "csv".
+    """
 
     # Step 1: Optional Fetch
     if fetch:
@@ -102,233 +430,35 @@ async def run_bulk_backtest(
     start_time = time.monotonic()
 
     results = []
+    asset_results: list[pd.DataFrame] = []
     skipped_timeframes: list[tuple[str, str]] = []
-    conn = get_connection(settings, read_only=True)
-
-    # Group by Timeframe, NOT by Symbol
-    for tf in tfs:
-        logger.info(f"Processing timeframe: {tf}")
-
-        close_dict, high_dict, low_dict = {}, {}, {}
-        atr_dict, phase_dict, hurst_dict = {}, {}, {}
-        ltf_dict, htf_dict, vol_z_dict, htf_dir_dict = {}, {}, {}, {}
-        rsi_dict, atr_ma_dict = {}, {}
-        bb_upper_dict, bb_lower_dict, kc_upper_dict, kc_lower_dict = {}, {}, {}, {}
-
-        missing_count = 0
-        insufficient_count = 0
-        cycle_fail_count = 0
-
-        # 1. Fetch and calculate indicators for all symbols
-        for sym in symbols:
-            df = query_ohlcv(conn, sym, tf)
-            if df.empty:
-                missing_count += 1
-                continue
-            if len(df) < strategy.hurst_min_data_points:
-                insufficient_count += 1
-                continue
-
-            cycle_result = detect_dominant_cycle_filtered(df, cutoff=strategy.cycle_lowpass_cutoff)
-            if not cycle_result:
-                cycle_fail_count += 1
-                continue
-
-            df_time = df.copy()
-            df_time["timestamp"] = pd.to_datetime(df_time["timestamp"])
-            df_time.set_index("timestamp", inplace=True)
-
-            rolling_hurst = calculate_rolling_hurst(df_time, window=256).shift(1).ffill()
-
-            close_dict[sym] = df_time["close_price"]
-            high_dict[sym] = df_time["high_price"]
-            low_dict[sym] = df_time["low_price"]
-
-            atr_dict[sym] = _calculate_atr_series(df_time, period=14)
-            phase_dict[sym] = pd.Series(cycle_result["phase_array"], index=df_time.index)
-            hurst_dict[sym] = rolling_hurst
-            rsi_dict[sym] = _calculate_rsi_series(df_time, period=max(strategy.bot_b_rsi_period, strategy.bot_c_rsi_period, strategy.bot_d_rsi_period))
-            
-            # Bot C (Squeeze)
-            bbu, bbl, kcu, kcl = _calculate_bb_kc_series(df_time, strategy.bot_c_bb_window, strategy.bot_c_bb_std, strategy.bot_c_kc_window, strategy.bot_c_kc_multiplier)
-            bb_upper_dict[sym] = bbu
-            bb_lower_dict[sym] = bbl
-            kc_upper_dict[sym] = kcu
-            kc_lower_dict[sym] = kcl
-            
-            # Bot D (ATR MA)
-            atr_ma_dict[sym] = atr_dict[sym].rolling(window=strategy.bot_d_atr_ma_window).mean().bfill()
-
-            # LTF metrics
-            ltf_dict[sym] = calculate_chop(df_time)
-            vol_z_dict[sym] = calculate_atr_zscore_series(df_time)
-
-            # HTF metrics
-            daily_df = df_time.resample("1D").agg({
-                "open_price": "first",
-                "high_price": "max",
-                "low_price": "min",
-                "close_price": "last",
-                "volume": "sum"
-            }).dropna()
-
-            if not daily_df.empty:
-                daily_chop = calculate_chop(daily_df, period=30)
-                safe_daily_chop = daily_chop.shift(1)
-
-                daily_sma = daily_df["close_price"].rolling(window=50).mean()
-                daily_direction = np.where(daily_df["close_price"] > daily_sma, 1, -1)
-                safe_daily_dir = pd.Series(daily_direction, index=daily_df.index).shift(1)
-
-                htf_dict[sym] = safe_daily_chop.reindex(df_time.index).ffill().fillna(50.0)
-                htf_dir_dict[sym] = safe_daily_dir.reindex(df_time.index).ffill().fillna(0)
-            else:
-                htf_dict[sym] = pd.Series(50.0, index=df_time.index)
-                htf_dir_dict[sym] = pd.Series(0.0, index=df_time.index)
-
-        if not close_dict:
-            reason = (
-                f"no eligible symbols (missing={missing_count}, "
-                f"insufficient<{strategy.hurst_min_data_points}={insufficient_count}, "
-                f"cycle_fail={cycle_fail_count})"
-            )
-            skipped_timeframes.append((tf, reason))
-            logger.warning(f"Skipping timeframe {tf}: {reason}")
-            continue
-
-        # 2. Build the 2D Matrices
-        matrix_close = pd.DataFrame(close_dict).ffill().bfill()
-        matrix_high = pd.DataFrame(high_dict).reindex(matrix_close.index).ffill().bfill()
-        matrix_low = pd.DataFrame(low_dict).reindex(matrix_close.index).ffill().bfill()
-        matrix_atr = pd.DataFrame(atr_dict).reindex(matrix_close.index).ffill().fillna(0.0)
-        matrix_phase = pd.DataFrame(phase_dict).reindex(matrix_close.index).ffill().fillna(0.0)
-
-        matrix_ltf = pd.DataFrame(ltf_dict).reindex(matrix_close.index).ffill().fillna(100.0)
-        matrix_htf = pd.DataFrame(htf_dict).reindex(matrix_close.index).ffill().fillna(50.0)
-        matrix_vol_z = pd.DataFrame(vol_z_dict).reindex(matrix_close.index).ffill().fillna(0.0)
-        matrix_htf_dir = pd.DataFrame(htf_dir_dict).reindex(matrix_close.index).ffill().fillna(0.0)
-        matrix_rsi = pd.DataFrame(rsi_dict).reindex(matrix_close.index).ffill().fillna(50.0)
-        
-        matrix_bb_u = pd.DataFrame(bb_upper_dict).reindex(matrix_close.index).ffill().fillna(0.0)
-        matrix_bb_l = pd.DataFrame(bb_lower_dict).reindex(matrix_close.index).ffill().fillna(0.0)
-        matrix_kc_u = pd.DataFrame(kc_upper_dict).reindex(matrix_close.index).ffill().fillna(0.0)
-        matrix_kc_l = pd.DataFrame(kc_lower_dict).reindex(matrix_close.index).ffill().fillna(0.0)
-        matrix_atr_ma = pd.DataFrame(atr_ma_dict).reindex(matrix_close.index).ffill().fillna(0.0)
-
-        matrix_hurst_df = pd.DataFrame(hurst_dict).reindex(matrix_close.index).ffill().fillna(strategy.hurst_threshold)
-        matrix_hurst = matrix_hurst_df.values
-
-        active_bots = []
-        if tf in strategy.bot_a_timeframes: active_bots.append(0)
-        if tf in strategy.bot_b_timeframes: active_bots.append(1)
-        if tf in strategy.bot_c_timeframes: active_bots.append(2)
-        if tf in strategy.bot_d_timeframes: active_bots.append(3)
-
-        for strategy_type in active_bots:
-            bot_names = {0: 'A (Trend)', 1: 'B (Mean Reversion)', 2: 'C (Squeeze)', 3: 'D (ATR-RSI)'}
-            logger.info(f"Using Strategy Bot {bot_names[strategy_type]}")
-
-            if strategy_type == 0:
-                active_max_concurrent = strategy.bot_a_max_concurrent_trades
-                active_risk = strategy.bot_a_risk_per_trade
-                active_hurst_threshold = strategy.bot_a_hurst_min
-                active_htf_threshold = strategy.bot_a_chop_htf_max
-                active_ltf_threshold = strategy.bot_a_ltf_chop_min
-                # Volatility-Adjusted Momentum Ranking (Bot A)
-                lookback = 24
-                momentum = matrix_close.diff(lookback)
-                volatility_adjusted_momentum = momentum / matrix_atr
-                matrix_rank = volatility_adjusted_momentum.fillna(0).replace([np.inf, -np.inf], 0)
-            elif strategy_type == 1:
-                active_max_concurrent = strategy.bot_b_max_concurrent_trades
-                active_risk = strategy.bot_b_risk_per_trade
-                active_hurst_threshold = strategy.bot_b_hurst_max
-                active_htf_threshold = 45.0  # Unused practically by bot B
-                active_ltf_threshold = strategy.bot_b_chop_min
-                # Extreme Oscillator Deviation (Bot B) - Use RSI as the rank metric
-                matrix_rank = matrix_rsi.replace([np.inf, -np.inf], 50.0)
-            elif strategy_type == 2:
-                active_max_concurrent = strategy.bot_c_max_concurrent_trades
-                active_risk = strategy.bot_c_risk_per_trade
-                active_hurst_threshold = strategy.hurst_threshold
-                active_htf_threshold = 45.0
-                active_ltf_threshold = 50.0
-                matrix_rank = matrix_rsi.replace([np.inf, -np.inf], 50.0)
-            elif strategy_type == 3:
-                active_max_concurrent = strategy.bot_d_max_concurrent_trades
-                active_risk = strategy.bot_d_risk_per_trade
-                active_hurst_threshold = strategy.hurst_threshold
-                active_htf_threshold = 45.0
-                active_ltf_threshold = 50.0
-                matrix_rank = matrix_rsi.replace([np.inf, -np.inf], 50.0)
-
-            # 3. Call the Engine EXACTLY ONCE with the full StrategyConfig
-            freq_str = tf.replace("m", "min")
-            res = run_backtest(
-                close=matrix_close,
-                high=matrix_high,
-                low=matrix_low,
-                atr=matrix_atr,
-                phase_array=matrix_phase.values,
-                hurst_value=matrix_hurst,
-                ltf_metric=matrix_ltf.values,
-                htf_metric=matrix_htf.values,
-                volatility_zscore=matrix_vol_z.values,
-                htf_direction=matrix_htf_dir.values,
-                rank_metric=matrix_rank.values,
-                bb_upper=matrix_bb_u.values,
-                bb_lower=matrix_bb_l.values,
-                kc_upper=matrix_kc_u.values,
-                kc_lower=matrix_kc_l.values,
-                atr_ma=matrix_atr_ma.values,
-                macro_filter_type=strategy.macro_filter_type,
-                htf_threshold=active_htf_threshold,
-                ltf_threshold=active_ltf_threshold,
-                veto_threshold=strategy.veto_threshold,
-                hurst_threshold=active_hurst_threshold,
-                trailing_multiplier=strategy.trailing_atr_multiplier,
-                breakeven_threshold=strategy.breakeven_atr_threshold,
-                max_concurrent_trades=active_max_concurrent,
-                risk_per_trade=active_risk,
-                initial_capital=strategy.backtest_initial_capital,
-                commission=strategy.backtest_commission,
-                freq=freq_str,
-                strategy_type=strategy_type,
-                bot_b_hurst_max=strategy.bot_b_hurst_max,
-                bot_b_chop_min=strategy.bot_b_chop_min,
-                bot_b_take_profit_atr=strategy.bot_b_take_profit_atr,
-                bot_b_stop_loss_atr=strategy.bot_b_stop_loss_atr,
-                bot_b_max_holding_bars=strategy.bot_b_max_holding_bars,
-                bot_b_rsi_oversold=strategy.bot_b_rsi_oversold,
-                bot_b_rsi_overbought=strategy.bot_b_rsi_overbought,
-                bot_c_take_profit_atr=strategy.bot_c_take_profit_atr,
-                bot_c_stop_loss_atr=strategy.bot_c_stop_loss_atr,
-                bot_c_max_holding_bars=strategy.bot_c_max_holding_bars,
-                bot_c_rsi_oversold=strategy.bot_c_rsi_oversold,
-                bot_d_take_profit_atr=strategy.bot_d_take_profit_atr,
-                bot_d_stop_loss_atr=strategy.bot_d_stop_loss_atr,
-                bot_d_max_holding_bars=strategy.bot_d_max_holding_bars,
-                bot_d_rsi_oversold=strategy.bot_d_rsi_oversold,
-            )
-
-            if res:
-                bot_letter = 'A' if strategy_type==0 else 'B' if strategy_type==1 else 'C' if strategy_type==2 else 'D'
-                res["timeframe"] = tf
-                res["symbol"] = f"PORTFOLIO_BOT_{bot_letter}"
-                res["best_hurst_threshold"] = strategy.hurst_threshold
-                results.append(res)
-
-                # Export trade log for this timeframe
-                output_dir = Path(strategy.backtest_output_dir)
-                output_dir.mkdir(parents=True, exist_ok=True)
-                csv_path = output_dir / f"trades_PORTFOLIO_{tf}_BOT_{bot_letter}.csv"
-                export_trade_log_csv(res["portfolio"], str(csv_path), symbol=f"PORTFOLIO_BOT_{bot_letter}")
-            else:
-                reason = "backtest engine returned no result"
-                skipped_timeframes.append((tf, reason))
-                logger.warning(f"Skipping timeframe {tf}: {reason}")
-
-    conn.close()
+    if executor is not None:
+        # Timeframes are independent; each worker reuses its own read-only connection
+        loop = asyncio.get_running_loop()
+        outcomes = await asyncio.gather(*(
+            loop.run_in_executor(executor, _run_timeframe_job, symbols, tf, output_format) for tf in tfs
+        ))
+    else:
+        conn = get_connection(settings, read_only=True)
+        try:
+            # Overlap I/O with compute: one thread loads the next timeframe's bars (the query
+            # releases the GIL) while this one is backtested; only that thread touches conn
+            unique_symbols = list(dict.fromkeys(symbols))
+            outcomes = []
+            with ThreadPoolExecutor(max_workers=1) as io:
+                pending = io.submit(query_ohlcv_multi, conn, unique_symbols, tfs[0]) if tfs else None
+                for i, tf in enumerate(tfs):
+                    raw = pending.result()
+                    if i + 1 < len(tfs):
+                        pending = io.submit(query_ohlcv_multi, conn, unique_symbols, tfs[i + 1])
+                    outcomes.append(_run_timeframe(conn, strategy, symbols, tf, output_format, raw=raw))
+        finally:
+            conn.close()
+
+    for tf_results, tf_assets, tf_skipped in outcomes:
+        results.extend(tf_results)
+        asset_results.extend(tf_assets)
+        skipped_timeframes.extend(tf_skipped)
 
     elapsed = time.monotonic() - start_time
     print(
@@ -357,9 +487,14 @@ async def run_bulk_backtest(
         "symbol", "timeframe", "sharpe_ratio", "total_return", "max_drawdown", "total_trades", "win_rate", "best_hurst_threshold"
     ]].head(10).to_string(index=False))
 
-    # Save to CSV
+    # Save summaries
     output_dir = Path(strategy.backtest_output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
-    csv_path = output_dir / f"summary_bulk_{asset_type}.csv"
-    df.to_csv(csv_path, index=False)
-    print(f"\nFull results saved to: {csv_path}")
+    summary_path = output_dir / f"summary_bulk_{asset_type}.{output_format}"
+    write_table(df, summary_path)
+    print(f"\nFull results saved to: {summary_path}")
+
+    if asset_results:
+        asset_path = output_dir / f"summary_bulk_{asset_type}_by_symbol.{output_format}"
+        write_table(pd.concat(asset_results, ignore_index=True), asset_path)
+        print(f"Per-symbol results saved to: {asset_path}")
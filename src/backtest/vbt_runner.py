@@ -9,20 +9,63 @@ Architecture boundary: reads signal output (dicts of numpy arrays),
 orchestrates VectorBT. Does NOT own data fetching or signal computation.
 """
 
+import os
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, product
+from multiprocessing import shared_memory
+
 import numba
 import numpy as np
 import pandas as pd
 import vectorbt as vbt
 from loguru import logger
 
+from src.backtest.analyzer import find_best_params, portfolio_metrics
 
-@numba.njit(cache=True)
-def simulate_portfolio_nb(
-    close: np.ndarray,
+# Auxiliary signal matrices (phase, CHOP, ATR z-score, HTF direction, rank metric) only feed
+# threshold comparisons, so they are held in float32 to halve the bytes the kernel streams.
+# Prices, ATR and bands stay float64 for PnL and stop-level precision.
+SIGNAL_DTYPE = np.float32
+
+
+def _wrap_phase(phase_array: np.ndarray) -> np.ndarray:
+    """Phase wrapped to [0, 2π) in float64, stored back as SIGNAL_DTYPE for simulate_portfolio_nb()."""
+    phase = np.asarray(phase_array, dtype=SIGNAL_DTYPE).astype(np.float64)
+    return np.mod(phase, 2.0 * np.pi).astype(SIGNAL_DTYPE)
+
+
+@numba.njit(cache=True, inline="always")
+def _ranks_before(score: float, other: float) -> bool:
+    """Entry priority: higher scores first, NaN ahead of any number; ties keep asset order."""
+    if np.isnan(other):
+        return False
+    return np.isnan(score) or score > other
+
+
+def _gt(a: np.ndarray, b: float) -> np.ndarray:
+    """``a > b`` evaluated in float64 (NumPy 2 would otherwise compare float32 arrays in float32)."""
+    return np.greater(a, b, signature="dd->?")
+
+
+def _lt(a: np.ndarray, b: float) -> np.ndarray:
+    """``a < b`` evaluated in float64, matching the scalar comparisons of the old per-bar loop."""
+    return np.less(a, b, signature="dd->?")
+
+
+def _entered_zone(phase: np.ndarray, center: float, tolerance: float) -> np.ndarray:
+    """Rising edge of the phase zone: inside ``center ± tolerance`` now but not on the previous bar."""
+    in_zone = np.abs(phase - center) < tolerance
+    entered = np.zeros_like(in_zone)
+    entered[1:] = in_zone[1:] & ~in_zone[:-1]
+    return entered
+
+
+def _entry_candidates(
     high: np.ndarray,
     low: np.ndarray,
     atr: np.ndarray,
-    phase_array: np.ndarray,
+    phase: np.ndarray,
     ltf_metric: np.ndarray,
     htf_metric: np.ndarray,
     volatility_zscore: np.ndarray,
@@ -39,30 +82,129 @@ def simulate_portfolio_nb(
     veto_threshold: float,
     hurst_threshold: float,
     macro_filter_type: int,
-    trailing_multiplier: float,
-    breakeven_threshold: float,
     phase_long_center: float,
     phase_short_center: float,
     phase_tolerance: float,
-    max_concurrent_trades: int,
-    strategy_type: int,  # 0 for Bot A, 1 for Bot B, 2 for Bot C, 3 for Bot D
+    strategy_type: int,
     bot_b_hurst_max: float,
     bot_b_chop_min: float,
+    bot_b_rsi_oversold: float,
+    bot_b_rsi_overbought: float,
+    bot_c_rsi_oversold: float,
+    bot_d_rsi_oversold: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Per-bar entry direction (1 long, -1 short, 0 none) and ranking score for every asset.
+
+    None of the veto/regime/trigger tests depend on open positions, so they run here as
+    whole-matrix NumPy passes and simulate_portfolio_nb() only reads one direction per asset.
+    """
+    shape = high.shape
+    entry_dir = np.zeros(shape, dtype=np.int8)
+    entry_score = np.zeros(shape, dtype=SIGNAL_DTYPE)
+
+    # Veto first; a NaN z-score never vetoes
+    allowed = ~np.greater_equal(volatility_zscore, veto_threshold, signature="dd->?")
+
+    # Regime Filtering
+    if strategy_type == 0:  # Bot A: Trend (Macro Expansion)
+        # Only the predicates the macro filter uses are evaluated; "both" ANDs them in place
+        if macro_filter_type != 1:  # chop or both
+            allowed &= _lt(htf_metric, htf_threshold)
+            allowed &= _gt(ltf_metric, ltf_threshold)
+        if macro_filter_type != 0:  # hurst or both
+            allowed &= _gt(hurst_value, hurst_threshold)
+    elif strategy_type == 1:  # Bot B: Mean Reversion (Macro Compression)
+        allowed &= _lt(hurst_value, bot_b_hurst_max) & _gt(ltf_metric, bot_b_chop_min)
+    elif strategy_type not in (2, 3):  # Bot C/D filter inside signal selection
+        return entry_dir, entry_score
+    # The simulation starts on the second bar
+    allowed[:1] = False
+
+    # Signal Selection + Ranking
+    rsi = rank_metric
+    if strategy_type == 0:
+        phase64 = phase.astype(np.float64)
+        long_mask = allowed & (htf_direction >= 0) & _entered_zone(phase64, phase_long_center, phase_tolerance)
+        short_mask = allowed & (htf_direction < 0) & _entered_zone(phase64, phase_short_center, phase_tolerance)
+        entry_dir[long_mask] = 1
+        entry_score[long_mask] = rank_metric[long_mask]  # High momentum
+        entry_dir[short_mask] = -1
+        entry_score[short_mask] = -rank_metric[short_mask]  # High negative momentum
+        return entry_dir, entry_score
+    if strategy_type == 1:
+        # Bot B uses RSI (passed as rank_metric) for both entry trigger and ranking
+        oversold = _lt(rsi, bot_b_rsi_oversold)
+        long_mask = allowed & oversold
+        short_mask = allowed & ~oversold & _gt(rsi, bot_b_rsi_overbought)
+        entry_dir[short_mask] = -1
+        entry_score[short_mask] = rsi[short_mask]  # Highest RSI = highest priority
+    elif strategy_type == 2:
+        # Bot C: Squeeze Model
+        is_squeeze = (bb_upper < kc_upper) & (bb_lower > kc_lower)
+        long_mask = allowed & is_squeeze & (low < bb_lower) & _lt(rsi, bot_c_rsi_oversold)
+    else:
+        # Bot D: Pure ATR-RSI Model
+        long_mask = allowed & (atr < atr_ma) & _lt(rsi, bot_d_rsi_oversold)
+    entry_dir[long_mask] = 1
+    entry_score[long_mask] = -rsi[long_mask]  # Lowest RSI = highest priority
+    return entry_dir, entry_score
+
+
+# Per-asset position state bits in simulate_portfolio_nb(): one byte per asset instead of three bool arrays
+_LONG = 1
+_SHORT = 2
+_BREAKEVEN = 4
+
+
+# Explicit kernel signature, so simulate_portfolio_nb compiles (or loads from the on-disk cache) once
+# at import instead of on the first backtest. build_entries_exits() hands it C-contiguous matrices.
+# Inputs are typed read-only: writable arrays convert to that, so read-only buffers (pandas
+# copy-on-write .values, shared sweep inputs) match the same compiled entry instead of failing dispatch.
+_F64 = numba.types.Array(numba.float64, 2, "C", readonly=True)
+_SIG = numba.types.Array(numba.from_dtype(SIGNAL_DTYPE), 2, "C", readonly=True)
+_DIR = numba.types.Array(numba.int8, 2, "C", readonly=True)
+_BARS = numba.types.Array(numba.boolean, 1, "C", readonly=True)
+_MASK = numba.types.Array(numba.boolean, 2, "C")
+_SIMULATE_SIGNATURE = numba.types.UniTuple(_MASK, 4)(
+    _F64, _F64, _F64, _F64,  # close, high, low, atr
+    _DIR, _SIG, _BARS,  # entry direction, entry score, bars with any candidate
+    numba.float64, numba.float64,
+    numba.int64,
+    numba.int64,
+    numba.float64, numba.float64, numba.int64,
+    numba.float64, numba.float64, numba.int64,
+    numba.float64, numba.float64, numba.int64,
+)
+
+
+@numba.njit(_SIMULATE_SIGNATURE, cache=True)
+def simulate_portfolio_nb(
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    atr: np.ndarray,
+    entry_dir: np.ndarray,
+    entry_score: np.ndarray,
+    bar_has_entry: np.ndarray,
+    trailing_multiplier: float,
+    breakeven_threshold: float,
+    max_concurrent_trades: int,
+    strategy_type: int,  # 0 for Bot A, 1 for Bot B, 2 for Bot C, 3 for Bot D
     bot_b_take_profit_atr: float,
     bot_b_stop_loss_atr: float,
     bot_b_max_holding_bars: int,
-    bot_b_rsi_oversold: float,
-    bot_b_rsi_overbought: float,
     bot_c_take_profit_atr: float,
     bot_c_stop_loss_atr: float,
     bot_c_max_holding_bars: int,
-    bot_c_rsi_oversold: float,
     bot_d_take_profit_atr: float,
     bot_d_stop_loss_atr: float,
     bot_d_max_holding_bars: int,
-    bot_d_rsi_oversold: float,
 ) -> tuple:
-    """Numba-compiled Time-First loop for Portfolio Execution and Signal Ranking."""
+    """Numba-compiled Time-First loop for Portfolio Execution and Signal Ranking.
+
+    Entry candidates come precomputed from _entry_candidates(); the loop only tracks positions,
+    exits and the per-bar concurrency budget.
+    """
     n_time, n_assets = close.shape
 
     long_entries = np.zeros((n_time, n_assets), dtype=np.bool_)
@@ -70,169 +212,112 @@ def simulate_portfolio_nb(
     short_entries = np.zeros((n_time, n_assets), dtype=np.bool_)
     short_exits = np.zeros((n_time, n_assets), dtype=np.bool_)
 
-    in_position_long = np.zeros(n_assets, dtype=np.bool_)
-    in_position_short = np.zeros(n_assets, dtype=np.bool_)
+    state_flags = np.zeros(n_assets, dtype=np.uint8)  # _LONG / _SHORT / _BREAKEVEN bits
     entry_price = np.zeros(n_assets, dtype=np.float64)
     highest_price = np.zeros(n_assets, dtype=np.float64)
     lowest_price = np.zeros(n_assets, dtype=np.float64)
     stop_loss = np.zeros(n_assets, dtype=np.float64)
     take_profit = np.zeros(n_assets, dtype=np.float64)
-    is_breakeven = np.zeros(n_assets, dtype=np.bool_)
     bars_in_trade = np.zeros(n_assets, dtype=np.int32)
 
     open_trades_count = 0
+    max_holding = bot_b_max_holding_bars if strategy_type == 1 else bot_c_max_holding_bars if strategy_type == 2 else bot_d_max_holding_bars
+    top_idx = np.empty(max(max_concurrent_trades, 0), dtype=np.int32)
+    top_score = np.empty(max(max_concurrent_trades, 0), dtype=np.float64)
 
     for i in range(1, n_time):
         # 1. Process EXITS first to free up concurrency budget
-        for a in range(n_assets):
-            if in_position_long[a]:
-                bars_in_trade[a] += 1
-                if strategy_type == 0:  # Bot A: Trend Following (Dynamic)
-                    if high[i, a] > highest_price[a]:
-                        highest_price[a] = high[i, a]
-
-                    # Dynamic ATR Trailing
-                    current_trailing = highest_price[a] - (atr[i, a] * trailing_multiplier)
-                    if current_trailing > stop_loss[a]:
-                        stop_loss[a] = current_trailing
-
-                    # Breakeven Ratchet
-                    if not is_breakeven[a]:
-                        if high[i, a] >= entry_price[a] + (atr[i, a] * breakeven_threshold):
-                            be_level = entry_price[a] * 1.002
-                            if be_level > stop_loss[a]:
-                                stop_loss[a] = be_level
-                                is_breakeven[a] = True
-
-                    # Check Exit
-                    if close[i, a] <= stop_loss[a]:
-                        long_exits[i, a] = True
-                        in_position_long[a] = False
-                        open_trades_count -= 1
-                else:  # Bot B, C, D: Mean Reversion (Static)
-                    max_holding = bot_b_max_holding_bars if strategy_type == 1 else bot_c_max_holding_bars if strategy_type == 2 else bot_d_max_holding_bars
-                    if high[i, a] >= take_profit[a] or close[i, a] <= stop_loss[a] or bars_in_trade[a] >= max_holding:
-                        long_exits[i, a] = True
-                        in_position_long[a] = False
-                        open_trades_count -= 1
-
-            elif in_position_short[a]:
-                bars_in_trade[a] += 1
-                if strategy_type == 0:  # Bot A: Trend Following (Dynamic)
-                    if low[i, a] < lowest_price[a]:
-                        lowest_price[a] = low[i, a]
-
-                    # Dynamic ATR Trailing
-                    current_trailing = lowest_price[a] + (atr[i, a] * trailing_multiplier)
-                    if current_trailing < stop_loss[a]:
-                        stop_loss[a] = current_trailing
-
-                    # Breakeven Ratchet
-                    if not is_breakeven[a]:
-                        if low[i, a] <= entry_price[a] - (atr[i, a] * breakeven_threshold):
-                            be_level = entry_price[a] * 0.998
-                            if be_level < stop_loss[a]:
-                                stop_loss[a] = be_level
-                                is_breakeven[a] = True
-
-                    # Check Exit
-                    if close[i, a] >= stop_loss[a]:
-                        short_exits[i, a] = True
-                        in_position_short[a] = False
-                        open_trades_count -= 1
-                else:  # Bot B, C, D: Mean Reversion (Static)
-                    max_holding = bot_b_max_holding_bars if strategy_type == 1 else bot_c_max_holding_bars if strategy_type == 2 else bot_d_max_holding_bars
-                    if low[i, a] <= take_profit[a] or close[i, a] >= stop_loss[a] or bars_in_trade[a] >= max_holding:
-                        short_exits[i, a] = True
-                        in_position_short[a] = False
-                        open_trades_count -= 1
-
-        # 2. Process ENTRIES
-        if open_trades_count < max_concurrent_trades:
-            scores = np.full(n_assets, -1e10, dtype=np.float64)
-            dirs = np.zeros(n_assets, dtype=np.int8) # 1=Long, -1=Short
+        # (nothing to scan while the book is flat)
+        if open_trades_count > 0:
             for a in range(n_assets):
-                if in_position_long[a] or in_position_short[a] or long_exits[i, a] or short_exits[i, a]:
-                    continue
+                if state_flags[a] & _LONG:
+                    bars_in_trade[a] += 1
+                    if strategy_type == 0:  # Bot A: Trend Following (Dynamic)
+                        highest_price[a] = max(highest_price[a], high[i, a])
 
-                phase = phase_array[i, a] % (2.0 * np.pi)
-                # Check Veto first
-                if volatility_zscore[i, a] >= veto_threshold:
-                    continue
+                        # Dynamic ATR Trailing
+                        stop_loss[a] = max(stop_loss[a], highest_price[a] - (atr[i, a] * trailing_multiplier))
 
-                # Regime Filtering
-                valid = False
-                if strategy_type == 0:  # Bot A: Trend (Macro Expansion)
-                    chop_valid = (htf_metric[i, a] < htf_threshold) and (ltf_metric[i, a] > ltf_threshold)
-                    hurst_valid = (hurst_value[i, a] > hurst_threshold)
-                    if macro_filter_type == 0:
-                        valid = chop_valid
-                    elif macro_filter_type == 1:
-                        valid = hurst_valid
-                    else: # 2 = both
-                        valid = chop_valid and hurst_valid
-                elif strategy_type == 1:  # Bot B: Mean Reversion (Macro Compression)
-                    valid = (hurst_value[i, a] < bot_b_hurst_max) and (ltf_metric[i, a] > bot_b_chop_min)
-                elif strategy_type == 2:  # Bot C: Bollinger/Keltner Squeeze
-                    valid = True # logic will be directly in signal selection
-                elif strategy_type == 3:  # Bot D: ATR-Filtered RSI
-                    valid = True
-
-                if not valid:
-                    continue
+                        # Breakeven Ratchet
+                        if not state_flags[a] & _BREAKEVEN:
+                            if high[i, a] >= entry_price[a] + (atr[i, a] * breakeven_threshold):
+                                be_level = entry_price[a] * 1.002
+                                if be_level > stop_loss[a]:
+                                    stop_loss[a] = be_level
+                                    state_flags[a] |= _BREAKEVEN
+
+                        # Check Exit
+                        if close[i, a] <= stop_loss[a]:
+                            long_exits[i, a] = True
+                            state_flags[a] = 0
+                            open_trades_count -= 1
+                    else:  # Bot B, C, D: Mean Reversion (Static)
+                        if high[i, a] >= take_profit[a] or close[i, a] <= stop_loss[a] or bars_in_trade[a] >= max_holding:
+                            long_exits[i, a] = True
+                            state_flags[a] = 0
+                            open_trades_count -= 1
+
+                elif state_flags[a] & _SHORT:
+                    bars_in_trade[a] += 1
+                    if strategy_type == 0:  # Bot A: Trend Following (Dynamic)
+                        lowest_price[a] = min(lowest_price[a], low[i, a])
+
+                        # Dynamic ATR Trailing
+                        stop_loss[a] = min(stop_loss[a], lowest_price[a] + (atr[i, a] * trailing_multiplier))
 
-                prev_phase = phase_array[i-1, a] % (2.0 * np.pi)
-
-                # Signal Selection + Ranking
-                if strategy_type == 0:
-                    if htf_direction[i, a] >= 0: # Long
-                        if abs(phase - phase_long_center) < phase_tolerance and not (abs(prev_phase - phase_long_center) < phase_tolerance):
-                            dirs[a] = 1
-                            scores[a] = rank_metric[i, a] # High momentum
-                    elif htf_direction[i, a] <= 0: # Short
-                        if abs(phase - phase_short_center) < phase_tolerance and not (abs(prev_phase - phase_short_center) < phase_tolerance):
-                            dirs[a] = -1
-                            scores[a] = -rank_metric[i, a] # High negative momentum
-                elif strategy_type == 1:
-                    # Bot B uses RSI (passed as rank_metric) for both entry trigger and ranking
-                    rsi = rank_metric[i, a]
-                    if rsi < bot_b_rsi_oversold:
-                        dirs[a] = 1
-                        scores[a] = -rsi # Lowest RSI = highest priority
-                    elif rsi > bot_b_rsi_overbought:
-                        dirs[a] = -1
-                        scores[a] = rsi # Highest RSI = highest priority
-                elif strategy_type == 2:
-                    # Bot C: Squeeze Model
-                    is_squeeze = (bb_upper[i, a] < kc_upper[i, a]) and (bb_lower[i, a] > kc_lower[i, a])
-                    rsi = rank_metric[i, a]
-                    if is_squeeze and (low[i, a] < bb_lower[i, a]) and (rsi < bot_c_rsi_oversold):
-                        dirs[a] = 1
-                        scores[a] = -rsi
-                elif strategy_type == 3:
-                    # Bot D: Pure ATR-RSI Model
-                    is_low_vol = atr[i, a] < atr_ma[i, a]
-                    rsi = rank_metric[i, a]
-                    if is_low_vol and (rsi < bot_d_rsi_oversold):
-                        dirs[a] = 1
-                        scores[a] = -rsi
-
-            # Sort by Score descending
-            sorted_indices = np.argsort(scores)[::-1]
-
-            for a in sorted_indices:
-                if scores[a] <= -1e9 or open_trades_count >= max_concurrent_trades:
-                    break
+                        # Breakeven Ratchet
+                        if not state_flags[a] & _BREAKEVEN:
+                            if low[i, a] <= entry_price[a] - (atr[i, a] * breakeven_threshold):
+                                be_level = entry_price[a] * 0.998
+                                if be_level < stop_loss[a]:
+                                    stop_loss[a] = be_level
+                                    state_flags[a] |= _BREAKEVEN
+
+                        # Check Exit
+                        if close[i, a] >= stop_loss[a]:
+                            short_exits[i, a] = True
+                            state_flags[a] = 0
+                            open_trades_count -= 1
+                    else:  # Bot B, C, D: Mean Reversion (Static)
+                        if low[i, a] <= take_profit[a] or close[i, a] >= stop_loss[a] or bars_in_trade[a] >= max_holding:
+                            short_exits[i, a] = True
+                            state_flags[a] = 0
+                            open_trades_count -= 1
+
+        # 2. Process ENTRIES (bars without a single candidate skip the asset scan)
+        if open_trades_count < max_concurrent_trades and bar_has_entry[i]:
+            # Best-scored candidates for the free slots: bounded insertion into a sorted
+            # buffer, O(n_assets * slots) instead of argsorting every score each bar
+            slots = max_concurrent_trades - open_trades_count
+            n_top = 0
+            for a in range(n_assets):
+                if entry_dir[i, a] == 0 or state_flags[a] or long_exits[i, a] or short_exits[i, a]:
+                    continue
+                score = np.float64(entry_score[i, a])
+                if score <= -1e9:
+                    continue
+                pos = n_top
+                while pos > 0 and _ranks_before(score, top_score[pos - 1]):
+                    pos -= 1
+                if pos >= slots:
+                    continue
+                for q in range(min(n_top, slots - 1), pos, -1):
+                    top_idx[q] = top_idx[q - 1]
+                    top_score[q] = top_score[q - 1]
+                top_idx[pos] = a
+                top_score[pos] = score
+                n_top = min(n_top + 1, slots)
 
+            for t in range(n_top):
+                a = top_idx[t]
                 entry_price[a] = close[i, a]
                 highest_price[a] = high[i, a]
                 lowest_price[a] = low[i, a]
-                is_breakeven[a] = False
                 bars_in_trade[a] = 0
 
-                if dirs[a] == 1:
+                if entry_dir[i, a] == 1:
                     long_entries[i, a] = True
-                    in_position_long[a] = True
+                    state_flags[a] = _LONG
                     if strategy_type == 0:
                         stop_loss[a] = entry_price[a] - (atr[i, a] * trailing_multiplier)
                     elif strategy_type == 1:
@@ -246,7 +331,7 @@ def simulate_portfolio_nb(
                         take_profit[a] = entry_price[a] + (atr[i, a] * bot_d_take_profit_atr)
                 else:
                     short_entries[i, a] = True
-                    in_position_short[a] = True
+                    state_flags[a] = _SHORT
                     if strategy_type == 0:
                         stop_loss[a] = entry_price[a] + (atr[i, a] * trailing_multiplier)
                     elif strategy_type == 1:
@@ -263,8 +348,6 @@ def simulate_portfolio_nb(
 
     return long_entries, long_exits, short_entries, short_exits
 
-    return long_entries, long_exits, short_entries, short_exits
-
 
 def build_entries_exits(
     close: np.ndarray,
@@ -310,64 +393,76 @@ def build_entries_exits(
     bot_d_stop_loss_atr: float = 1.0,
     bot_d_max_holding_bars: int = 12,
     bot_d_rsi_oversold: float = 30.0,
+    phase_wrapped: bool = False,
 ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     """Build long/short entry and exit boolean arrays from cycle phase + MTF metrics.
-    Handles 1D (single asset) and 2D (multi-asset) inputs.
+    Handles 1D (single asset) and 2D (multi-asset) inputs. Pass ``phase_wrapped=True``
+    when ``phase_array`` already went through _wrap_phase() (the sweep does this once).
     """
     is_1d = close.ndim == 1
 
-    # Force 2D for Numba processing
-    def to_2d(arr):
+    # Force 2D, C-contiguous for Numba processing: the kernel walks time-first (row-major), and
+    # one fixed layout per dtype means one cached specialization instead of one per input layout
+    def to_2d(arr, dtype=np.float64):
         if arr is None:
             return None
-        return arr.reshape(-1, 1) if arr.ndim == 1 else arr
+        arr = np.asarray(arr)
+        return np.ascontiguousarray(arr.reshape(-1, 1) if arr.ndim == 1 else arr, dtype=dtype)
 
-    c_2d = to_2d(close).astype(np.float64)
-    h_2d = to_2d(high).astype(np.float64) if high is not None else c_2d.copy()
-    l_2d = to_2d(low).astype(np.float64) if low is not None else c_2d.copy()
-    a_2d = to_2d(atr).astype(np.float64) if atr is not None else np.zeros_like(c_2d)
+    c_2d = to_2d(close)
+    # The kernel only reads high/low, so missing ones alias close instead of copying it
+    h_2d = to_2d(high) if high is not None else c_2d
+    l_2d = to_2d(low) if low is not None else c_2d
+    a_2d = to_2d(atr) if atr is not None else np.zeros_like(c_2d)
 
     if phase_array is None:
         empty = np.zeros_like(c_2d, dtype=bool)
         return (empty.flatten(), empty.flatten(), empty.flatten(), empty.flatten()) if is_1d else (empty, empty, empty, empty)
 
-    p_2d = to_2d(phase_array).astype(np.float64)
-
-    # Fill missing metrics with safe defaults if not provided
-    ltf_m = to_2d(ltf_metric).astype(np.float64) if ltf_metric is not None else np.full_like(c_2d, 100.0)
-    htf_m = to_2d(htf_metric).astype(np.float64) if htf_metric is not None else np.full_like(c_2d, 0.0)
-    vz_2d = to_2d(volatility_zscore).astype(np.float64) if volatility_zscore is not None else np.zeros_like(c_2d)
-    hd_2d = to_2d(htf_direction).astype(np.float64) if htf_direction is not None else np.ones_like(c_2d)
-    rm_2d = to_2d(rank_metric).astype(np.float64) if rank_metric is not None else np.zeros_like(c_2d)
-    
-    bbu_2d = to_2d(bb_upper).astype(np.float64) if bb_upper is not None else np.zeros_like(c_2d)
-    bbl_2d = to_2d(bb_lower).astype(np.float64) if bb_lower is not None else np.zeros_like(c_2d)
-    kcu_2d = to_2d(kc_upper).astype(np.float64) if kc_upper is not None else np.zeros_like(c_2d)
-    kcl_2d = to_2d(kc_lower).astype(np.float64) if kc_lower is not None else np.zeros_like(c_2d)
-    ama_2d = to_2d(atr_ma).astype(np.float64) if atr_ma is not None else np.zeros_like(c_2d)
-
-    if isinstance(hurst_value, (float, int)):
-        hv_2d = np.full_like(c_2d, float(hurst_value))
-    else:
-        hv_2d = to_2d(hurst_value).astype(np.float64)
+    p_2d = to_2d(phase_array if phase_wrapped else _wrap_phase(phase_array), SIGNAL_DTYPE)
+
+    # Fill missing metrics with safe defaults if not provided. _entry_candidates() only reads
+    # them, so a default is a read-only zero-stride view rather than a dense (time x asset) fill
+    def fill(value, dtype=np.float64):
+        return np.broadcast_to(np.asarray(value, dtype=dtype), c_2d.shape)
+
+    ltf_m = to_2d(ltf_metric, SIGNAL_DTYPE) if ltf_metric is not None else fill(100.0, SIGNAL_DTYPE)
+    htf_m = to_2d(htf_metric, SIGNAL_DTYPE) if htf_metric is not None else fill(0.0, SIGNAL_DTYPE)
+    vz_2d = to_2d(volatility_zscore, SIGNAL_DTYPE) if volatility_zscore is not None else fill(0.0, SIGNAL_DTYPE)
+    hd_2d = to_2d(htf_direction, SIGNAL_DTYPE) if htf_direction is not None else fill(1.0, SIGNAL_DTYPE)
+    rm_2d = to_2d(rank_metric, SIGNAL_DTYPE) if rank_metric is not None else fill(0.0, SIGNAL_DTYPE)
+
+    bbu_2d = to_2d(bb_upper) if bb_upper is not None else fill(0.0)
+    bbl_2d = to_2d(bb_lower) if bb_lower is not None else fill(0.0)
+    kcu_2d = to_2d(kc_upper) if kc_upper is not None else fill(0.0)
+    kcl_2d = to_2d(kc_lower) if kc_lower is not None else fill(0.0)
+    ama_2d = to_2d(atr_ma) if atr_ma is not None else fill(0.0)
+
+    hv_2d = fill(hurst_value) if np.ndim(hurst_value) == 0 else to_2d(hurst_value)
 
     filter_type_map = {"chop": 0, "hurst": 1, "both": 2}
     mf_type = filter_type_map.get(macro_filter_type, 2)
 
-    long_entries, long_exits, short_entries, short_exits = simulate_portfolio_nb(
-        c_2d, h_2d, l_2d, a_2d, p_2d, ltf_m, htf_m, vz_2d, hd_2d, rm_2d,
+    entry_dir, entry_score = _entry_candidates(
+        h_2d, l_2d, a_2d, p_2d, ltf_m, htf_m, vz_2d, hd_2d, rm_2d,
         bbu_2d, bbl_2d, kcu_2d, kcl_2d, ama_2d,
         hv_2d,
         float(htf_threshold), float(ltf_threshold), float(veto_threshold), float(hurst_threshold), int(mf_type),
-        float(trailing_multiplier), float(breakeven_threshold),
         float(phase_long_center), float(phase_short_center), float(phase_tolerance),
-        int(max_concurrent_trades),
         int(strategy_type),
         float(bot_b_hurst_max), float(bot_b_chop_min),
-        float(bot_b_take_profit_atr), float(bot_b_stop_loss_atr),
-        int(bot_b_max_holding_bars), float(bot_b_rsi_oversold), float(bot_b_rsi_overbought),
-        float(bot_c_take_profit_atr), float(bot_c_stop_loss_atr), int(bot_c_max_holding_bars), float(bot_c_rsi_oversold),
-        float(bot_d_take_profit_atr), float(bot_d_stop_loss_atr), int(bot_d_max_holding_bars), float(bot_d_rsi_oversold)
+        float(bot_b_rsi_oversold), float(bot_b_rsi_overbought),
+        float(bot_c_rsi_oversold), float(bot_d_rsi_oversold),
+    )
+
+    long_entries, long_exits, short_entries, short_exits = simulate_portfolio_nb(
+        c_2d, h_2d, l_2d, a_2d, entry_dir, entry_score, entry_dir.any(axis=1),
+        float(trailing_multiplier), float(breakeven_threshold),
+        int(max_concurrent_trades),
+        int(strategy_type),
+        float(bot_b_take_profit_atr), float(bot_b_stop_loss_atr), int(bot_b_max_holding_bars),
+        float(bot_c_take_profit_atr), float(bot_c_stop_loss_atr), int(bot_c_max_holding_bars),
+        float(bot_d_take_profit_atr), float(bot_d_stop_loss_atr), int(bot_d_max_holding_bars),
     )
 
     if is_1d:
@@ -375,6 +470,83 @@ def build_entries_exits(
     return long_entries, long_exits, short_entries, short_exits
 
 
+def _stop_multiplier(
+    strategy_type: int, trailing_multiplier: float, bot_b_stop: float, bot_c_stop: float, bot_d_stop: float
+) -> float:
+    """ATR multiple of the initial stop distance for the active bot."""
+    if strategy_type == 0:
+        return trailing_multiplier
+    if strategy_type == 1:
+        return bot_b_stop
+    return bot_c_stop if strategy_type == 2 else bot_d_stop
+
+
+# Same eager compile for sizing; the sweep passes column slices of its batch buffers, hence any layout
+_POSITION_SIZE_SIGNATURE = numba.types.Array(numba.float64, 2, "C")(
+    numba.types.Array(numba.float64, 2, "A", readonly=True),
+    numba.types.Array(numba.float64, 2, "A", readonly=True),
+    numba.types.Array(numba.boolean, 2, "A", readonly=True),
+    numba.types.Array(numba.boolean, 2, "A", readonly=True),
+    numba.float64,
+    numba.float64,
+)
+
+
+@numba.njit(_POSITION_SIZE_SIGNATURE, cache=True)
+def _position_size_nb(
+    close: np.ndarray,
+    atr: np.ndarray,
+    long_entries: np.ndarray,
+    short_entries: np.ndarray,
+    risk_per_trade: float,
+    stop_mult: float,
+) -> np.ndarray:
+    """Single pass over (time x asset) for _position_size(); NaN inputs propagate as in NumPy."""
+    n_time, n_assets = close.shape
+    size = np.full((n_time, n_assets), np.nan)
+    for i in range(n_time):
+        for a in range(n_assets):
+            if not (long_entries[i, a] or short_entries[i, a]):
+                continue
+            # ATR Floor to prevent infinite leverage
+            floor = close[i, a] * 0.002
+            safe_atr = atr[i, a] if np.isnan(atr[i, a]) or atr[i, a] >= floor else floor
+            fraction = risk_per_trade * (close[i, a] / (stop_mult * safe_atr))
+            # Cap maximum leverage per trade to 1.0 (100% of equity)
+            size[i, a] = 1.0 if fraction > 1.0 else fraction
+    return size
+
+
+def _position_size(
+    close: np.ndarray,
+    atr: np.ndarray | None,
+    long_entries: np.ndarray,
+    short_entries: np.ndarray,
+    risk_per_trade: float,
+    stop_mult: float,
+) -> np.ndarray:
+    """Percent-of-equity order size at entry bars (NaN elsewhere, and everywhere without ATR).
+
+    THE CORRECT PERCENT SIZING FORMULA (Phase 3.5 Fix)
+    Fraction of Equity = Risk% * (Price / Distance to stop)
+    This ensures that a move of 'Distance_to_Stop' results in a 'Risk%' loss of account equity.
+    """
+    if atr is None:
+        return np.full(np.shape(close), np.nan)
+
+    shape = np.shape(close)
+    shape_2d = (shape[0], int(np.prod(shape[1:])))
+
+    def to_2d(arr, dtype=np.float64):
+        return np.asarray(arr, dtype=dtype).reshape(shape_2d)
+
+    size = _position_size_nb(
+        to_2d(close), to_2d(atr), to_2d(long_entries, np.bool_), to_2d(short_entries, np.bool_),
+        float(risk_per_trade), float(stop_mult),
+    )
+    return size.reshape(shape)
+
+
 def run_backtest(
     close: pd.Series | pd.DataFrame,
     high: pd.Series | pd.DataFrame | None = None,
@@ -472,29 +644,10 @@ def run_backtest(
             bot_d_rsi_oversold=bot_d_rsi_oversold,
         )
 
-        size = np.full(c_val.shape, np.nan)
-        if a_val is not None:
-            # THE CORRECT PERCENT SIZING FORMULA (Phase 3.5 Fix)
-            # Fraction of Equity = Risk% * (Price / Distance to stop)
-            # This ensures that a move of 'Distance_to_Stop' results in a 'Risk%' loss of account equity.
-
-            # ATR Floor to prevent infinite leverage
-            min_atr = c_val * 0.002
-            safe_atr = np.maximum(a_val, min_atr)
-
-            stop_mult = trailing_multiplier if strategy_type == 0 else (
-                bot_b_stop_loss_atr if strategy_type == 1 else (
-                    bot_c_stop_loss_atr if strategy_type == 2 else bot_d_stop_loss_atr
-                )
-            )
-            distance_to_stop = stop_mult * safe_atr
-            calculated_fraction = risk_per_trade * (c_val / distance_to_stop)
-
-            # Cap maximum leverage per trade to 1.0 (100% of equity)
-            calculated_fraction = np.minimum(calculated_fraction, 1.0)
-
-            size[long_entries] = calculated_fraction[long_entries]
-            size[short_entries] = calculated_fraction[short_entries]
+        stop_mult = _stop_multiplier(
+            strategy_type, trailing_multiplier, bot_b_stop_loss_atr, bot_c_stop_loss_atr, bot_d_stop_loss_atr
+        )
+        size = _position_size(c_val, a_val, long_entries, short_entries, risk_per_trade, stop_mult)
 
         # Run VectorBT portfolio simulation
         # Using group_by=True groups all columns into a single portfolio for 2D inputs
@@ -513,15 +666,15 @@ def run_backtest(
             group_by=True if close.ndim == 2 else None,
         )
 
-        stats = pf.stats()
+        metrics = portfolio_metrics(pf).iloc[0]
 
         return {
-            "total_return": float(stats.get("Total Return [%]", 0.0)),
-            "sharpe_ratio": float(stats.get("Sharpe Ratio", 0.0)),
-            "max_drawdown": float(stats.get("Max Drawdown [%]", 0.0)),
-            "win_rate": float(stats.get("Win Rate [%]", 0.0)),
-            "total_trades": int(stats.get("Total Trades", 0)),
-            "profit_factor": float(stats.get("Profit Factor", 0.0)),
+            "total_return": float(metrics["total_return"]),
+            "sharpe_ratio": float(metrics["sharpe_ratio"]),
+            "max_drawdown": float(metrics["max_drawdown"]),
+            "win_rate": float(metrics["win_rate"]),
+            "total_trades": int(metrics["total_trades"]),
+            "profit_factor": float(metrics["profit_factor"]),
             "portfolio": pf,
         }
 
@@ -530,7 +683,236 @@ def run_backtest(
         return None
 
 
-def run_parameter_sweep(
+# Fixed sweep inputs, cached per worker process by the pool initializer
+_SWEEP_INPUTS: dict = {}
+# Shared memory blocks attached by this worker; kept referenced so the views stay valid
+_SWEEP_SHM: list[shared_memory.SharedMemory] = []
+
+
+def _share_sweep_inputs(inputs: dict) -> tuple[dict, list[shared_memory.SharedMemory]]:
+    """Move numeric array inputs into shared memory blocks.
+
+    Returns a picklable copy of ``inputs`` in which each numeric ndarray,
+    Series or DataFrame is replaced by a ``("__shm__", spec)`` marker, plus
+    the created blocks. The caller owns the blocks and must unlink them.
+    """
+    shared, blocks = {}, []
+    for key, value in inputs.items():
+        if isinstance(value, (pd.Series, pd.DataFrame)):
+            arr = value.to_numpy()
+        elif isinstance(value, np.ndarray):
+            arr = value
+        else:
+            shared[key] = value
+            continue
+        if arr.dtype.kind not in "biuf" or arr.nbytes == 0:
+            shared[key] = value
+            continue
+
+        shm = shared_memory.SharedMemory(create=True, size=arr.nbytes)
+        blocks.append(shm)
+        np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[:] = arr
+        spec = {"name": shm.name, "shape": arr.shape, "dtype": arr.dtype.str}
+        if isinstance(value, pd.Series):
+            spec.update(kind="series", index=value.index, name_=value.name)
+        elif isinstance(value, pd.DataFrame):
+            spec.update(kind="frame", index=value.index, columns=value.columns)
+        else:
+            spec["kind"] = "array"
+        shared[key] = ("__shm__", spec)
+    return shared, blocks
+
+
+def _attach_shared_input(spec: dict):
+    """Rebuild a zero-copy ndarray/Series/DataFrame view over a shared memory block."""
+    shm = shared_memory.SharedMemory(name=spec["name"])
+    _SWEEP_SHM.append(shm)
+    arr = np.ndarray(spec["shape"], dtype=np.dtype(spec["dtype"]), buffer=shm.buf)
+    if spec["kind"] == "series":
+        return pd.Series(arr, index=spec["index"], name=spec["name_"], copy=False)
+    if spec["kind"] == "frame":
+        return pd.DataFrame(arr, index=spec["index"], columns=spec["columns"], copy=False)
+    return arr
+
+
+def _init_sweep_worker(inputs: dict) -> None:
+    """Process pool initializer: keep the sweep's fixed inputs in worker memory."""
+    global _SWEEP_INPUTS
+    _SWEEP_INPUTS = {
+        key: _attach_shared_input(value[1]) if isinstance(value, tuple) and value[:1] == ("__shm__",) else value
+        for key, value in inputs.items()
+    }
+
+
+# Grid points simulated together in one vbt.Portfolio.from_signals() call
+_SWEEP_BATCH_SIZE = 16
+
+# Per-process signal/size matrices of finished batches, keyed by (n_time, width); a full
+# batch and the trailing partial one are the only shapes a sweep produces
+_SWEEP_BUFFERS: dict[tuple[int, int], tuple[np.ndarray, ...]] = {}
+
+# Sweep row keys for the (hurst, phase_long, phase_short, trailing, macro) grid point
+_PARAM_NAMES = ("hurst_threshold", "phase_long", "phase_short", "trailing_multiplier", "macro_filter_type")
+
+# Metrics reported per grid point (see portfolio_metrics())
+_METRIC_NAMES = ("total_return", "sharpe_ratio", "max_drawdown", "win_rate", "profit_factor")
+
+# Inputs consumed by the portfolio simulation rather than build_entries_exits()
+_SIMULATION_INPUTS = ("close", "risk_per_trade", "initial_capital", "commission", "freq")
+
+
+def _combo_params(params: tuple) -> dict:
+    """build_entries_exits() keyword arguments for one (hurst, phase_long, phase_short, trailing, macro) point."""
+    ht, pl, ps, tm, mf = params
+    return {
+        "hurst_threshold": ht,
+        "ltf_threshold": 50 - 118 * (ht - 0.5),
+        "htf_threshold": 45,  # change from 38.2 to catch the trend beginning earlier
+        "macro_filter_type": mf,
+        "trailing_multiplier": tm,
+        "phase_long_center": pl,
+        "phase_short_center": ps,
+    }
+
+
+def _run_sweep_batch(batch: list[tuple], inputs: dict | None = None) -> list[dict]:
+    """Backtest several grid points with a single VectorBT simulation.
+
+    Each point's entry/exit and size matrices are laid side by side in one
+    wide (time x point*asset) array and grouped per point, so portfolio
+    simulation and stats run once per batch instead of once per point.
+    Every group matches what run_backtest() would report for that point.
+    """
+    if inputs is None:
+        inputs = _SWEEP_INPUTS
+
+    # Zero metrics stand in for every point if the batch fails
+    rows = [
+        dict(zip(_PARAM_NAMES, params), **{name: 0.0 for name in _METRIC_NAMES}, total_trades=0)
+        for params in batch
+    ]
+    if not batch:
+        return rows
+
+    try:
+        close = inputs["close"]
+        signal_inputs = {
+            key: value.values if isinstance(value, (pd.Series, pd.DataFrame)) else value
+            for key, value in inputs.items()
+            if key not in _SIMULATION_INPUTS
+        }
+        c_val = close.values if hasattr(close, "values") else np.asarray(close)
+        c_2d = c_val.reshape(len(c_val), -1)
+        a_val = signal_inputs.get("atr")
+        a_2d = None if a_val is None else np.asarray(a_val).reshape(c_2d.shape)
+        n_time, n_assets = c_2d.shape
+        width = n_assets * len(batch)
+
+        # Every cell is overwritten below, so buffers from an earlier batch of this shape are reused as-is
+        buffers = _SWEEP_BUFFERS.pop((n_time, width), None)
+        if buffers is None:
+            buffers = (*(np.empty((n_time, width), dtype=np.bool_) for _ in range(4)), np.empty((n_time, width)))
+        long_entries, long_exits, short_entries, short_exits, size = buffers
+
+        strategy_type = inputs["strategy_type"]
+        for j, params in enumerate(batch):
+            cols = slice(j * n_assets, (j + 1) * n_assets)
+            signals = build_entries_exits(c_val, **signal_inputs, **_combo_params(params))
+            for out, sig in zip((long_entries, long_exits, short_entries, short_exits), signals):
+                out[:, cols] = sig.reshape(n_time, n_assets)
+
+            stop_mult = _stop_multiplier(
+                strategy_type, params[3],
+                inputs["bot_b_stop_loss_atr"], inputs["bot_c_stop_loss_atr"], inputs["bot_d_stop_loss_atr"],
+            )
+            size[:, cols] = _position_size(
+                c_2d, a_2d, long_entries[:, cols], short_entries[:, cols], inputs["risk_per_trade"], stop_mult
+            )
+
+        index = close.index if hasattr(close, "index") else None
+        pf = vbt.Portfolio.from_signals(
+            pd.DataFrame(np.tile(c_2d, (1, len(batch))), index=index),
+            entries=long_entries,
+            exits=long_exits,
+            short_entries=short_entries,
+            short_exits=short_exits,
+            size=size if not np.all(np.isnan(size)) else None,
+            size_type="percent",
+            accumulate=False,
+            init_cash=inputs["initial_capital"],
+            fees=inputs["commission"],
+            freq=inputs["freq"],
+            group_by=np.repeat(np.arange(len(batch)), n_assets),
+        )
+
+        # One row per group, in batch order; label each with the grid point it simulates
+        frame = portfolio_metrics(pf)[[*_METRIC_NAMES, "total_trades"]].astype({"total_trades": int})
+        frame.index = pd.MultiIndex.from_tuples(batch, names=_PARAM_NAMES)
+        rows = frame.reset_index().to_dict("records")
+        _SWEEP_BUFFERS[(n_time, width)] = buffers
+
+    except Exception as e:
+        logger.error(f"Sweep batch of {len(batch)} combinations failed: {e}")
+
+    return rows
+
+
+# Minimum traded configs seen before pruning kicks in
+_PRUNE_MIN_SAMPLES = 10
+
+
+def _dispatch_sweep(
+    combos: list[tuple],
+    evaluate: Callable[[list[tuple]], Iterable[dict]],
+    prune: bool = False,
+) -> Iterator[dict]:
+    """Evaluate grid points in order, optionally skipping clearly dominated ones.
+
+    With ``prune``, the grid is walked one hurst_threshold block at a time.
+    A config is skipped when its sibling (same phase/trailing/macro params)
+    in the previous block scored a Sharpe below ``median - 2 * std`` of all
+    traded configs seen so far; skipped configs inherit that score so they
+    stay pruned while it remains dominated.
+    """
+    if not prune:
+        yield from evaluate(combos)
+        logger.info(f"Sweep complete: {len(combos)} results")
+        return
+
+    blocks: dict[float, list[tuple]] = {}
+    for params in combos:
+        blocks.setdefault(params[0], []).append(params)
+
+    seen: list[float] = []
+    previous: dict[tuple, float] = {}
+    pruned = 0
+    for block in blocks.values():
+        cutoff = -np.inf
+        if len(seen) >= _PRUNE_MIN_SAMPLES:
+            cutoff = float(np.median(seen) - 2.0 * np.std(seen))
+
+        current: dict[tuple, float] = {}
+        keep = []
+        for params in block:
+            sibling = previous.get(params[1:])
+            if sibling is not None and sibling < cutoff:
+                current[params[1:]] = sibling
+                pruned += 1
+            else:
+                keep.append(params)
+
+        for params, row in zip(keep, evaluate(keep)):
+            sharpe = float(row["sharpe_ratio"])
+            if row["total_trades"] > 0 and np.isfinite(sharpe):
+                seen.append(sharpe)
+                current[params[1:]] = sharpe
+            yield row
+        previous = current
+
+    logger.info(f"Sweep complete: {len(combos) - pruned} results ({pruned} dominated combinations pruned)")
+
+
+def iter_parameter_sweep(
     close: pd.Series | pd.DataFrame,
     high: pd.Series | pd.DataFrame | None = None,
     low: pd.Series | pd.DataFrame | None = None,
@@ -574,8 +956,21 @@ def run_parameter_sweep(
     bot_d_stop_loss_atr: float = 1.0,
     bot_d_max_holding_bars: int = 12,
     bot_d_rsi_oversold: float = 30.0,
-) -> pd.DataFrame:
-    """Sweep strategy parameters across a multi-dimensional grid."""
+    workers: int = 1,
+    prune: bool = False,
+    exclude_combos: set[tuple] | None = None,
+) -> Iterator[dict]:
+    """Sweep strategy parameters across a multi-dimensional grid, yielding one row per grid point.
+
+    Rows are yielded in grid order as soon as they complete, so callers can
+    stream them to disk instead of holding the whole sweep in memory.
+    Grid points are independent backtests, so with ``workers > 1`` they are
+    dispatched across a process pool (``workers <= 0`` uses every CPU core).
+    ``prune`` skips configs that were clearly dominated at the previous
+    hurst_threshold (see _dispatch_sweep()). ``exclude_combos`` lists
+    (hurst, phase_long, phase_short, trailing, macro) tuples already
+    evaluated elsewhere; they are skipped.
+    """
     if hurst_range is None:
         hurst_range = [0.35, 0.40, 0.45, 0.50, 0.55, 0.60]
     if phase_long_range is None:
@@ -587,68 +982,166 @@ def run_parameter_sweep(
     if macro_filter_type_range is None:
         macro_filter_type_range = ["both"]
 
-    results = []
-    total_combos = len(hurst_range) * len(phase_long_range) * len(phase_short_range) * len(trailing_multiplier_range) * len(macro_filter_type_range)
-    logger.info(f"Parameter sweep: {total_combos} combinations")
-
-    for ht in hurst_range:
-        for pl in phase_long_range:
-            for ps in phase_short_range:
-                for tm in trailing_multiplier_range:
-                    for mf in macro_filter_type_range:
-                        ltf_chop_threshold = 50 - 118 * (ht - 0.5)
-
-                        result = run_backtest(
-                            close, high=high, low=low, atr=atr, phase_array=phase_array, hurst_value=hurst_value,
-                            ltf_metric=ltf_metric, htf_metric=htf_metric, volatility_zscore=volatility_zscore,
-                            htf_direction=htf_direction, rank_metric=rank_metric,
-                            bb_upper=bb_upper, bb_lower=bb_lower, kc_upper=kc_upper, kc_lower=kc_lower, atr_ma=atr_ma,
-                            hurst_threshold=ht,
-                            ltf_threshold=ltf_chop_threshold,
-                            htf_threshold=45, # change from 38.2 to catch the trend beginning earlier
-                            macro_filter_type=mf,
-                            trailing_multiplier=tm,
-                            breakeven_threshold=breakeven_threshold,
-                            max_concurrent_trades=max_concurrent_trades,
-                            risk_per_trade=risk_per_trade,
-                            initial_capital=initial_capital,
-                            commission=commission,
-                            phase_long_center=pl,
-                            phase_short_center=ps,
-                            freq=freq,
-                            strategy_type=strategy_type,
-                            bot_b_hurst_max=bot_b_hurst_max,
-                            bot_b_chop_min=bot_b_chop_min,
-                            bot_b_take_profit_atr=bot_b_take_profit_atr,
-                            bot_b_stop_loss_atr=bot_b_stop_loss_atr,
-                            bot_b_max_holding_bars=bot_b_max_holding_bars,
-                            bot_b_rsi_oversold=bot_b_rsi_oversold,
-                            bot_b_rsi_overbought=bot_b_rsi_overbought,
-                            bot_c_take_profit_atr=bot_c_take_profit_atr,
-                            bot_c_stop_loss_atr=bot_c_stop_loss_atr,
-                            bot_c_max_holding_bars=bot_c_max_holding_bars,
-                            bot_c_rsi_oversold=bot_c_rsi_oversold,
-                            bot_d_take_profit_atr=bot_d_take_profit_atr,
-                            bot_d_stop_loss_atr=bot_d_stop_loss_atr,
-                            bot_d_max_holding_bars=bot_d_max_holding_bars,
-                            bot_d_rsi_oversold=bot_d_rsi_oversold,
-                        )
-
-                        row = {
-                            "hurst_threshold": ht,
-                            "phase_long": pl,
-                            "phase_short": ps,
-                            "trailing_multiplier": tm,
-                            "macro_filter_type": mf,
-                            "total_return": result["total_return"] if result else 0.0,
-                            "sharpe_ratio": result["sharpe_ratio"] if result else 0.0,
-                            "max_drawdown": result["max_drawdown"] if result else 0.0,
-                        "win_rate": result["win_rate"] if result else 0.0,
-                        "profit_factor": result["profit_factor"] if result else 0.0,
-                        "total_trades": result["total_trades"] if result else 0,
-                    }
-                    results.append(row)
-
-    df = pd.DataFrame(results)
-    logger.info(f"Sweep complete: {len(df)} results")
-    return df
+    inputs = {
+        "close": close, "high": high, "low": low, "atr": atr,
+        # Wrapped once here rather than in every grid point's build_entries_exits() call
+        "phase_array": None if phase_array is None else _wrap_phase(phase_array), "phase_wrapped": True,
+        "hurst_value": hurst_value,
+        "ltf_metric": ltf_metric, "htf_metric": htf_metric, "volatility_zscore": volatility_zscore,
+        "htf_direction": htf_direction, "rank_metric": rank_metric,
+        "bb_upper": bb_upper, "bb_lower": bb_lower, "kc_upper": kc_upper, "kc_lower": kc_lower, "atr_ma": atr_ma,
+        "breakeven_threshold": breakeven_threshold,
+        "max_concurrent_trades": max_concurrent_trades,
+        "risk_per_trade": risk_per_trade,
+        "initial_capital": initial_capital,
+        "commission": commission,
+        "freq": freq,
+        "strategy_type": strategy_type,
+        "bot_b_hurst_max": bot_b_hurst_max,
+        "bot_b_chop_min": bot_b_chop_min,
+        "bot_b_take_profit_atr": bot_b_take_profit_atr,
+        "bot_b_stop_loss_atr": bot_b_stop_loss_atr,
+        "bot_b_max_holding_bars": bot_b_max_holding_bars,
+        "bot_b_rsi_oversold": bot_b_rsi_oversold,
+        "bot_b_rsi_overbought": bot_b_rsi_overbought,
+        "bot_c_take_profit_atr": bot_c_take_profit_atr,
+        "bot_c_stop_loss_atr": bot_c_stop_loss_atr,
+        "bot_c_max_holding_bars": bot_c_max_holding_bars,
+        "bot_c_rsi_oversold": bot_c_rsi_oversold,
+        "bot_d_take_profit_atr": bot_d_take_profit_atr,
+        "bot_d_stop_loss_atr": bot_d_stop_loss_atr,
+        "bot_d_max_holding_bars": bot_d_max_holding_bars,
+        "bot_d_rsi_oversold": bot_d_rsi_oversold,
+    }
+
+    combos = list(product(hurst_range, phase_long_range, phase_short_range, trailing_multiplier_range, macro_filter_type_range))
+    if exclude_combos:
+        combos = [c for c in combos if c not in exclude_combos]
+    n_workers = (os.cpu_count() or 1) if workers <= 0 else workers
+    n_workers = max(1, min(n_workers, len(combos)))
+    logger.info(f"Parameter sweep: {len(combos)} combinations ({n_workers} worker(s))")
+
+    if n_workers > 1:
+        # Arrays live in shared memory and the initializer maps them once per worker;
+        # tasks carry only the param tuple
+        shared_inputs, blocks = _share_sweep_inputs(inputs)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=n_workers, initializer=_init_sweep_worker, initargs=(shared_inputs,)
+            ) as executor:
+                def evaluate(batch: list[tuple]) -> Iterator[dict]:
+                    # Small enough that every worker gets a share of the batch
+                    step = max(1, min(_SWEEP_BATCH_SIZE, -(-len(batch) // n_workers)))
+                    chunks = [batch[i:i + step] for i in range(0, len(batch), step)]
+                    return chain.from_iterable(executor.map(_run_sweep_batch, chunks))
+
+                try:
+                    yield from _dispatch_sweep(combos, evaluate, prune)
+                except BaseException:
+                    # Consumer stopped early (GeneratorExit) or failed: drop queued combos
+                    # instead of letting the with-block wait for the whole grid
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+    else:
+        def evaluate(batch: list[tuple]) -> Iterator[dict]:
+            for i in range(0, len(batch), _SWEEP_BATCH_SIZE):
+                yield from _run_sweep_batch(batch[i:i + _SWEEP_BATCH_SIZE], inputs)
+
+        try:
+            yield from _dispatch_sweep(combos, evaluate, prune)
+        finally:
+            # Pool workers drop their buffers on exit; this process keeps running
+            _SWEEP_BUFFERS.clear()
+
+
+def run_parameter_sweep(*args, **kwargs) -> pd.DataFrame:
+    """Sweep strategy parameters across a multi-dimensional grid.
+
+    Collects iter_parameter_sweep() (same arguments) into a DataFrame.
+    """
+    return pd.DataFrame(list(iter_parameter_sweep(*args, **kwargs)))
+
+
+def _refine_range(coarse: list[float], best: float, refine_factor: int) -> list[float]:
+    """Build a dense range spanning one coarse step either side of the winning value."""
+    values = sorted(coarse)
+    idx = values.index(best)
+    lo = values[idx - 1] if idx > 0 else best
+    hi = values[idx + 1] if idx < len(values) - 1 else best
+    if lo == hi:
+        return [best]
+    refined = np.linspace(lo, hi, max(refine_factor, 2))
+    return sorted({round(float(v), 4) for v in refined} | {best})
+
+
+def _coarse_range(values: list[float]) -> list[float]:
+    """Thin a range to its endpoints and midpoint (ranges of <= 3 values are kept)."""
+    if len(values) <= 3:
+        return list(values)
+    return [values[0], values[len(values) // 2], values[-1]]
+
+
+def run_multires_sweep(
+    close: pd.Series | pd.DataFrame,
+    hurst_range: list[float],
+    phase_long_range: list[float],
+    phase_short_range: list[float],
+    trailing_multiplier_range: list[float],
+    macro_filter_type_range: list[str] | None = None,
+    refine_factor: int = 3,
+    **kwargs,
+) -> pd.DataFrame:
+    """Coarse-to-fine parameter sweep.
+
+    Stage 1 sweeps the endpoints and midpoint of each numeric range.
+    Stage 2 sweeps ``refine_factor`` points within one coarse step of the
+    stage-1 winner, skipping points stage 1 already evaluated. Both stages
+    are merged so callers rank the union.
+    Remaining keyword arguments are forwarded to run_parameter_sweep().
+    """
+    if macro_filter_type_range is None:
+        macro_filter_type_range = ["both"]
+
+    ranges = {
+        "hurst_threshold": list(hurst_range),
+        "phase_long": list(phase_long_range),
+        "phase_short": list(phase_short_range),
+        "trailing_multiplier": list(trailing_multiplier_range),
+    }
+    coarse = {name: _coarse_range(r) for name, r in ranges.items()}
+
+    coarse_df = run_parameter_sweep(
+        close,
+        hurst_range=coarse["hurst_threshold"],
+        phase_long_range=coarse["phase_long"],
+        phase_short_range=coarse["phase_short"],
+        trailing_multiplier_range=coarse["trailing_multiplier"],
+        macro_filter_type_range=macro_filter_type_range,
+        **kwargs,
+    )
+
+    best = find_best_params(coarse_df, top_n=1)
+    if best.empty:
+        return coarse_df
+
+    winner = best.iloc[0]
+    fine = {name: _refine_range(values, float(winner[name]), refine_factor) for name, values in coarse.items()}
+    logger.info(f"Refining sweep around {', '.join(f'{k}={winner[k]}' for k in fine)}")
+
+    fine_df = run_parameter_sweep(
+        close,
+        hurst_range=fine["hurst_threshold"],
+        phase_long_range=fine["phase_long"],
+        phase_short_range=fine["phase_short"],
+        trailing_multiplier_range=fine["trailing_multiplier"],
+        macro_filter_type_range=[winner["macro_filter_type"]],
+        exclude_combos=set(product(*coarse.values(), macro_filter_type_range)),
+        **kwargs,
+    )
+
+    merged = pd.concat([coarse_df, fine_df], ignore_index=True)
+    return merged.drop_duplicates(subset=[*ranges, "macro_filter_type"]).reset_index(drop=True)
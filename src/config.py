@@ -4,6 +4,8 @@ Loads settings from .env (via Pydantic Settings) and TOML files (asset lists,
 strategy params, timeframe mappings). All other modules import config from here.
 """
 
+import copy
+import pickle
 import sys
 from pathlib import Path
 
@@ -14,6 +16,8 @@ from pydantic_settings import BaseSettings
 # Project root is the parent of src/
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 CONFIG_DIR = PROJECT_ROOT / "config"
+# Parsed TOML snapshots, reused while the source file's mtime/size are unchanged
+CONFIG_CACHE_DIR = PROJECT_ROOT / ".cache" / "config"
 
 # TOML loading: stdlib tomllib on 3.11+, tomli on 3.10
 if sys.version_info >= (3, 11):
@@ -24,15 +28,51 @@ else:
     except ImportError as e:
         raise ImportError("Install tomli for Python < 3.11: uv add tomli") from e
 
+# In-process layer over the pickle cache: path -> (stamp, parsed dict)
+_TOML_MEMO: dict[str, tuple[tuple, dict]] = {}
+
 
 def _load_toml(filename: str) -> dict:
-    """Load a TOML file from the config directory."""
+    """Load a TOML file from the config directory.
+
+    The parsed dict is cached as a pickle under .cache/config and reused
+    until the TOML file's mtime or size changes. Within a process it is also
+    memoized, so repeated loads (e.g. StrategyConfig and PaperConfig both
+    reading strategy.toml) cost a stat() and a copy instead of a file read.
+    """
     path = CONFIG_DIR / filename
     if not path.exists():
         logger.warning(f"Config file not found: {path}")
         return {}
+
+    stat = path.stat()
+    stamp = (str(path), stat.st_mtime_ns, stat.st_size)
+    memo = _TOML_MEMO.get(str(path))
+    if memo is not None and memo[0] == stamp:
+        # Copied so callers mutating their config never touch the memo
+        return copy.deepcopy(memo[1])
+
+    cache_path = CONFIG_CACHE_DIR / f"{filename}.pickle"
+    try:
+        with open(cache_path, "rb") as f:
+            cached_stamp, data = pickle.load(f)
+        if cached_stamp == stamp:
+            _TOML_MEMO[str(path)] = (stamp, data)
+            return copy.deepcopy(data)
+    except Exception:
+        pass  # Missing or stale cache: fall through to a fresh parse
+
     with open(path, "rb") as f:
-        return tomllib.load(f)
+        data = tomllib.load(f)
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, "wb") as f:
+            pickle.dump((stamp, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as e:
+        logger.debug(f"Could not write config cache {cache_path}: {e}")
+    _TOML_MEMO[str(path)] = (stamp, data)
+    return copy.deepcopy(data)
 
 
 class AppSettings(BaseSettings):
@@ -42,6 +82,8 @@ class AppSettings(BaseSettings):
 
     # Database
     duckdb_path: str = Field(default="data/rabbit.duckdb", description="Path to DuckDB database file")
+    duckdb_threads: int = Field(default=0, description="DuckDB worker threads (0 = DuckDB default)")
+    duckdb_memory_limit: str = Field(default="", description="DuckDB memory limit, e.g. '8GB' (empty = DuckDB default)")
 
     # Postgres (Optional)
     database_host: str = Field(default="", description="Postgres Host")
@@ -177,6 +219,13 @@ class StrategyConfig:
         self.bot_d_rsi_period: int = bot_d.get("rsi_period", 14)
         self.bot_d_rsi_oversold: float = bot_d.get("rsi_oversold", 30.0)
 
+    @property
+    def backtest_timeframes(self) -> list[str]:
+        """Timeframes traded by any bot, in bot order without duplicates."""
+        return list(dict.fromkeys(
+            self.bot_a_timeframes + self.bot_b_timeframes + self.bot_c_timeframes + self.bot_d_timeframes
+        ))
+
 
 class PaperConfig:
     """Paper trading parameters loaded from config/strategy.toml."""
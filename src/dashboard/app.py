@@ -10,21 +10,61 @@ the background; Streamlit reads from it on each rerun.
 Launch: uv run streamlit run src/dashboard/app.py
 """
 
+import os
 import time
 from pathlib import Path
 
+import duckdb
+import numpy as np
 import pandas as pd
 import streamlit as st
 from apscheduler.schedulers.background import BackgroundScheduler
 from loguru import logger
 
-# Lazy imports to avoid circular deps and speed up initial load
+from src.config import load_config
+from src.dashboard.charts import create_candlestick_chart
+from src.data_loader import get_connection, get_latest_closes, reset_portfolio
+from src.signals.filters import generate_signal, generate_signals_batch
+
 _PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 
 # ---------------------------------------------------------------------------
 # Background data cache — written by APScheduler, read by Streamlit
 # ---------------------------------------------------------------------------
-_bg_cache: dict[str, pd.DataFrame] = {}
+@st.cache_resource(show_spinner=False)
+def _bg_cache() -> dict[str, pd.DataFrame]:
+    """Process-wide dict shared by every rerun, session and the scheduler thread.
+
+    ``streamlit run`` re-executes this script on each rerun, so a module-level
+    dict would be a new object every time; cache_resource keeps one.
+    """
+    return {}
+
+
+# Last good scanner table on disk, so a restarted server paints without a full recompute
+_SCANNER_CACHE_PATH = _PROJECT_ROOT / ".cache" / "scanner.parquet"
+_SCANNER_CACHE_MAX_AGE = 300  # seconds
+
+
+def _save_scanner_cache(df: pd.DataFrame) -> None:
+    """Write the scanner table to _SCANNER_CACHE_PATH (temp file + rename, so readers never see a partial file)."""
+    try:
+        _SCANNER_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = _SCANNER_CACHE_PATH.with_suffix(".parquet.tmp")
+        df.to_parquet(tmp_path, compression="zstd", index=False)
+        os.replace(tmp_path, _SCANNER_CACHE_PATH)
+    except Exception as e:
+        logger.debug(f"Could not write scanner cache {_SCANNER_CACHE_PATH}: {e}")
+
+
+def _read_scanner_cache() -> pd.DataFrame | None:
+    """Return the persisted scanner table, or None if missing, unreadable or older than _SCANNER_CACHE_MAX_AGE."""
+    try:
+        if time.time() - _SCANNER_CACHE_PATH.stat().st_mtime > _SCANNER_CACHE_MAX_AGE:
+            return None
+        return pd.read_parquet(_SCANNER_CACHE_PATH)
+    except Exception:
+        return None  # Missing or corrupt cache: fall through to a fresh compute
 
 
 def _refresh_scanner_data() -> None:
@@ -36,7 +76,9 @@ def _refresh_scanner_data() -> None:
             return
         # Bypass Streamlit cache — direct computation
         df = _compute_scanner_data(db_path)
-        _bg_cache["scanner"] = df
+        _bg_cache()["scanner"] = df
+        if not df.empty:
+            _save_scanner_cache(df)
         logger.debug(f"Background refresh complete: {len(df)} rows")
     except Exception as e:
         logger.error(f"Background refresh failed: {e}")
@@ -48,57 +90,52 @@ def _start_scheduler() -> None:
         scheduler = BackgroundScheduler(daemon=True)
         scheduler.add_job(_refresh_scanner_data, "interval", seconds=60, id="scanner_refresh")
         scheduler.start()
-        # Trigger first refresh immediately
-        _refresh_scanner_data()
+        cached = _read_scanner_cache()
+        if cached is not None and not cached.empty:
+            # Paint from the previous run's table; the first refresh runs in the background
+            _bg_cache()["scanner"] = cached
+            scheduler.add_job(_refresh_scanner_data, id="scanner_warm")
+        else:
+            # Trigger first refresh immediately
+            _refresh_scanner_data()
         st.session_state["scheduler_started"] = True
         logger.info("APScheduler started — refreshing scanner data every 60s")
 
 
+@st.cache_resource(show_spinner=False)
 def _get_config():
-    """Load config lazily."""
-    from src.config import load_config
+    """Load config once per server process (shared across reruns and the scheduler thread).
+
+    "Refresh Now" calls ``_get_config.clear()`` to pick up edits without a restart.
+    """
     return load_config()
 
 
 def _compute_scanner_data(db_path: str) -> pd.DataFrame:
     """Compute scanner data from DB (no Streamlit cache — used by scheduler)."""
-    import duckdb
-
-    from src.signals.filters import generate_signal
-
     conn = duckdb.connect(db_path, read_only=True)
 
     try:
-        pairs = conn.execute(
-            "SELECT DISTINCT symbol, timeframe FROM ohlcv ORDER BY symbol, timeframe"
-        ).fetchdf()
+        # One query for every (symbol, timeframe) series instead of one (plus an HTF one) per pair
+        ohlcv = conn.execute("SELECT * FROM ohlcv ORDER BY symbol, timeframe, timestamp").fetchdf()
 
-        if pairs.empty:
+        if ohlcv.empty:
             return pd.DataFrame()
 
-        rows = []
-        for _, pair in pairs.iterrows():
-            sym, tf = pair["symbol"], pair["timeframe"]
-            df = conn.execute(
-                "SELECT * FROM ohlcv WHERE symbol = ? AND timeframe = ? ORDER BY timestamp",
-                [sym, tf],
-            ).fetchdf()
-
-            if df.empty or len(df) < 20:
-                continue
-
-            # Fetch HTF data (assume '1d' is HTF for MTF logic)
-            df_htf = conn.execute(
-                "SELECT * FROM ohlcv WHERE symbol = ? AND timeframe = '1d' ORDER BY timestamp",
-                [sym],
-            ).fetchdf()
+        series = {
+            key: group.reset_index(drop=True)
+            for key, group in ohlcv.groupby(["symbol", "timeframe"], sort=False)
+        }
+        no_htf = ohlcv.iloc[0:0]
 
-            # Generate full signal dict with MTF
-            sig_data = generate_signal(df, sym, tf, hurst_threshold=0.6, lowpass_cutoff=0.1, htf_df=df_htf)
-
-            if sig_data is None:
-                continue
+        data = {key: df for key, df in series.items() if len(df) >= 20}
+        # HTF data (assume '1d' is HTF for MTF logic)
+        htf_data = {sym: series.get((sym, "1d"), no_htf) for sym, _ in data}
 
+        # Generate full signal dicts with MTF; pairs are independent, so they run across a process pool
+        rows = []
+        for sig_data in generate_signals_batch(data, hurst_threshold=0.6, lowpass_cutoff=0.1, htf_data=htf_data):
+            sym, tf = sig_data["symbol"], sig_data["timeframe"]
             rows.append({
                 "Symbol": sym,
                 "Timeframe": tf,
@@ -109,7 +146,7 @@ def _compute_scanner_data(db_path: str) -> pd.DataFrame:
                 "Amplitude": round(sig_data["amplitude"], 2),
                 "Veto Z": round(sig_data["atr_zscore"], 2),
                 "Signal": sig_data["signal"].upper(),
-                "Last Price": round(float(df["close_price"].iloc[-1]), 2),
+                "Last Price": round(float(data[sym, tf]["close_price"].iloc[-1]), 2),
             })
 
         return pd.DataFrame(rows)
@@ -123,17 +160,19 @@ def _compute_scanner_data(db_path: str) -> pd.DataFrame:
 
 def _load_scanner_data(db_path: str) -> pd.DataFrame:
     """Return scanner data — prefers background cache, falls back to direct compute."""
-    if "scanner" in _bg_cache and not _bg_cache["scanner"].empty:
-        return _bg_cache["scanner"]
-    # First load before scheduler has run
+    scanner = _bg_cache().get("scanner")
+    if scanner is not None and not scanner.empty:
+        return scanner
+    # First load before scheduler has run: a recent table from the previous server run, else compute
+    cached = _read_scanner_cache()
+    if cached is not None and not cached.empty:
+        return cached
     return _compute_scanner_data(db_path)
 
 
-@st.cache_data(ttl=60)
+@st.cache_data(ttl=60, show_spinner=False)
 def _load_ohlcv(db_path: str, symbol: str, timeframe: str) -> pd.DataFrame:
     """Load OHLCV data for a specific symbol/timeframe."""
-    import duckdb
-
     conn = duckdb.connect(db_path, read_only=True)
     try:
         df = conn.execute(
@@ -148,6 +187,29 @@ def _load_ohlcv(db_path: str, symbol: str, timeframe: str) -> pd.DataFrame:
         conn.close()
 
 
+# Cell CSS by value for the scanner's Signal column and the confluence heatmap
+_SIGNAL_STYLES = {
+    "LONG": "color: #26a69a; font-weight: bold",
+    "SHORT": "color: #ef5350; font-weight: bold",
+}
+_HEATMAP_STYLES = {
+    "LONG": "background-color: #26a69a; color: white; font-weight: bold",
+    "SHORT": "background-color: #ef5350; color: white; font-weight: bold",
+    "NEUTRAL": "color: gray",
+    # Action Styling
+    "STRONG BUY": "background-color: #00695c; color: white; font-weight: bold",  # Dark Green
+    "BUY": "background-color: #26a69a; color: white; font-weight: bold",
+    "STRONG SELL": "background-color: #b71c1c; color: white; font-weight: bold",  # Dark Red
+    "SELL": "background-color: #ef5350; color: white; font-weight: bold",
+    "WAIT": "color: gray; font-style: italic",
+}
+
+
+def _cell_styles(col: pd.Series, styles: dict[str, str]) -> pd.Series:
+    """CSS for every cell of ``col`` at once (Styler.apply); values without a style get ""."""
+    return col.map(styles).fillna("")
+
+
 def _render_scanner(scanner_df: pd.DataFrame) -> tuple[str, str] | None:
     """Render the scanner table and return selected symbol/timeframe."""
     st.subheader("Asset Scanner")
@@ -156,15 +218,8 @@ def _render_scanner(scanner_df: pd.DataFrame) -> tuple[str, str] | None:
         st.info("No data available. Run `python main.py fetch` to ingest market data.")
         return None
 
-    # Color-code signals
-    def _highlight_signal(val):
-        if val == "LONG":
-            return "color: #26a69a; font-weight: bold"
-        elif val == "SHORT":
-            return "color: #ef5350; font-weight: bold"
-        return ""
-
-    styled = scanner_df.style.map(_highlight_signal, subset=["Signal"])
+    # Color-code signals: one dict lookup per column instead of a Python call per cell
+    styled = scanner_df.style.apply(_cell_styles, subset=["Signal"], styles=_SIGNAL_STYLES)
     st.dataframe(styled, use_container_width=True, height=300)
 
     # Symbol selector
@@ -180,31 +235,29 @@ def _render_scanner(scanner_df: pd.DataFrame) -> tuple[str, str] | None:
     return selected_symbol, selected_tf
 
 
-def _render_chart(db_path: str, symbol: str, timeframe: str) -> None:
-    """Render candlestick chart with overlays for selected symbol."""
-    import duckdb
+@st.cache_resource(ttl=60, max_entries=64, show_spinner=False)
+def _chart_signal(db_path: str, symbol: str, timeframe: str, last_bar: str) -> dict | None:
+    """Signal dict for the chart, keyed by the series' last bar so a rerun on unchanged data skips recompute.
+
+    cache_resource hands back the cached dict itself (no pickle round trip on
+    each hit); callers only read it.
+    """
+    df = _load_ohlcv(db_path, symbol, timeframe)
+    # Fetch HTF through the same cached loader: no extra connection on a Streamlit rerun
+    df_htf = _load_ohlcv(db_path, symbol, "1d")
+    return generate_signal(df, symbol, timeframe, hurst_threshold=0.6, lowpass_cutoff=0.1, htf_df=df_htf)
 
-    from src.dashboard.charts import create_candlestick_chart
-    from src.signals.filters import generate_signal
 
+def _render_chart(db_path: str, symbol: str, timeframe: str) -> None:
+    """Render candlestick chart with overlays for selected symbol."""
     df = _load_ohlcv(db_path, symbol, timeframe)
 
     if df.empty:
         st.warning(f"No data for {symbol}/{timeframe}")
         return
 
-    # Fetch HTF
-    conn = duckdb.connect(db_path, read_only=True)
-    try:
-        df_htf = conn.execute(
-            "SELECT * FROM ohlcv WHERE symbol = ? AND timeframe = '1d' ORDER BY timestamp",
-            [symbol],
-        ).fetchdf()
-    finally:
-        conn.close()
-
     # Compute signals
-    sig_data = generate_signal(df, symbol, timeframe, hurst_threshold=0.6, lowpass_cutoff=0.1, htf_df=df_htf)
+    sig_data = _chart_signal(db_path, symbol, timeframe, f"{len(df)}@{df['timestamp'].iloc[-1]}")
 
     signal_data = None
     if sig_data:
@@ -231,6 +284,39 @@ def _render_chart(db_path: str, symbol: str, timeframe: str) -> None:
         st.warning("Failed to generate signals for chart.")
 
 
+@st.fragment(run_every=60)
+def _render_scanner_tab(db_path: str, min_hurst: float, directions: list[str], selected_tfs: list[str]) -> None:
+    """Scanner tab body, re-rendered every 60s from the background cache (Story 4.4 auto-refresh).
+
+    Only this fragment reruns on the timer; the sidebar filters live in the
+    full-page run because fragments cannot write outside their own body.
+    """
+    scanner_df = _load_scanner_data(db_path)
+
+    # Apply Filters
+    if not scanner_df.empty:
+        filtered_df = scanner_df[
+            (scanner_df["LTF Hurst"] >= min_hurst) &
+            (scanner_df["Signal"].isin(directions)) &
+            (scanner_df["Timeframe"].isin(selected_tfs))
+        ]
+    else:
+        filtered_df = scanner_df
+
+    # --- Heatmap View ---
+    if not scanner_df.empty:
+        _render_heatmap(scanner_df, selected_tfs)
+
+    # --- Detailed Scanner ---
+    st.divider()
+    selection = _render_scanner(filtered_df)
+
+    if selection:
+        symbol, timeframe = selection
+        st.divider()
+        _render_chart(db_path, symbol, timeframe)
+
+
 def main():
     """Streamlit dashboard entry point."""
     st.set_page_config(
@@ -243,7 +329,7 @@ def main():
 
     # Load config
     try:
-        settings, assets, strategy, timeframes = _get_config()
+        settings, *_ = _get_config()
         db_path = str(_PROJECT_ROOT / settings.duckdb_path)
     except Exception as e:
         st.error(f"Configuration error: {e}")
@@ -281,28 +367,7 @@ def main():
         all_tfs = scanner_df["Timeframe"].unique().tolist() if not scanner_df.empty else []
         selected_tfs = st.sidebar.multiselect("Timeframes", all_tfs, all_tfs)
 
-        # Apply Filters
-        if not scanner_df.empty:
-            filtered_df = scanner_df[
-                (scanner_df["LTF Hurst"] >= min_hurst) &
-                (scanner_df["Signal"].isin(directions)) &
-                (scanner_df["Timeframe"].isin(selected_tfs))
-            ]
-        else:
-            filtered_df = scanner_df
-
-        # --- Heatmap View ---
-        if not scanner_df.empty:
-            _render_heatmap(scanner_df, selected_tfs)
-
-        # --- Detailed Scanner ---
-        st.divider()
-        selection = _render_scanner(filtered_df)
-
-        if selection:
-            symbol, timeframe = selection
-            st.divider()
-            _render_chart(db_path, symbol, timeframe)
+        _render_scanner_tab(db_path, min_hurst, directions, selected_tfs)
 
     with tab_paper:
         _render_paper_trading(db_path)
@@ -313,21 +378,15 @@ def main():
         st.caption(f"Data loaded in {load_time:.3f}s | Background refresh every 60s")
     with col_foot2:
         if st.button("Refresh Now"):
+            _get_config.clear()
             _refresh_scanner_data()
             st.rerun()
 
-    # Auto-refresh loop (Story 4.4)
-    # Note: Page will show 'running' spinner while waiting for next refresh
-    time.sleep(60)
-    st.rerun()
-
 
+@st.fragment(run_every=60)
 def _render_paper_trading(db_path: str) -> None:
-    """Render Paper Trading dashboard tab."""
-    from src.config import load_config
-    from src.data_loader import get_connection, reset_portfolio
-
-    settings, _, _, _ = load_config()
+    """Render Paper Trading dashboard tab (re-rendered every 60s, like the scanner tab)."""
+    settings, *_ = _get_config()
 
     st.header("Live Paper Trading Portfolio")
 
@@ -359,23 +418,15 @@ def _render_paper_trading(db_path: str) -> None:
         invested_market_value = 0.0
 
         if not active.empty:
-            current_prices = {}
-            for symbol in active["symbol"].unique():
-                # Fetch latest price (using same TF logic as scheduler)
-                p_df = pd.read_sql(f"SELECT close_price FROM ohlcv WHERE symbol = '{symbol}' ORDER BY timestamp DESC LIMIT 1", conn)
-                if not p_df.empty:
-                    current_prices[symbol] = float(p_df["close_price"].iloc[0])
+            # Latest price per open symbol (using same TF logic as scheduler), one bound query for all
+            current_prices = get_latest_closes(conn, active["symbol"].unique().tolist())
 
             active["Current Price"] = active["symbol"].map(current_prices)
 
-            def calc_unrealized(row):
-                if pd.isna(row["Current Price"]): return 0.0
-                if row["side"] == "LONG":
-                    return (row["Current Price"] - row["entry_price"]) * row["quantity"]
-                else:
-                    return (row["entry_price"] - row["Current Price"]) * row["quantity"]
-
-            active["PnL"] = active.apply(calc_unrealized, axis=1)
+            # Unrealized PnL for all rows at once; positions without a live price count as 0
+            side_sign = np.where(active["side"].to_numpy() == "LONG", 1.0, -1.0)
+            pnl = side_sign * (active["Current Price"] - active["entry_price"]) * active["quantity"]
+            active["PnL"] = pnl.fillna(0.0)
             invested_market_value = (active["quantity"] * active["Current Price"]).sum()
 
         total_equity = current_bal + invested_market_value
@@ -464,55 +515,25 @@ def _render_heatmap(df: pd.DataFrame, selected_tfs: list[str]) -> None:
     # --- Action & Score Calculation ---
     weights = {'1d': 3.0, '4h': 2.0, '1h': 1.0, '15m': 0.5}
 
-    def calculate_action(row):
-        score = 0.0
-        for tf, weight in weights.items():
-            if tf in row:
-                val = row[tf]
-                if val == "LONG":
-                    score += weight
-                elif val == "SHORT":
-                    score -= weight
-
-        if score >= 4.0: return "STRONG BUY", score
-        if score >= 2.0: return "BUY", score
-        if score <= -4.0: return "STRONG SELL", score
-        if score <= -2.0: return "SELL", score
-        return "WAIT", score
-
-    # Apply calculation
-    results = heatmap.apply(calculate_action, axis=1)
-    heatmap.insert(0, "Action", results.apply(lambda x: x[0]))
-    heatmap["Score"] = results.apply(lambda x: x[1])
+    # Weighted vote per symbol: LONG +weight, SHORT -weight, anything else 0
+    weighted_tfs = [tf for tf in weights if tf in heatmap.columns]
+    signals = heatmap[weighted_tfs].to_numpy()
+    votes = np.select([signals == "LONG", signals == "SHORT"], [1.0, -1.0], 0.0)
+    score = votes @ np.array([weights[tf] for tf in weighted_tfs])
+
+    action = np.select(
+        [score >= 4.0, score >= 2.0, score <= -4.0, score <= -2.0],
+        ["STRONG BUY", "BUY", "STRONG SELL", "SELL"],
+        "WAIT",
+    )
+    heatmap.insert(0, "Action", action)
+    heatmap["Score"] = score
 
     # Sort by Score Descending
     heatmap = heatmap.sort_values("Score", ascending=False)
 
-    # Styling
-    def color_signals(val):
-        if val == "LONG":
-            return "background-color: #26a69a; color: white; font-weight: bold"
-        elif val == "SHORT":
-            return "background-color: #ef5350; color: white; font-weight: bold"
-        elif val == "NEUTRAL":
-            return "color: gray"
-
-        # Action Styling
-        if val == "STRONG BUY":
-            return "background-color: #00695c; color: white; font-weight: bold" # Dark Green
-        if val == "BUY":
-            return "background-color: #26a69a; color: white; font-weight: bold"
-        if val == "STRONG SELL":
-            return "background-color: #b71c1c; color: white; font-weight: bold" # Dark Red
-        if val == "SELL":
-            return "background-color: #ef5350; color: white; font-weight: bold"
-        if val == "WAIT":
-            return "color: gray; font-style: italic"
-
-        return ""
-
     st.dataframe(
-        heatmap.style.map(color_signals),
+        heatmap.style.apply(_cell_styles, styles=_HEATMAP_STYLES),
         use_container_width=True
     )
 
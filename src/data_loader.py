@@ -4,15 +4,34 @@ Handles database connections (DuckDB or PostgreSQL) and OHLCV data operations.
 Supports switching backend based on configuration.
 """
 
+import atexit
+import io
 from pathlib import Path
 from typing import Union
 
 import duckdb
+import numpy as np
 import pandas as pd
 from loguru import logger
-from sqlalchemy import Boolean, Column, DateTime, Float, MetaData, String, Table, UniqueConstraint, create_engine
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    LargeBinary,
+    MetaData,
+    String,
+    Table,
+    UniqueConstraint,
+    create_engine,
+    func,
+    literal_column,
+    select,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array_agg
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.engine import Connection as AlchemyConnection
+from sqlalchemy.engine import Engine
 
 from src.config import PROJECT_ROOT, AppSettings
 
@@ -65,6 +84,16 @@ CREATE TABLE IF NOT EXISTS paper_trades (
     exit_time   TIMESTAMP
 );
 CREATE SEQUENCE IF NOT EXISTS seq_paper_trades_id START 1;
+
+CREATE TABLE IF NOT EXISTS signals (
+    symbol      VARCHAR NOT NULL,
+    timeframe   VARCHAR NOT NULL,
+    data_hash   VARCHAR NOT NULL,
+    phase_array BLOB NOT NULL,
+    hurst_value DOUBLE NOT NULL,
+    updated_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (symbol, timeframe)
+);
 """
 
 DUCKDB_UPSERT_SQL = """
@@ -120,6 +149,17 @@ trades_table = Table(
 )
 
 
+signals_table = Table(
+    "signals", metadata,
+    Column("symbol", String, primary_key=True),
+    Column("timeframe", String, primary_key=True),
+    Column("data_hash", String, nullable=False),
+    Column("phase_array", LargeBinary, nullable=False),
+    Column("hurst_value", Float, nullable=False),
+    Column("updated_at", DateTime, nullable=True)
+)
+
+
 def _resolve_db_path(settings: AppSettings) -> Path:
     """Resolve the DuckDB path relative to project root."""
     db_path = Path(settings.duckdb_path)
@@ -129,20 +169,52 @@ def _resolve_db_path(settings: AppSettings) -> Path:
     return db_path
 
 
+# One SQLAlchemy engine (and so one connection pool) per Postgres URL; connections
+# closed by callers go back to the pool instead of being torn down
+_ENGINES: dict[str, Engine] = {}
+# Postgres URLs whose schema/portfolio bootstrap already ran in this process
+_SCHEMA_READY: set[str] = set()
+
+
+def _get_engine(url: str) -> Engine:
+    """Return the pooled engine for a Postgres URL, creating it on first use."""
+    engine = _ENGINES.get(url)
+    if engine is None:
+        engine = create_engine(url, pool_pre_ping=True)
+        _ENGINES[url] = engine
+    return engine
+
+
+def _duckdb_config(settings: AppSettings) -> dict[str, str | int]:
+    """DuckDB connect-time settings that differ from DuckDB's own defaults."""
+    config: dict[str, str | int] = {}
+    if settings.duckdb_threads > 0:
+        config["threads"] = settings.duckdb_threads
+    if settings.duckdb_memory_limit:
+        config["memory_limit"] = settings.duckdb_memory_limit
+    return config
+
+
 def get_connection(settings: AppSettings, read_only: bool = False) -> DBConnection:
-    """Get a database connection (DuckDB or Postgres)."""
+    """Get a database connection (DuckDB or Postgres).
+
+    Postgres connections are checked out of a per-URL pool; closing them
+    returns them to the pool. DuckDB connections open the file directly,
+    applying DUCKDB_THREADS / DUCKDB_MEMORY_LIMIT when set.
+    """
 
     if settings.use_postgres:
         # PostgreSQL Connection
+        url = settings.database_url
         try:
-            engine = create_engine(settings.database_url)
-            conn = engine.connect()
+            conn = _get_engine(url).connect()
 
-            # Ensure schema exists (if not read_only, though 'create_all' is safe)
-            if not read_only:
+            # Ensure schema exists once per process (if not read_only, though 'create_all' is safe)
+            if not read_only and url not in _SCHEMA_READY:
                 metadata.create_all(conn)
                 # Init portfolio if empty
                 _init_postgres_portfolio(conn)
+                _SCHEMA_READY.add(url)
 
             logger.debug(f"Postgres connected: {settings.database_host}")
             return conn
@@ -154,7 +226,7 @@ def get_connection(settings: AppSettings, read_only: bool = False) -> DBConnecti
         # DuckDB Connection
         db_path = _resolve_db_path(settings)
         try:
-            conn = duckdb.connect(str(db_path), read_only=read_only)
+            conn = duckdb.connect(str(db_path), read_only=read_only, config=_duckdb_config(settings))
             if not read_only:
                 conn.execute(DUCKDB_CREATE_SQL)
                 _init_duckdb_portfolio(conn)
@@ -165,6 +237,45 @@ def get_connection(settings: AppSettings, read_only: bool = False) -> DBConnecti
             raise
 
 
+# Long-lived connections reused across scheduler ticks, keyed by (target, read_only)
+_SHARED_CONNECTIONS: dict[tuple[str, bool], DBConnection] = {}
+
+
+def get_shared_connection(settings: AppSettings, read_only: bool = False) -> DBConnection:
+    """Return a process-wide connection, opening it on first use.
+
+    Unlike get_connection(), callers must NOT close the returned connection;
+    use discard_shared_connection() after a failure and let the atexit hook
+    close the rest on shutdown. Meant for Postgres: a long-lived read-write
+    DuckDB connection holds the file lock and blocks every other process.
+    """
+    target = settings.database_url if settings.use_postgres else str(_resolve_db_path(settings))
+    key = (target, read_only)
+    conn = _SHARED_CONNECTIONS.get(key)
+    if conn is None:
+        conn = get_connection(settings, read_only=read_only)
+        _SHARED_CONNECTIONS[key] = conn
+    return conn
+
+
+def discard_shared_connection(conn: DBConnection) -> None:
+    """Close a shared connection and drop it from the cache so the next caller reconnects."""
+    for key, cached in list(_SHARED_CONNECTIONS.items()):
+        if cached is conn:
+            del _SHARED_CONNECTIONS[key]
+    try:
+        conn.close()
+    except Exception as e:
+        logger.debug(f"Ignoring error while closing shared connection: {e}")
+
+
+@atexit.register
+def close_shared_connections() -> None:
+    """Close every cached shared connection."""
+    for conn in list(_SHARED_CONNECTIONS.values()):
+        discard_shared_connection(conn)
+
+
 def _init_duckdb_portfolio(conn: duckdb.DuckDBPyConnection) -> None:
     """Initialize portfolio state if empty."""
     res = conn.execute("SELECT COUNT(*) FROM portfolio_state").fetchone()
@@ -313,6 +424,83 @@ def query_ohlcv(
         return pd.DataFrame()
 
 
+def query_ohlcv_multi(conn: DBConnection, symbols: list[str], timeframe: str) -> pd.DataFrame:
+    """Query OHLCV for several symbols in one round trip.
+
+    Returns a long frame sorted by (symbol, timestamp), so each symbol's rows
+    are contiguous and in the same order query_ohlcv() would return them.
+    """
+    if not symbols:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+    try:
+        if isinstance(conn, duckdb.DuckDBPyConnection):
+            placeholders = ", ".join("?" for _ in symbols)
+            query = (
+                f"SELECT * FROM ohlcv WHERE timeframe = ? AND symbol IN ({placeholders}) "
+                "ORDER BY symbol, timestamp"
+            )
+            return conn.execute(query, [timeframe, *symbols]).fetchdf()
+        else:
+            query = ohlcv_table.select().where(
+                ohlcv_table.c.timeframe == timeframe,
+                ohlcv_table.c.symbol.in_(symbols),
+            ).order_by(ohlcv_table.c.symbol, ohlcv_table.c.timestamp)
+            return pd.read_sql(query, conn)
+
+    except Exception as e:
+        logger.error(f"Failed to query OHLCV for {len(symbols)} symbols/{timeframe}: {e}")
+        return pd.DataFrame()
+
+
+def query_daily_ohlcv(conn: DBConnection, symbols: list[str], timeframe: str) -> pd.DataFrame:
+    """Aggregate OHLCV to daily candles in the database, for several symbols in one query.
+
+    Equivalent to ``resample("1D").agg(first/max/min/last/sum).dropna()`` on
+    each symbol's rows, plus ``n_bars`` (source bars per day). Returns a long
+    frame with columns symbol, timestamp (day start), open_price, high_price,
+    low_price, close_price, volume, n_bars, sorted by (symbol, timestamp).
+    """
+    columns = ["symbol", "timestamp", "open_price", "high_price", "low_price", "close_price", "volume", "n_bars"]
+    if not symbols:
+        return pd.DataFrame(columns=columns)
+    try:
+        if isinstance(conn, duckdb.DuckDBPyConnection):
+            placeholders = ", ".join("?" for _ in symbols)
+            query = (
+                "SELECT symbol, date_trunc('day', timestamp) AS timestamp, "
+                "arg_min(open_price, timestamp) AS open_price, max(high_price) AS high_price, "
+                "min(low_price) AS low_price, arg_max(close_price, timestamp) AS close_price, "
+                "sum(volume) AS volume, count(close_price) AS n_bars "
+                f"FROM ohlcv WHERE timeframe = ? AND symbol IN ({placeholders}) "
+                "GROUP BY ALL ORDER BY symbol, timestamp"
+            )
+            result = conn.execute(query, [timeframe, *symbols]).fetchdf()
+        else:
+            t = ohlcv_table.c
+            # Inline 'day' so SELECT and GROUP BY render the identical expression
+            day = func.date_trunc(literal_column("'day'"), t.timestamp)
+            query = select(
+                t.symbol,
+                day.label("timestamp"),
+                array_agg(aggregate_order_by(t.open_price, t.timestamp.asc()))[1].label("open_price"),
+                func.max(t.high_price).label("high_price"),
+                func.min(t.low_price).label("low_price"),
+                array_agg(aggregate_order_by(t.close_price, t.timestamp.desc()))[1].label("close_price"),
+                func.sum(t.volume).label("volume"),
+                func.count(t.close_price).label("n_bars"),
+            ).where(
+                t.timeframe == timeframe,
+                t.symbol.in_(symbols),
+            ).group_by(t.symbol, day).order_by(t.symbol, day)
+            result = pd.read_sql(query, conn)
+
+        return result.dropna().reset_index(drop=True)
+
+    except Exception as e:
+        logger.error(f"Failed to query daily OHLCV for {len(symbols)} symbols/{timeframe}: {e}")
+        return pd.DataFrame(columns=columns)
+
+
 def get_latest_timestamp(conn: DBConnection, symbol: str, timeframe: str) -> pd.Timestamp | None:
     """Get the latest timestamp for a given symbol and timeframe."""
     try:
@@ -339,6 +527,37 @@ def get_latest_timestamp(conn: DBConnection, symbol: str, timeframe: str) -> pd.
         return None
 
 
+def get_latest_closes(conn: DBConnection, symbols: list[str]) -> dict[str, float]:
+    """Latest close per symbol (most recent bar across timeframes), for several symbols in one query.
+
+    Symbols without any OHLCV rows are absent from the result.
+    """
+    if not symbols:
+        return {}
+    try:
+        if isinstance(conn, duckdb.DuckDBPyConnection):
+            placeholders = ", ".join("?" for _ in symbols)
+            query = (
+                f"SELECT symbol, arg_max(close_price, timestamp) FROM ohlcv "
+                f"WHERE symbol IN ({placeholders}) GROUP BY symbol"
+            )
+            rows = conn.execute(query, list(symbols)).fetchall()
+        else:
+            # Postgres: DISTINCT ON keeps the first row per symbol in timestamp DESC order
+            stmt = (
+                select(ohlcv_table.c.symbol, ohlcv_table.c.close_price)
+                .where(ohlcv_table.c.symbol.in_(symbols))
+                .distinct(ohlcv_table.c.symbol)
+                .order_by(ohlcv_table.c.symbol, ohlcv_table.c.timestamp.desc())
+            )
+            rows = conn.execute(stmt).all()
+        return {symbol: float(close) for symbol, close in rows if close is not None}
+
+    except Exception as e:
+        logger.error(f"Failed to get latest closes for {len(symbols)} symbols: {e}")
+        return {}
+
+
 def get_ohlcv_row_count(conn: DBConnection, symbol: str, timeframe: str) -> int:
     """Get the number of rows for a symbol/timeframe pair."""
     try:
@@ -384,3 +603,79 @@ def count_rows(conn: DBConnection, symbol: str | None = None) -> int:
     except Exception as e:
         logger.error(f"Failed to count rows: {e}")
         return 0
+
+
+def upsert_signals(
+    conn: DBConnection,
+    symbol: str,
+    timeframe: str,
+    data_hash: str,
+    phase_array: np.ndarray,
+    hurst_value: float,
+) -> bool:
+    """Store precomputed cycle phase and Hurst for a symbol/timeframe.
+
+    One row per (symbol, timeframe); ``data_hash`` identifies the OHLCV
+    snapshot the signals were computed from and the signal code version
+    (signals.cache.ohlcv_content_hash), so rows from older code never match.
+    """
+    buf = io.BytesIO()
+    np.save(buf, np.asarray(phase_array, dtype=np.float64), allow_pickle=False)
+    blob = buf.getvalue()
+    try:
+        if isinstance(conn, duckdb.DuckDBPyConnection):
+            conn.execute(
+                "INSERT OR REPLACE INTO signals (symbol, timeframe, data_hash, phase_array, hurst_value, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)",
+                [symbol, timeframe, data_hash, blob, float(hurst_value)],
+            )
+        else:
+            stmt = pg_insert(signals_table).values(
+                symbol=symbol, timeframe=timeframe, data_hash=data_hash,
+                phase_array=blob, hurst_value=float(hurst_value), updated_at=pd.Timestamp.utcnow(),
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["symbol", "timeframe"],
+                set_={
+                    "data_hash": stmt.excluded.data_hash,
+                    "phase_array": stmt.excluded.phase_array,
+                    "hurst_value": stmt.excluded.hurst_value,
+                    "updated_at": stmt.excluded.updated_at,
+                }
+            )
+            conn.execute(stmt)
+            conn.commit()
+        return True
+    except Exception as e:
+        logger.debug(f"Could not store signals for {symbol}/{timeframe}: {e}")
+        return False
+
+
+def query_signals(
+    conn: DBConnection,
+    symbol: str,
+    timeframe: str,
+    data_hash: str,
+) -> tuple[np.ndarray, float] | None:
+    """Load stored (phase_array, hurst_value) if they match ``data_hash``, else None."""
+    try:
+        if isinstance(conn, duckdb.DuckDBPyConnection):
+            row = conn.execute(
+                "SELECT phase_array, hurst_value FROM signals WHERE symbol = ? AND timeframe = ? AND data_hash = ?",
+                [symbol, timeframe, data_hash],
+            ).fetchone()
+        else:
+            row = conn.execute(
+                select(signals_table.c.phase_array, signals_table.c.hurst_value).where(
+                    signals_table.c.symbol == symbol,
+                    signals_table.c.timeframe == timeframe,
+                    signals_table.c.data_hash == data_hash,
+                )
+            ).fetchone()
+        if row is None:
+            return None
+        return np.load(io.BytesIO(bytes(row[0])), allow_pickle=False), float(row[1])
+    except Exception as e:
+        # Read-only connections to databases created before the signals table land here
+        logger.debug(f"Signal lookup failed for {symbol}/{timeframe}: {e}")
+        return None
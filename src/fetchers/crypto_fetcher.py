@@ -28,12 +28,26 @@ MAX_RETRIES = 3
 BASE_BACKOFF_SECONDS = 2.0
 
 
+def create_exchange(exchange_id: str = "binance"):
+    """Create an async ccxt exchange client, or None if ccxt does not know the exchange.
+
+    The client owns an aiohttp session and its loaded markets; share one across
+    fetches (and close it once) to skip per-request TLS handshakes and market loads.
+    """
+    exchange_class = getattr(ccxt_async, exchange_id, None)
+    if exchange_class is None:
+        logger.error(f"Exchange {exchange_id} not supported by ccxt")
+        return None
+    return exchange_class({"enableRateLimit": True})
+
+
 async def fetch_crypto_ohlcv(
     symbol: str,
     timeframe: str,
     ccxt_interval: str,
     exchange_id: str = "binance",
     latest_timestamp=None,
+    exchange=None,
 ) -> pd.DataFrame | None:
     """Fetch OHLCV data for a single crypto pair and timeframe.
 
@@ -43,18 +57,18 @@ async def fetch_crypto_ohlcv(
         ccxt_interval: ccxt interval string from timeframe mapping.
         exchange_id: Exchange identifier (default: "binance").
         latest_timestamp: Optional pd.Timestamp of the most recent candle.
+        exchange: Shared client from create_exchange(); left open for the caller.
+            When None a client for ``exchange_id`` is created and closed here.
 
     Returns:
         Standardized DataFrame with OHLCV columns, or None on failure.
     """
-    exchange = None
+    owns_exchange = exchange is None
     try:
-        exchange_class = getattr(ccxt_async, exchange_id, None)
-        if exchange_class is None:
-            logger.error(f"Exchange {exchange_id} not supported by ccxt")
-            return None
-
-        exchange = exchange_class({"enableRateLimit": True})
+        if owns_exchange:
+            exchange = create_exchange(exchange_id)
+            if exchange is None:
+                return None
 
         if latest_timestamp is not None:
             since = int(latest_timestamp.timestamp() * 1000)
@@ -96,7 +110,7 @@ async def fetch_crypto_ohlcv(
         logger.error(f"Failed to fetch {symbol}/{timeframe}: {e}")
         return None
     finally:
-        if exchange:
+        if owns_exchange and exchange:
             await exchange.close()
 
 
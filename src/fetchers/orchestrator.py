@@ -12,7 +12,7 @@ from loguru import logger
 
 from src.config import AssetConfig, TimeframeConfig
 from src.data_loader import DBConnection, get_latest_timestamp, get_ohlcv_row_count, upsert_ohlcv
-from src.fetchers.crypto_fetcher import fetch_crypto_ohlcv
+from src.fetchers.crypto_fetcher import create_exchange, fetch_crypto_ohlcv
 from src.fetchers.stock_fetcher import fetch_stock_ohlcv
 
 # Max concurrent fetch tasks to avoid overwhelming APIs
@@ -30,6 +30,7 @@ class FetchResult:
     success: int = 0
     failed: int = 0
     rows_upserted: int = 0
+    updated: list[tuple[str, str]] = field(default_factory=list)  # (symbol, timeframe) pairs with new rows
     elapsed_seconds: float = 0.0
     errors: list[str] = field(default_factory=list)
 
@@ -51,6 +52,8 @@ async def _fetch_stock_task(
             if df is not None and not df.empty:
                 rows = upsert_ohlcv(conn, df)
                 result.rows_upserted += rows
+                if rows:
+                    result.updated.append((symbol, timeframe))
                 result.success += 1
             else:
                 result.failed += 1
@@ -70,14 +73,19 @@ async def _fetch_crypto_task(
     result: FetchResult,
     semaphore: asyncio.Semaphore,
     latest_timestamp=None,
+    exchange=None,
 ) -> None:
     """Async task for crypto fetching."""
     async with semaphore:
         try:
-            df = await fetch_crypto_ohlcv(symbol, timeframe, ccxt_interval, exchange_id, latest_timestamp)
+            df = await fetch_crypto_ohlcv(
+                symbol, timeframe, ccxt_interval, exchange_id, latest_timestamp, exchange=exchange
+            )
             if df is not None and not df.empty:
                 rows = upsert_ohlcv(conn, df)
                 result.rows_upserted += rows
+                if rows:
+                    result.updated.append((symbol, timeframe))
                 result.success += 1
             else:
                 result.failed += 1
@@ -92,6 +100,7 @@ async def fetch_all_assets(
     conn: DBConnection,
     assets: AssetConfig,
     timeframes: TimeframeConfig,
+    exchange=None,
 ) -> FetchResult:
     """Fetch OHLCV data for all configured assets concurrently.
 
@@ -99,6 +108,9 @@ async def fetch_all_assets(
         conn: Active DuckDB connection.
         assets: Asset configuration with stock and crypto symbols.
         timeframes: Timeframe configuration with mappings.
+        exchange: Shared ccxt client from create_exchange(), kept open for the
+            caller (e.g. across continuous fetch cycles). When None, one client
+            is created for this run's crypto tasks and closed at the end.
 
     Returns:
         FetchResult with success/failure counts and timing.
@@ -123,6 +135,11 @@ async def fetch_all_assets(
             tasks.append(_fetch_stock_task(symbol, tf, yf_interval, conn, result, semaphore, latest_ts))
             result.total += 1
 
+    # One ccxt client (aiohttp session + loaded markets) for every crypto task
+    owns_exchange = exchange is None and bool(assets.crypto_symbols)
+    if owns_exchange:
+        exchange = create_exchange(assets.crypto_exchange)
+
     # Build crypto fetch tasks
     for symbol in assets.crypto_symbols:
         for tf in timeframes.default_timeframes:
@@ -134,13 +151,17 @@ async def fetch_all_assets(
                 )
                 latest_ts = None
             ccxt_interval = timeframes.ccxt_mapping.get(tf, tf)
-            tasks.append(_fetch_crypto_task(symbol, tf, ccxt_interval, assets.crypto_exchange, conn, result, semaphore, latest_ts))
+            tasks.append(_fetch_crypto_task(symbol, tf, ccxt_interval, assets.crypto_exchange, conn, result, semaphore, latest_ts, exchange))
             result.total += 1
 
     logger.info(f"Starting fetch for {result.total} symbol/timeframe combinations...")
 
     # Execute all tasks concurrently
-    await asyncio.gather(*tasks, return_exceptions=True)
+    try:
+        await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        if owns_exchange and exchange is not None:
+            await exchange.close()
 
     result.elapsed_seconds = time.monotonic() - start_time
 
@@ -10,7 +10,13 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from loguru import logger
 
 from src.config import AppSettings, AssetConfig, PaperConfig, TimeframeConfig
-from src.data_loader import get_connection, query_ohlcv
+from src.data_loader import (
+    close_shared_connections,
+    discard_shared_connection,
+    get_connection,
+    get_shared_connection,
+    query_ohlcv,
+)
 from src.fetchers.orchestrator import fetch_all_assets
 from src.services.notifier import TelegramNotifier
 from src.services.trader import PaperTrader
@@ -27,12 +33,14 @@ class IngestionScheduler:
         timeframes: TimeframeConfig,
         paper_config: PaperConfig,
         interval_minutes: int = 5,
+        precompute_signals: bool = True,
     ) -> None:
         self.settings = settings
         self.assets = assets
         self.timeframes = timeframes
         self.paper_config = paper_config
         self.interval_minutes = interval_minutes
+        self.precompute_signals = precompute_signals
         self.scheduler = AsyncIOScheduler()
         self.notifier = TelegramNotifier(settings)
 
@@ -42,7 +50,10 @@ class IngestionScheduler:
     async def _fetch_job(self) -> None:
         """Single fetch cycle."""
         logger.info("Executing scheduled fetch job...")
-        conn = get_connection(self.settings, read_only=False)
+        # Postgres: reuse one connection across ticks instead of reconnecting every interval.
+        # DuckDB: connect per tick so the file lock is released for readers (dashboard, backtest) in between.
+        shared = self.settings.use_postgres
+        conn = get_shared_connection(self.settings) if shared else get_connection(self.settings)
         trader = PaperTrader(conn, self.paper_config)
 
         try:
@@ -67,10 +78,32 @@ class IngestionScheduler:
             # 3. Scan for New Signals (Entry Logic)
             await self._scan_signals(conn, trader)
 
+            # 4. Precompute backtest signals last, so the cache never delays or aborts trading
+            if self.precompute_signals and result.updated:
+                await self._refresh_signals(conn, result.updated)
+
         except Exception as e:
             logger.error(f"Scheduled fetch failed: {e}")
+            if shared:
+                # Don't carry a possibly broken connection into the next tick
+                discard_shared_connection(conn)
         finally:
-            conn.close()
+            if not shared:
+                conn.close()
+
+    async def _refresh_signals(self, conn, updated: list[tuple[str, str]]) -> None:
+        """Precompute cycle/Hurst for the backtest timeframes that just got new bars."""
+        from src.config import StrategyConfig
+        from src.signals.cache import refresh_signals
+
+        try:
+            strategy = StrategyConfig()
+            backtest_tfs = set(strategy.backtest_timeframes)
+            pairs = [(sym, tf) for sym, tf in updated if tf in backtest_tfs]
+            # Full-history FFT + Hurst per pair: keep it off the event loop
+            await asyncio.to_thread(refresh_signals, conn, pairs, strategy.cycle_lowpass_cutoff)
+        except Exception as e:
+            logger.error(f"Signal precompute failed: {e}")
 
     async def _scan_signals(self, conn, trader: PaperTrader) -> None:
         """Scan all assets for trading signals and log them."""
@@ -171,6 +204,7 @@ class IngestionScheduler:
         except (KeyboardInterrupt, SystemExit):
             logger.info("Writer Service stopping...")
             self.scheduler.shutdown()
+            close_shared_connections()
 
 
 async def run_scheduler_service(
@@ -178,8 +212,11 @@ async def run_scheduler_service(
     assets: AssetConfig,
     timeframes: TimeframeConfig,
     paper_config: PaperConfig,
-    interval: int = 5
+    interval: int = 5,
+    precompute_signals: bool = True,
 ) -> None:
     """Entry point for the scheduler process."""
-    service = IngestionScheduler(settings, assets, timeframes, paper_config, interval_minutes=interval)
+    service = IngestionScheduler(
+        settings, assets, timeframes, paper_config, interval_minutes=interval, precompute_signals=precompute_signals
+    )
     await service.start()
@@ -0,0 +1,307 @@
+"""Persistent cache for per-symbol cycle phase and Hurst exponent.
+
+Backtest startup recomputes the dominant-cycle phase array and the Hurst
+exponent for every symbol on every run. Both depend only on the OHLCV rows
+(and the low-pass cutoff), so results are memoized per (symbol, timeframe) together with a content
+hash (salted with SIGNAL_CACHE_VERSION, so a change to the cycle or Hurst
+code invalidates old entries): in the database ``signals`` table (which ``fetch`` pre-populates)
+when a connection is given, otherwise in one ``.cache/signals`` .npz file
+per symbol/timeframe that is overwritten whenever the hash changes.
+
+The daily (HTF) resample with its CHOP and SMA-50 columns is cached
+separately as one ``.cache/daily`` parquet file per symbol/timeframe
+(versioned by DAILY_CACHE_VERSION) and extended incrementally: only days
+from the last cached day onward are rescored.
+"""
+
+import hashlib
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src.backtest._kernels import group_starts, sma
+from src.config import PROJECT_ROOT
+from src.data_loader import DBConnection, query_ohlcv, query_signals, upsert_signals
+from src.signals.cycles import detect_dominant_cycle_filtered
+from src.signals.fractals import calculate_chop, calculate_hurst
+
+SIGNAL_CACHE_DIR = PROJECT_ROOT / ".cache" / "signals"
+DAILY_CACHE_DIR = PROJECT_ROOT / ".cache" / "daily"
+
+# Salted into every signal cache key: bump whenever detect_dominant_cycle_filtered()
+# or calculate_hurst() output changes so entries computed by older code miss
+SIGNAL_CACHE_VERSION = 1
+
+# Part of the daily cache filename: bump whenever _resample_daily() or _score_daily()
+# output changes so frames written by older code are not extended
+DAILY_CACHE_VERSION = 1
+
+DAILY_SMA_WINDOW = 50
+# Daily rows recomputed ahead of the new tail so CHOP(14) and SMA-50 see full windows
+_DAILY_LOOKBACK = DAILY_SMA_WINDOW + 1
+# Columns a cached prefix must reproduce exactly (CHOP and SMA-50 derive from them)
+_DAILY_CHECK_COLUMNS = ["open_price", "high_price", "low_price", "close_price", "n_bars"]
+
+
+def ohlcv_content_hash(df: pd.DataFrame, cutoff: float) -> str:
+    """Hash the timestamp and close columns plus the filter cutoff and SIGNAL_CACHE_VERSION."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.int64(SIGNAL_CACHE_VERSION).tobytes())
+    h.update(pd.to_datetime(df["timestamp"]).values.astype("datetime64[ns]").view(np.int64).tobytes())
+    h.update(df["close_price"].values.astype(np.float64).tobytes())
+    h.update(np.float64(cutoff).tobytes())
+    return h.hexdigest()
+
+
+def _cache_path(symbol: str, timeframe: str, cache_dir: Path, suffix: str = ".npz") -> Path:
+    safe_symbol = symbol.replace("/", "-").replace(":", "-")
+    return cache_dir / f"{safe_symbol}_{timeframe}{suffix}"
+
+
+def compute_cycle_and_hurst(df: pd.DataFrame, cutoff: float) -> tuple[np.ndarray, float] | None:
+    """Compute (phase_array, hurst_value) without touching any cache; None if no cycle was found."""
+    cycle_result = detect_dominant_cycle_filtered(df, cutoff=cutoff)
+    if cycle_result is None:
+        return None
+    return np.asarray(cycle_result["phase_array"], dtype=np.float64), calculate_hurst(df)
+
+
+def lookup_cycle_and_hurst(
+    df: pd.DataFrame,
+    symbol: str,
+    timeframe: str,
+    cutoff: float,
+    cache_dir: Path | None = None,
+    conn: DBConnection | None = None,
+) -> tuple[np.ndarray, float] | None:
+    """Return cached (phase_array, hurst_value) for this exact OHLCV content, or None on a miss.
+
+    With ``conn`` the ``signals`` table is consulted, otherwise the .npz file.
+    """
+    key = ohlcv_content_hash(df, cutoff)
+    if conn is not None:
+        stored = query_signals(conn, symbol, timeframe, key)
+        if stored is not None:
+            logger.debug(f"Signal table hit for {symbol}/{timeframe}")
+        return stored
+
+    path = _cache_path(symbol, timeframe, cache_dir or SIGNAL_CACHE_DIR)
+    if path.exists():
+        try:
+            with np.load(path) as cached:
+                if str(cached["data_hash"]) == key:
+                    logger.debug(f"Signal cache hit for {symbol}/{timeframe}")
+                    return cached["phase_array"], float(cached["hurst_value"])
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable signal cache {path.name}: {e}")
+    return None
+
+
+def store_cycle_and_hurst(
+    df: pd.DataFrame,
+    symbol: str,
+    timeframe: str,
+    cutoff: float,
+    signals: tuple[np.ndarray, float],
+    cache_dir: Path | None = None,
+    conn: DBConnection | None = None,
+) -> None:
+    """Persist freshly computed signals where lookup_cycle_and_hurst() will find them."""
+    key = ohlcv_content_hash(df, cutoff)
+    phase_array, hurst_value = signals
+    if conn is not None:
+        upsert_signals(conn, symbol, timeframe, key, phase_array, hurst_value)
+        return
+
+    path = _cache_path(symbol, timeframe, cache_dir or SIGNAL_CACHE_DIR)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, phase_array=phase_array, hurst_value=np.float64(hurst_value), data_hash=np.str_(key))
+    except OSError as e:
+        logger.warning(f"Could not write signal cache {path.name}: {e}")
+
+
+def load_cycle_and_hurst(
+    df: pd.DataFrame,
+    symbol: str,
+    timeframe: str,
+    cutoff: float,
+    use_cache: bool = True,
+    cache_dir: Path | None = None,
+    conn: DBConnection | None = None,
+) -> tuple[np.ndarray, float] | None:
+    """Return (phase_array, hurst_value) for an OHLCV DataFrame, using the cache.
+
+    Args:
+        df: OHLCV DataFrame as returned by query_ohlcv().
+        symbol: Asset symbol, used in the cache filename.
+        timeframe: Candle timeframe, used in the cache filename.
+        cutoff: Low-pass cutoff passed to detect_dominant_cycle_filtered().
+        use_cache: If False, always recompute and leave the cache untouched.
+        cache_dir: Override for the cache directory (default: .cache/signals).
+        conn: Optional database connection. When given, the ``signals`` table
+            is the cache and no .npz file is read or written.
+
+    Returns:
+        Tuple of phase array and Hurst exponent, or None if no cycle was found.
+    """
+    if use_cache:
+        cached = lookup_cycle_and_hurst(df, symbol, timeframe, cutoff, cache_dir=cache_dir, conn=conn)
+        if cached is not None:
+            return cached
+
+    signals = compute_cycle_and_hurst(df, cutoff)
+    if signals is not None and use_cache:
+        store_cycle_and_hurst(df, symbol, timeframe, cutoff, signals, cache_dir=cache_dir, conn=conn)
+    return signals
+
+
+def refresh_signals(conn: DBConnection, pairs: Iterable[tuple[str, str]], cutoff: float) -> int:
+    """Precompute signals for (symbol, timeframe) pairs whose OHLCV just changed.
+
+    Called after a fetch with FetchResult.updated so backtests find current
+    signals in the database. Rows keyed by an older SIGNAL_CACHE_VERSION are
+    treated as misses and overwritten. A failing pair is logged and skipped:
+    this is a cache warm-up and must never abort the caller's fetch loop.
+
+    Returns:
+        Number of pairs with signals stored.
+    """
+    refreshed = 0
+    for symbol, timeframe in pairs:
+        try:
+            df = query_ohlcv(conn, symbol, timeframe)
+            if df.empty:
+                continue
+            if load_cycle_and_hurst(df, symbol, timeframe, cutoff, conn=conn) is not None:
+                refreshed += 1
+        except Exception as e:
+            logger.error(f"Signal refresh failed {symbol}/{timeframe}: {e}")
+
+    logger.info(f"Signals refreshed for {refreshed} symbol/timeframe pairs")
+    return refreshed
+
+
+_NS_PER_DAY = 86_400_000_000_000
+
+
+def _edge_valid(values: np.ndarray, first: np.ndarray, last: bool) -> np.ndarray:
+    """First (or last) non-NaN value of each reduceat segment; NaN for an all-NaN segment."""
+    n = len(values)
+    idx = np.arange(n)
+    valid = ~np.isnan(values)
+    if last:
+        pos = np.maximum.reduceat(np.where(valid, idx, -1), first)
+    else:
+        pos = np.minimum.reduceat(np.where(valid, idx, n), first)
+    return np.where((pos >= 0) & (pos < n), values[np.clip(pos, 0, n - 1)], np.nan)
+
+
+def _resample_daily(df_time: pd.DataFrame) -> pd.DataFrame:
+    """Daily candles of time-sorted bars, plus ``n_bars`` (source bars per day).
+
+    Same as ``resample("1D").agg(first/max/min/last/sum).dropna()`` (first and
+    last skip NaN, like pandas and the database's arg_min/arg_max), but each
+    day is one slice of an int64 day bucket, reduced with ``ufunc.reduceat``
+    instead of pandas' per-group resample machinery.
+    """
+    if df_time.empty:
+        columns = ["open_price", "high_price", "low_price", "close_price", "volume"]
+        return df_time.iloc[:0][columns].assign(n_bars=np.zeros(0, dtype=np.int64))
+
+    index = df_time.index
+    wall = index.tz_localize(None) if index.tz is not None else index
+    day = wall.to_numpy("datetime64[ns]").view(np.int64) // _NS_PER_DAY
+    starts = group_starts(day)
+    first = starts[:-1]
+
+    close = df_time["close_price"].to_numpy(np.float64)
+    volume = df_time["volume"].to_numpy(np.float64)
+    day_index = pd.DatetimeIndex((day[first] * _NS_PER_DAY).view("datetime64[ns]"), name=index.name)
+    daily = pd.DataFrame({
+        "open_price": _edge_valid(df_time["open_price"].to_numpy(np.float64), first, last=False),
+        "high_price": np.fmax.reduceat(df_time["high_price"].to_numpy(np.float64), first),
+        "low_price": np.fmin.reduceat(df_time["low_price"].to_numpy(np.float64), first),
+        "close_price": _edge_valid(close, first, last=True),
+        "volume": np.add.reduceat(np.nan_to_num(volume), first),
+        # Source bars per day, used to check that a cached prefix still matches the data
+        "n_bars": np.add.reduceat((~np.isnan(close)).astype(np.int64), first),
+    }, index=day_index if index.tz is None else day_index.tz_localize(index.tz))
+    return daily.dropna()
+
+
+def _score_daily(daily: pd.DataFrame) -> pd.DataFrame:
+    return daily.assign(
+        chop=calculate_chop(daily).to_numpy(np.float64),
+        sma_50=sma(daily["close_price"].to_numpy(np.float64), DAILY_SMA_WINDOW),
+    )
+
+
+def load_daily_htf(
+    df_time: pd.DataFrame,
+    symbol: str,
+    timeframe: str,
+    use_cache: bool = True,
+    cache_dir: Path | None = None,
+    daily_ohlcv: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """Return the daily resample of ``df_time`` with ``chop`` and ``sma_50`` columns.
+
+    The cached CHOP/SMA scores are reused up to (but excluding) the cached
+    last day, which may have been partial; from that day on they are
+    recomputed over the new days plus a short lookback. If the cached prefix
+    no longer matches the fresh daily candles (any per-day OHLC value or bar
+    count differs) the frame is rebuilt from scratch.
+
+    Args:
+        df_time: OHLCV DataFrame indexed by timestamp.
+        symbol: Asset symbol, used in the cache filename.
+        timeframe: Candle timeframe, used in the cache filename.
+        use_cache: If False, always recompute and leave the cache untouched.
+        cache_dir: Override for the cache directory (default: .cache/daily).
+        daily_ohlcv: Daily candles already aggregated by the database
+            (query_daily_ohlcv() rows for this symbol, indexed by day). When
+            given, ``df_time`` is not resampled at all.
+    """
+    if daily_ohlcv is None:
+        resampled = _resample_daily(df_time)
+    else:
+        resampled = daily_ohlcv[["open_price", "high_price", "low_price", "close_price", "volume", "n_bars"]]
+    if not use_cache:
+        return _score_daily(resampled)
+
+    path = _cache_path(symbol, timeframe, cache_dir or DAILY_CACHE_DIR, suffix=f".v{DAILY_CACHE_VERSION}.parquet")
+    cached = None
+    if path.exists():
+        try:
+            cached = pd.read_parquet(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable daily cache {path.name}: {e}")
+
+    daily = None
+    if cached is not None and len(cached) > 1:
+        prefix = cached.iloc[:-1]
+        head = resampled.iloc[:len(prefix)]
+        if head.index.equals(prefix.index) and all(
+            np.array_equal(head[col].to_numpy(), prefix[col].to_numpy()) for col in _DAILY_CHECK_COLUMNS
+        ):
+            tail = resampled.iloc[len(prefix):]
+            if len(tail) == 0:
+                daily = prefix
+            else:
+                window = _score_daily(pd.concat([prefix.iloc[-_DAILY_LOOKBACK:], tail]))
+                daily = pd.concat([prefix, window.iloc[-len(tail):]])
+            logger.debug(f"Daily cache extended for {symbol}/{timeframe} by {len(tail)} days")
+
+    if daily is None:
+        daily = _score_daily(resampled)
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        daily.to_parquet(path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not write daily cache {path.name}: {e}")
+    return daily
@@ -7,14 +7,16 @@ Architecture boundary: reads from DuckDB, computes signals, returns dicts.
 Does NOT own backtesting or data fetching.
 """
 
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
 import numpy as np
 import pandas as pd
 from loguru import logger
 
 from src.signals.cycles import detect_dominant_cycle_filtered
-from src.signals.fractals import calculate_hurst
+from src.signals.fractals import calculate_hurst, true_range
 
 
 def generate_signal(
@@ -24,6 +26,7 @@ def generate_signal(
     hurst_threshold: float = 0.6,
     lowpass_cutoff: float = 0.1,
     htf_df: pd.DataFrame | None = None,
+    htf_hurst: float | None = None,
 ) -> dict | None:
     """Generate combined trading signal for a single symbol/timeframe.
 
@@ -42,6 +45,9 @@ def generate_signal(
         hurst_threshold: Minimum Hurst value for signal generation.
         lowpass_cutoff: Low-pass filter cutoff frequency.
         htf_df: Optional Higher Timeframe DataFrame for Top-Down filtering.
+        htf_hurst: Optional precomputed HTF Hurst (calculate_hurst(htf_df), or 0.5
+            for an empty frame). Used in place of htf_df, so a symbol's HTF series
+            is analyzed once for all of its timeframes.
 
     Returns:
         Signal dict, or None on failure.
@@ -57,8 +63,11 @@ def generate_signal(
         # Compute Hurst
         hurst_value = calculate_hurst(df)
 
+        has_htf = htf_df is not None or htf_hurst is not None
         htf_hurst_value = 0.5
-        if htf_df is not None and not htf_df.empty:
+        if htf_hurst is not None:
+            htf_hurst_value = htf_hurst
+        elif htf_df is not None and not htf_df.empty:
             htf_hurst_value = calculate_hurst(htf_df)
 
         atr_zscore = _calculate_atr_zscore(df)
@@ -82,7 +91,7 @@ def generate_signal(
         if is_vetoed:
             signal = "neutral"
         else:
-            if htf_df is not None:
+            if has_htf:
                 # MTF logic: buy the dip
                 # Macro expanding (htf_hurst_value >= 0.55), Micro compressing (hurst_value < 0.45)
                 # Note: direction is determined by HTF cycle or LTF cycle?
@@ -115,7 +124,7 @@ def generate_signal(
             "dominant_period": cycle_result["dominant_period"],
             "current_phase": cycle_result["current_phase"],
             "hurst_value": hurst_value,
-            "htf_hurst_value": htf_hurst_value if htf_df is not None else None,
+            "htf_hurst_value": htf_hurst_value if has_htf else None,
             "atr_zscore": atr_zscore,
             "is_vetoed": is_vetoed,
             "phase_array": cycle_result["phase_array"],
@@ -140,10 +149,7 @@ def calculate_atr_scalar(df: pd.DataFrame, period: int = 14) -> float:
         close = df["close_price"]
 
         # True Range
-        tr1 = high - low
-        tr2 = (high - close.shift()).abs()
-        tr3 = (low - close.shift()).abs()
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+        tr = pd.Series(true_range(high.to_numpy(np.float64), low.to_numpy(np.float64), close.to_numpy(np.float64)))
 
         # ATR (Simple Moving Average of TR for stability, or Wilder's)
         # Using simple mean for robustness on small samples
@@ -161,10 +167,10 @@ def calculate_atr_zscore_series(df: pd.DataFrame, period: int = 14, z_period: in
     low = df["low_price"]
     close = df["close_price"]
 
-    tr1 = high - low
-    tr2 = (high - close.shift(1)).abs()
-    tr3 = (low - close.shift(1)).abs()
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+    tr = pd.Series(
+        true_range(high.to_numpy(np.float64), low.to_numpy(np.float64), close.to_numpy(np.float64)),
+        index=df.index,
+    )
 
     atr = tr.rolling(window=period).mean()
 
@@ -223,11 +229,34 @@ def _determine_signal(current_phase: float, hurst_value: float, hurst_threshold:
         return "neutral"
 
 
+def _htf_hurst_task(item: tuple[str, pd.DataFrame]) -> float | None:
+    """Process pool entry point: HTF Hurst for one (symbol, htf_df) item, as generate_signal() would compute it."""
+    symbol, htf_df = item
+    try:
+        return calculate_hurst(htf_df) if not htf_df.empty else 0.5
+    except Exception as e:
+        logger.error(f"HTF Hurst failed for {symbol}: {e}")
+        return None
+
+
+def _generate_signal_task(
+    item: tuple[tuple[str, str], pd.DataFrame, float | None], hurst_threshold: float, lowpass_cutoff: float
+) -> dict | None:
+    """Process pool entry point: generate_signal() for one ((symbol, timeframe), df, htf_hurst) item, logging failures."""
+    (symbol, timeframe), df, htf_hurst = item
+    try:
+        return generate_signal(df, symbol, timeframe, hurst_threshold, lowpass_cutoff, htf_hurst=htf_hurst)
+    except Exception as e:
+        logger.error(f"Batch signal failed for {symbol}/{timeframe}: {e}")
+        return None
+
+
 def generate_signals_batch(
     data_dict: dict[tuple[str, str], pd.DataFrame],
     hurst_threshold: float = 0.6,
     lowpass_cutoff: float = 0.1,
     max_workers: int | None = None,
+    htf_data: dict[str, pd.DataFrame] | None = None,
 ) -> list[dict]:
     """Generate signals for multiple symbol/timeframe pairs in parallel.
 
@@ -239,31 +268,38 @@ def generate_signals_batch(
         hurst_threshold: Minimum Hurst for directional signals.
         lowpass_cutoff: Low-pass filter cutoff frequency.
         max_workers: Max parallel processes (None = CPU count).
+        htf_data: Optional dict mapping symbol to its Higher Timeframe DataFrame
+            (symbols missing from it get no HTF filter). Each symbol's HTF Hurst is
+            computed once and shared by all of its timeframes.
 
     Returns:
-        List of signal dicts (excludes None results from failures).
+        List of signal dicts in ``data_dict`` order (excludes None results from failures).
     """
     results = []
 
     if not data_dict:
         return results
 
+    # Tasks are pickled to the workers in chunks (a few per worker) rather than one future each
+    n_workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(data_dict) // (8 * n_workers))
+    task = partial(_generate_signal_task, hurst_threshold=hurst_threshold, lowpass_cutoff=lowpass_cutoff)
     with ProcessPoolExecutor(max_workers=max_workers) as executor:
-        futures = {}
-        for (symbol, timeframe), df in data_dict.items():
-            future = executor.submit(
-                generate_signal, df, symbol, timeframe, hurst_threshold, lowpass_cutoff
-            )
-            futures[future] = (symbol, timeframe)
-
-        for future in as_completed(futures):
-            symbol, timeframe = futures[future]
-            try:
-                result = future.result()
-                if result is not None:
-                    results.append(result)
-            except Exception as e:
-                logger.error(f"Batch signal failed for {symbol}/{timeframe}: {e}")
+        htf_hurst: dict[str, float | None] = {}
+        if htf_data is not None:
+            symbols = [sym for sym in dict.fromkeys(sym for sym, _ in data_dict) if sym in htf_data]
+            htf_hurst = dict(zip(symbols, executor.map(_htf_hurst_task, ((sym, htf_data[sym]) for sym in symbols))))
+
+        # Pairs of a symbol whose HTF Hurst failed are dropped (generate_signal() would have returned None);
+        # the rest carry a float instead of the HTF frame
+        items = (
+            (key, df, htf_hurst.get(key[0]))
+            for key, df in data_dict.items()
+            if key[0] not in htf_hurst or htf_hurst[key[0]] is not None
+        )
+        for result in executor.map(task, items, chunksize=chunksize):
+            if result is not None:
+                results.append(result)
 
     logger.info(f"Generated {len(results)}/{len(data_dict)} signals")
     return results
@@ -12,6 +12,8 @@ import numpy as np
 import pandas as pd
 from loguru import logger
 
+from src.backtest._kernels import _chop_from_tr, _true_range_nb
+
 
 def calculate_hurst(df: pd.DataFrame, column: str = "close_price") -> float:
     """Calculate Hurst Exponent from OHLCV DataFrame.
@@ -139,14 +141,19 @@ def _hurst_rs(prices: np.ndarray) -> float:
             if std_val == 0.0:
                 continue
 
-            # Cumulative deviations from mean
-            cum_dev = np.empty(size, dtype=np.float64)
-            cum_dev[0] = subseries[0] - mean_val
+            # Cumulative deviations from mean, tracking their range as we go
+            cum_dev = subseries[0] - mean_val
+            cum_max = cum_dev
+            cum_min = cum_dev
             for k in range(1, size):
-                cum_dev[k] = cum_dev[k - 1] + (subseries[k] - mean_val)
+                cum_dev += subseries[k] - mean_val
+                if cum_dev > cum_max:
+                    cum_max = cum_dev
+                elif cum_dev < cum_min:
+                    cum_min = cum_dev
 
             # R/S = (max - min of cumulative deviations) / std
-            r = np.max(cum_dev) - np.min(cum_dev)
+            r = cum_max - cum_min
             rs_sum += r / std_val
             valid_count += 1
 
@@ -196,6 +203,20 @@ def _hurst_rs(prices: np.ndarray) -> float:
 
     return hurst
 
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True Range on raw arrays: max(h-l, |h-prev_c|, |l-prev_c|).
+
+    Thin wrapper over the shared _kernels._true_range_nb: the max skips NaN
+    like ``pd.concat([...], axis=1).max(axis=1)``, so the first bar (no
+    previous close) is ``h-l``.
+    """
+    return _true_range_nb(
+        np.ascontiguousarray(high, dtype=np.float64),
+        np.ascontiguousarray(low, dtype=np.float64),
+        np.ascontiguousarray(close, dtype=np.float64),
+    )
+
+
 def calculate_chop(df: pd.DataFrame, period: int = 14) -> pd.Series:
     """Calculate Choppiness Index (CHOP) for vectorized backtesting.
     
@@ -203,23 +224,20 @@ def calculate_chop(df: pd.DataFrame, period: int = 14) -> pd.Series:
     - CHOP > 61.8: Ranging (Hurst < 0.5)
     - CHOP < 38.2: Trending (Hurst > 0.5)
     """
-    high = df["high_price"]
-    low = df["low_price"]
-    close = df["close_price"]
+    chop = _chop_nb(
+        df["high_price"].to_numpy(np.float64),
+        df["low_price"].to_numpy(np.float64),
+        df["close_price"].to_numpy(np.float64),
+        period,
+    )
+    return pd.Series(chop, index=df.index).fillna(50.0)  # 50 is neutral
 
-    tr1 = high - low
-    tr2 = (high - close.shift(1)).abs()
-    tr3 = (low - close.shift(1)).abs()
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
 
-    atr_sum = tr.rolling(window=period).sum()
-    max_high = high.rolling(window=period).max()
-    min_low = low.rolling(window=period).min()
-
-    # Avoid division by zero
-    range_hl = max_high - min_low
-    range_hl = range_hl.replace(0, np.nan)
-
-    chop = 100 * np.log10(atr_sum / range_hl) / np.log10(period)
-    return chop.fillna(50.0) # 50 is neutral
+@numba.njit(cache=True)
+def _chop_nb(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    """CHOP core: ``100 * log10(sum(TR) / (max(high) - min(low))) / log10(period)`` per window.
 
+    Incremental over the shared True Range (see _kernels._chop_from_tr): the
+    first ``period - 1`` bars, windows holding a NaN and zero-range windows are NaN.
+    """
+    return _chop_from_tr(high, low, _true_range_nb(high, low, close), period)
@@ -3,12 +3,18 @@
 import numpy as np
 import pandas as pd
 
+import src.backtest.analyzer as analyzer
 from src.backtest.analyzer import (
+    compute_asset_metrics,
     compute_metrics,
     export_trade_log_csv,
     extract_trade_log,
     find_best_params,
+    portfolio_metrics,
     recommend_config,
+    stream_sweep_results,
+    update_strategy_config,
+    write_table,
 )
 from src.backtest.vbt_runner import run_backtest
 
@@ -41,6 +47,33 @@ class TestExtractTradeLog:
             assert "pnl" in log.columns
             assert "return_pct" in log.columns
 
+    def test_matches_readable_records(self):
+        import vectorbt as vbt
+
+        t = np.arange(300)
+        prices = 100.0 + 10.0 * np.sin(t / 8.0)
+        close = pd.DataFrame(
+            {"AAA": prices, "BBB": prices[::-1].copy()},
+            index=pd.date_range("2020-01-01", periods=300, freq="D"),
+        )
+
+        def signal(mod):
+            return pd.DataFrame(np.repeat((t % 40 == mod)[:, None], 2, axis=1), index=close.index, columns=close.columns)
+
+        pf = vbt.Portfolio.from_signals(
+            close, entries=signal(0), exits=signal(20), short_entries=signal(25), short_exits=signal(35), freq="1D",
+        )
+        readable = pf.trades.records_readable
+        log = extract_trade_log(pf)
+
+        assert set(log["direction"]) == {"Long", "Short"}
+        assert log["symbol"].tolist() == readable["Column"].tolist()
+        assert log["direction"].tolist() == readable["Direction"].tolist()
+        np.testing.assert_array_equal(log["entry_time"].to_numpy(), readable["Entry Timestamp"].to_numpy())
+        np.testing.assert_array_equal(log["exit_time"].to_numpy(), readable["Exit Timestamp"].to_numpy())
+        np.testing.assert_allclose(log["return_pct"], readable["Return"] * 100)
+        np.testing.assert_allclose(log["entry_value_usdt"], readable["Size"] * readable["Avg Entry Price"])
+
 
 class TestExportTradeLogCsv:
     def test_creates_csv_file(self, tmp_path):
@@ -68,6 +101,21 @@ class TestExportTradeLogCsv:
         saved = export_trade_log_csv(result["portfolio"], csv_path)
         assert saved is not None
 
+    def test_parquet_suffix_writes_parquet(self, tmp_path):
+        result = _run_sample_backtest()
+        assert result is not None
+        path = tmp_path / "trades.parquet"
+        export_trade_log_csv(result["portfolio"], str(path), symbol="AAPL")
+        log = pd.read_parquet(path)
+        assert list(log.columns) == list(extract_trade_log(result["portfolio"]).columns)
+
+
+class TestWriteTable:
+    def test_csv_round_trip(self, tmp_path):
+        df = pd.DataFrame({"symbol": ["A", "B"], "pnl": [1.5, -2.0], "total_trades": [3, 4]})
+        write_table(df, tmp_path / "out.csv")
+        pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "out.csv"), df)
+
 
 class TestComputeMetrics:
     def test_returns_dict_with_keys(self):
@@ -81,6 +129,38 @@ class TestComputeMetrics:
         assert "total_trades" in metrics
 
 
+class TestPortfolioMetrics:
+    def test_matches_stats_fields(self):
+        result = _run_sample_backtest()
+        assert result is not None
+        pf = result["portfolio"]
+        stats = pf.stats()
+        row = portfolio_metrics(pf).iloc[0]
+        for name, field in [
+            ("total_return", "Total Return [%]"), ("sharpe_ratio", "Sharpe Ratio"),
+            ("max_drawdown", "Max Drawdown [%]"), ("win_rate", "Win Rate [%]"),
+            ("total_trades", "Total Trades"), ("profit_factor", "Profit Factor"),
+        ]:
+            np.testing.assert_allclose(row[name], float(stats[field]), rtol=1e-9)
+
+
+class TestComputeAssetMetrics:
+    def test_one_row_per_asset(self):
+        t = np.arange(500, dtype=np.float64)
+        dates = pd.date_range("2020-01-01", periods=500, freq="D")
+        close = pd.DataFrame({
+            "AAA": 100.0 + 10.0 * np.sin(2.0 * np.pi * t / 50),
+            "BBB": 100.0 + 10.0 * np.sin(2.0 * np.pi * t / 40),
+        }, index=dates)
+        phase = np.column_stack([(2.0 * np.pi * t / 50) % (2.0 * np.pi), (2.0 * np.pi * t / 40) % (2.0 * np.pi)])
+        result = run_backtest(close, phase, 0.7, hurst_threshold=0.5, freq="1D")
+        assert result is not None
+
+        per_asset = compute_asset_metrics(result["portfolio"])
+        assert per_asset["symbol"].tolist() == ["AAA", "BBB"]
+        assert per_asset["total_trades"].sum() == result["total_trades"]
+
+
 class TestFindBestParams:
     def test_returns_top_n(self):
         sweep = pd.DataFrame({
@@ -117,6 +197,16 @@ class TestFindBestParams:
         assert len(top) == 1
         assert top.iloc[0]["total_trades"] == 5
 
+    def test_ties_keep_sweep_order_and_nan_ranks_last(self):
+        sweep = pd.DataFrame({
+            "hurst_threshold": [0.5, 0.6, 0.7, 0.8, 0.9],
+            "sharpe_ratio": [0.8, np.nan, 1.2, 0.8, 0.8],
+            "total_trades": [5, 5, 5, 5, 5],
+        })
+        top = find_best_params(sweep, top_n=3)
+        assert top["hurst_threshold"].tolist() == [0.7, 0.5, 0.8]
+        assert find_best_params(sweep, top_n=10)["hurst_threshold"].iloc[-1] == 0.6
+
 
 class TestRecommendConfig:
     def test_returns_best_params(self):
@@ -137,3 +227,56 @@ class TestRecommendConfig:
 
     def test_returns_none_for_empty(self):
         assert recommend_config(pd.DataFrame()) is None
+
+
+class TestUpdateStrategyConfig:
+    TOML = (
+        "# Strategy\n"
+        "[hurst]\n"
+        "threshold = 0.55  # Hurst cut-off\n"
+        "threshold_max = 0.9\n"
+        "\n"
+        "[filters]\n"
+        "threshold = 48\n"
+        "\n"
+        "[risk]\n"
+        "trailing_atr_multiplier = 3.0\n"
+    )
+
+    def test_updates_exact_keys_only(self, tmp_path, monkeypatch):
+        (tmp_path / "strategy.toml").write_text(self.TOML)
+        monkeypatch.setattr(analyzer, "CONFIG_DIR", tmp_path)
+        assert update_strategy_config({"hurst_threshold": 0.6, "trailing_multiplier": 2.5})
+        assert (tmp_path / "strategy.toml").read_text() == (
+            self.TOML
+            .replace("threshold = 0.55  #", "threshold = 0.6  #")
+            .replace("trailing_atr_multiplier = 3.0", "trailing_atr_multiplier = 2.5")
+        )
+
+    def test_missing_file(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(analyzer, "CONFIG_DIR", tmp_path)
+        assert not update_strategy_config({"hurst_threshold": 0.6, "trailing_multiplier": 2.5})
+
+
+class TestStreamSweepResults:
+    def _rows(self):
+        return [
+            {"hurst_threshold": 0.5, "phase_long": 4.0, "phase_short": 1.0, "trailing_multiplier": 2.0,
+             "macro_filter_type": "both", "total_return": float(i), "sharpe_ratio": float(sr),
+             "max_drawdown": 1.0, "win_rate": 50.0, "profit_factor": 1.0, "total_trades": trades}
+            for i, (sr, trades) in enumerate([(0.5, 3), (2.0, 0), (1.5, 4), (float("nan"), 2), (0.9, 1)])
+        ]
+
+    def test_matches_find_best_params(self, tmp_path):
+        rows = self._rows()
+        top, count = stream_sweep_results(iter(rows), tmp_path / "sweep.parquet", top_n=2, batch_size=2)
+        assert count == 5
+        expected = find_best_params(pd.DataFrame(rows), top_n=2)
+        pd.testing.assert_frame_equal(top, expected)
+        pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / "sweep.parquet"), pd.DataFrame(rows))
+
+    def test_csv_format(self, tmp_path):
+        rows = self._rows()
+        _, count = stream_sweep_results(rows, tmp_path / "sweep.csv", fmt="csv")
+        assert count == 5
+        assert len(pd.read_csv(tmp_path / "sweep.csv")) == 5
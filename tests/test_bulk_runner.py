@@ -0,0 +1,75 @@
+"""Tests for src/backtest/bulk_runner.py — multi-timeframe portfolio runs."""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.backtest.bulk_runner import _calculate_atr_series, init_bulk_worker, run_bulk_backtest
+from src.config import AppSettings, AssetConfig, StrategyConfig, TimeframeConfig
+from src.data_loader import get_connection, upsert_ohlcv
+
+
+def _seed(settings: AppSettings, symbols: list[str], n: int = 400) -> None:
+    rng = np.random.default_rng(0)
+    conn = get_connection(settings)
+    try:
+        for sym, period in zip(symbols, (40, 55)):
+            t = np.arange(n, dtype=np.float64)
+            p = 100 + 10 * np.sin(2 * np.pi * t / period) + np.cumsum(rng.normal(0, 0.5, n))
+            upsert_ohlcv(conn, pd.DataFrame({
+                "symbol": sym, "timeframe": "1d",
+                "timestamp": pd.date_range("2023-01-01", periods=n, freq="D"),
+                "open_price": p, "high_price": p + 1.5, "low_price": p - 1.5, "close_price": p, "volume": 1000.0,
+            }))
+    finally:
+        conn.close()
+
+
+class TestCalculateAtrSeries:
+    def test_matches_pandas_reference(self):
+        rng = np.random.default_rng(1)
+        close = pd.Series(100 + np.cumsum(rng.normal(0, 1, 200)))
+        df = pd.DataFrame({"high_price": close + 1.0, "low_price": close - 1.0, "close_price": close})
+        tr = pd.concat([
+            df["high_price"] - df["low_price"],
+            (df["high_price"] - close.shift(1)).abs(),
+            (df["low_price"] - close.shift(1)).abs(),
+        ], axis=1).max(axis=1)
+        expected = tr.rolling(14).mean().bfill()
+        pd.testing.assert_series_equal(_calculate_atr_series(df, 14), expected)
+
+
+class TestRunBulkBacktest:
+    def test_executor_matches_serial(self, tmp_path):
+        settings = AppSettings(duckdb_path=str(tmp_path / "bulk.duckdb"))
+        assets = AssetConfig()
+        assets.crypto_symbols = ["AAA/USDT", "BBB/USDT"]
+        _seed(settings, assets.crypto_symbols)
+
+        strategy = StrategyConfig()
+        strategy.bot_a_timeframes, strategy.bot_b_timeframes = ["1d"], []
+        strategy.bot_c_timeframes, strategy.bot_d_timeframes = [], []
+        strategy.hurst_min_data_points = 100
+
+        outputs = {}
+        for mode in ("serial", "pool"):
+            strategy.backtest_output_dir = str(tmp_path / mode)
+            if mode == "serial":
+                asyncio.run(run_bulk_backtest(settings, assets, strategy, TimeframeConfig()))
+            else:
+                with ProcessPoolExecutor(
+                    max_workers=1, initializer=init_bulk_worker, initargs=(settings, strategy)
+                ) as pool:
+                    asyncio.run(run_bulk_backtest(settings, assets, strategy, TimeframeConfig(), executor=pool))
+            outputs[mode] = (
+                pd.read_parquet(tmp_path / mode / "summary_bulk_crypto.parquet"),
+                pd.read_parquet(tmp_path / mode / "summary_bulk_crypto_by_symbol.parquet"),
+            )
+
+        for serial, pooled in zip(outputs["serial"], outputs["pool"]):
+            pd.testing.assert_frame_equal(serial, pooled)
+        summary, by_symbol = outputs["pool"]
+        assert "portfolio" not in summary.columns
+        assert sorted(by_symbol["symbol"]) == ["AAA/USDT", "BBB/USDT"]
@@ -41,6 +41,38 @@ class TestLoadToml:
         data = _load_toml("nonexistent.toml")
         assert data == {}
 
+    def test_cache_reused_until_file_changes(self, tmp_path, monkeypatch):
+        import os
+
+        import src.config as config
+
+        monkeypatch.setattr(config, "CONFIG_DIR", tmp_path)
+        monkeypatch.setattr(config, "CONFIG_CACHE_DIR", tmp_path / "cache")
+        toml_path = tmp_path / "sample.toml"
+        toml_path.write_text("[a]\nx = 1\n")
+
+        assert _load_toml("sample.toml") == {"a": {"x": 1}}
+        assert (tmp_path / "cache" / "sample.toml.pickle").exists()
+        assert _load_toml("sample.toml") == {"a": {"x": 1}}
+
+        toml_path.write_text("[a]\nx = 22\n")
+        st = toml_path.stat()
+        os.utime(toml_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert _load_toml("sample.toml") == {"a": {"x": 22}}
+
+    def test_memoized_within_process(self, tmp_path, monkeypatch):
+        import src.config as config
+
+        monkeypatch.setattr(config, "CONFIG_DIR", tmp_path)
+        monkeypatch.setattr(config, "CONFIG_CACHE_DIR", tmp_path / "cache")
+        (tmp_path / "sample.toml").write_text("[a]\nx = 1\n")
+
+        first = _load_toml("sample.toml")
+        (tmp_path / "cache" / "sample.toml.pickle").unlink()
+        first["a"]["x"] = 99
+        # Served from memory (no pickle to read) and unaffected by the caller's mutation
+        assert _load_toml("sample.toml") == {"a": {"x": 1}}
+
 
 class TestAssetConfig:
     def test_stock_symbols_loaded(self):
@@ -81,6 +113,12 @@ class TestStrategyConfig:
         assert config.backtest_commission == 0.001
         assert len(config.backtest_hurst_range) > 0
 
+    def test_backtest_timeframes_unique_union(self):
+        config = StrategyConfig()
+        tfs = config.backtest_timeframes
+        assert len(tfs) == len(set(tfs))
+        assert set(config.bot_a_timeframes) <= set(tfs)
+
 
 class TestTimeframeConfig:
     def test_default_timeframes_loaded(self):
@@ -98,3 +98,14 @@ class TestFetchCryptoOhlcv:
 
         await fetch_crypto_ohlcv("BTC/USDT", "1h", "1h", "binance")
         mock_exchange.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_leaves_shared_exchange_open(self, mock_ohlcv_data):
+        shared = AsyncMock()
+        shared.fetch_ohlcv = AsyncMock(return_value=mock_ohlcv_data)
+        shared.close = AsyncMock()
+
+        df = await fetch_crypto_ohlcv("BTC/USDT", "1h", "1h", "binance", exchange=shared)
+
+        assert len(df) == 3
+        shared.close.assert_not_called()
@@ -1,10 +1,20 @@
 """Tests for src/dashboard/app.py — scanner data loading."""
 
+import importlib
+
 import duckdb
 import numpy as np
 import pandas as pd
+import pytest
+
+import src.dashboard.app as app
+from src.dashboard.app import _bg_cache, _load_scanner_data, _read_scanner_cache, _save_scanner_cache
+
 
-from src.dashboard.app import _bg_cache, _load_scanner_data
+@pytest.fixture(autouse=True)
+def _isolated_scanner_cache(tmp_path, monkeypatch):
+    """Keep tests off the project's persisted scanner table."""
+    monkeypatch.setattr(app, "_SCANNER_CACHE_PATH", tmp_path / "cache" / "scanner.parquet")
 
 
 def _seed_db(db_path: str, symbol: str = "AAPL", timeframe: str = "1d", n: int = 500) -> None:
@@ -117,3 +127,62 @@ class TestLoadScannerData:
         result = _load_scanner_data(db_path)
         for h in result["LTF Hurst"]:
             assert 0.0 <= h <= 100.0
+
+
+class TestScannerCache:
+    def test_persisted_table_served_before_compute(self, tmp_path):
+        table = pd.DataFrame({"Symbol": ["AAPL"], "Timeframe": ["1d"], "Signal": ["LONG"]})
+        _save_scanner_cache(table)
+
+        _clear_bg_cache()
+        # No database at this path: the result must come from the persisted table
+        result = _load_scanner_data(str(tmp_path / "missing.duckdb"))
+        pd.testing.assert_frame_equal(result, table)
+
+    def test_background_table_survives_rerun(self, tmp_path):
+        table = pd.DataFrame({"Symbol": ["AAPL"], "Timeframe": ["1d"], "Signal": ["LONG"]})
+        _clear_bg_cache()
+        _bg_cache()["scanner"] = table  # as written by the scheduler job
+
+        importlib.reload(app)  # `streamlit run` re-executes the script on every rerun
+        result = app._load_scanner_data(str(tmp_path / "missing.duckdb"))
+        pd.testing.assert_frame_equal(result, table)
+        _clear_bg_cache()
+
+    def test_stale_table_ignored(self):
+        import os
+        import time
+
+        _save_scanner_cache(pd.DataFrame({"Symbol": ["AAPL"]}))
+        old = time.time() - app._SCANNER_CACHE_MAX_AGE - 10
+        os.utime(app._SCANNER_CACHE_PATH, (old, old))
+        assert _read_scanner_cache() is None
+
+
+class TestGetConfig:
+    def test_loaded_once_until_cleared(self, monkeypatch):
+        calls = []
+
+        def fake_load_config():
+            calls.append(1)
+            return ("settings",)
+
+        monkeypatch.setattr(app, "load_config", fake_load_config)
+        app._get_config.clear()
+        try:
+            first = app._get_config()
+            assert app._get_config() is first
+            assert len(calls) == 1
+
+            # `streamlit run` re-executes the script on every rerun; the cache must survive that
+            importlib.reload(app)
+            monkeypatch.setattr(app, "load_config", fake_load_config)
+            assert app._get_config() is first
+            assert len(calls) == 1
+
+            # What "Refresh Now" does: the next caller (rerun or scheduler job) reloads
+            app._get_config.clear()
+            assert app._get_config() == ("settings",)
+            assert len(calls) == 2
+        finally:
+            app._get_config.clear()
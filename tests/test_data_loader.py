@@ -1,16 +1,26 @@
 """Tests for src/data_loader.py — DuckDB schema and upsert operations."""
 
+import numpy as np
 import pandas as pd
 import pytest
 
+import src.data_loader as data_loader
 from src.config import AppSettings
 from src.data_loader import (
     OHLCV_COLUMNS,
+    close_shared_connections,
     count_rows,
+    discard_shared_connection,
     get_connection,
+    get_latest_closes,
     get_latest_timestamp,
+    get_shared_connection,
+    query_daily_ohlcv,
     query_ohlcv,
+    query_ohlcv_multi,
+    query_signals,
     upsert_ohlcv,
+    upsert_signals,
 )
 
 
@@ -83,6 +93,52 @@ class TestGetConnection:
         assert "ohlcv" in tables["name"].values
         conn2.close()
 
+    def test_applies_duckdb_tuning(self, tmp_path):
+        settings = AppSettings(
+            duckdb_path=str(tmp_path / "tuned.duckdb"),
+            duckdb_threads=2, duckdb_memory_limit="512MB",
+            database_host="", database_name="", database_user=""
+        )
+        conn = get_connection(settings)
+        assert conn.execute("SELECT current_setting('threads')").fetchone()[0] == 2
+        assert conn.execute("SELECT current_setting('memory_limit')").fetchone()[0] != ""
+        conn.close()
+
+    def test_postgres_engine_is_reused(self, monkeypatch):
+        created = []
+        monkeypatch.setattr(data_loader, "create_engine", lambda url, **kw: created.append(url) or object())
+        monkeypatch.setattr(data_loader, "_ENGINES", {})
+        url = "postgresql://user:pw@localhost:5432/rabbit"
+        assert data_loader._get_engine(url) is data_loader._get_engine(url)
+        assert created == [url]
+
+
+class TestGetSharedConnection:
+    def test_reuses_connection(self, tmp_path):
+        settings = AppSettings(
+            duckdb_path=str(tmp_path / "shared.duckdb"),
+            database_host="", database_name="", database_user=""
+        )
+        try:
+            conn = get_shared_connection(settings)
+            assert get_shared_connection(settings) is conn
+        finally:
+            close_shared_connections()
+
+    def test_discard_forces_reconnect(self, tmp_path):
+        settings = AppSettings(
+            duckdb_path=str(tmp_path / "shared.duckdb"),
+            database_host="", database_name="", database_user=""
+        )
+        try:
+            conn = get_shared_connection(settings)
+            discard_shared_connection(conn)
+            fresh = get_shared_connection(settings)
+            assert fresh is not conn
+            assert fresh.execute("SELECT 1").fetchone() == (1,)
+        finally:
+            close_shared_connections()
+
 
 class TestUpsertOhlcv:
     def test_insert_new_rows(self, db_conn, sample_ohlcv_df):
@@ -167,6 +223,59 @@ class TestQueryOhlcv:
         assert timestamps == sorted(timestamps)
 
 
+class TestQueryOhlcvMulti:
+    def test_returns_contiguous_symbol_blocks(self, db_conn, sample_ohlcv_df):
+        other = sample_ohlcv_df.assign(symbol="MSFT")
+        upsert_ohlcv(db_conn, pd.concat([other, sample_ohlcv_df], ignore_index=True))
+        result = query_ohlcv_multi(db_conn, ["MSFT", "AAPL"], "1h")
+        assert result["symbol"].tolist() == ["AAPL"] * 3 + ["MSFT"] * 3
+        pd.testing.assert_frame_equal(
+            result.iloc[:3].reset_index(drop=True), query_ohlcv(db_conn, "AAPL", "1h")
+        )
+
+    def test_ignores_missing_symbols(self, db_conn, sample_ohlcv_df):
+        upsert_ohlcv(db_conn, sample_ohlcv_df)
+        result = query_ohlcv_multi(db_conn, ["AAPL", "MSFT"], "1h")
+        assert set(result["symbol"]) == {"AAPL"}
+
+    def test_empty_symbol_list(self, db_conn):
+        result = query_ohlcv_multi(db_conn, [], "1h")
+        assert result.empty
+        assert list(result.columns) == OHLCV_COLUMNS
+
+
+class TestQueryDailyOhlcv:
+    def test_matches_pandas_resample(self, db_conn):
+        rng = np.random.default_rng(0)
+        n = 24 * 5 + 7
+        close = 100.0 + np.cumsum(rng.normal(0.0, 1.0, n))
+        df = pd.DataFrame({
+            "symbol": "AAPL",
+            "timeframe": "1h",
+            "timestamp": pd.date_range("2026-01-01 03:00", periods=n, freq="h"),
+            "open_price": close + rng.normal(0.0, 0.1, n),
+            "high_price": close + 1.0,
+            "low_price": close - 1.0,
+            "close_price": close,
+            "volume": rng.uniform(1.0, 10.0, n),
+        })
+        upsert_ohlcv(db_conn, df)
+
+        result = query_daily_ohlcv(db_conn, ["AAPL"], "1h").set_index("timestamp")
+        expected = df.set_index("timestamp").resample("1D").agg({
+            "open_price": "first", "high_price": "max", "low_price": "min",
+            "close_price": "last", "volume": "sum",
+        }).dropna()
+        assert (result.index == expected.index).all()
+        np.testing.assert_allclose(result[expected.columns].to_numpy(), expected.to_numpy())
+        assert result["n_bars"].tolist() == [21, 24, 24, 24, 24, 10]
+
+    def test_empty_symbol_list(self, db_conn):
+        result = query_daily_ohlcv(db_conn, [], "1h")
+        assert result.empty
+        assert "n_bars" in result.columns
+
+
 class TestGetLatestTimestamp:
     def test_returns_none_when_empty(self, db_conn):
         assert get_latest_timestamp(db_conn, "AAPL", "1h") is None
@@ -176,6 +285,17 @@ class TestGetLatestTimestamp:
         latest = get_latest_timestamp(db_conn, "AAPL", "1h")
         assert latest == pd.Timestamp("2026-01-01 11:00")
 
+class TestGetLatestCloses:
+    def test_latest_bar_per_symbol(self, db_conn, sample_ohlcv_df):
+        daily = sample_ohlcv_df.iloc[:1].assign(timeframe="1d", close_price=149.0)
+        other = sample_ohlcv_df.assign(symbol="O'NEIL", close_price=[10.0, 11.0, 12.0])
+        upsert_ohlcv(db_conn, pd.concat([sample_ohlcv_df, daily, other], ignore_index=True))
+        assert get_latest_closes(db_conn, ["AAPL", "O'NEIL", "MSFT"]) == {"AAPL": 152.5, "O'NEIL": 12.0}
+
+    def test_empty_symbol_list(self, db_conn):
+        assert get_latest_closes(db_conn, []) == {}
+
+
 class TestCountRows:
     def test_count_all_rows(self, db_conn, sample_ohlcv_df):
         upsert_ohlcv(db_conn, sample_ohlcv_df)
@@ -188,3 +308,20 @@ class TestCountRows:
 
     def test_count_empty_table(self, db_conn):
         assert count_rows(db_conn) == 0
+
+
+class TestSignals:
+    def test_round_trip(self, db_conn):
+        phase = np.linspace(0.0, 6.0, 50)
+        assert upsert_signals(db_conn, "AAPL", "1h", "abc", phase, 0.61)
+        stored = query_signals(db_conn, "AAPL", "1h", "abc")
+        assert stored is not None
+        np.testing.assert_array_equal(stored[0], phase)
+        assert stored[1] == 0.61
+
+    def test_stale_hash_misses_and_replace_overwrites(self, db_conn):
+        upsert_signals(db_conn, "AAPL", "1h", "old", np.zeros(5), 0.5)
+        upsert_signals(db_conn, "AAPL", "1h", "new", np.ones(5), 0.7)
+        assert query_signals(db_conn, "AAPL", "1h", "old") is None
+        assert query_signals(db_conn, "AAPL", "1h", "new")[1] == 0.7
+        assert db_conn.execute("SELECT COUNT(*) FROM signals").fetchone()[0] == 1
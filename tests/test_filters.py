@@ -86,6 +86,16 @@ class TestGenerateSignal:
         assert result is not None
         assert result["signal"] == "neutral"
 
+    def test_precomputed_htf_hurst_matches_htf_df(self):
+        from src.signals.fractals import calculate_hurst
+
+        df = _make_sinusoidal_df(period=50, n=500)
+        htf_df = _make_sinusoidal_df(period=20, n=300)
+        from_df = generate_signal(df, "TEST", "1h", htf_df=htf_df)
+        from_value = generate_signal(df, "TEST", "1h", htf_hurst=calculate_hurst(htf_df))
+        assert from_value["htf_hurst_value"] == from_df["htf_hurst_value"]
+        assert from_value["signal"] == from_df["signal"]
+
 
 class TestGenerateSignalsBatch:
     def test_empty_dict_returns_empty(self):
@@ -120,3 +130,15 @@ class TestGenerateSignalsBatch:
         results = generate_signals_batch(data, max_workers=2)
         assert len(results) == 1
         assert results[0]["symbol"] == "GOOD"
+
+    def test_batch_passes_htf_data_per_symbol(self):
+        data = {
+            ("SYM1", "1h"): _make_sinusoidal_df(50, 500),
+            ("SYM2", "1h"): _make_sinusoidal_df(30, 500),
+        }
+        htf_data = {"SYM1": _make_sinusoidal_df(20, 300)}
+        results = generate_signals_batch(data, max_workers=2, htf_data=htf_data)
+        by_symbol = {r["symbol"]: r for r in results}
+        expected = generate_signal(data["SYM1", "1h"], "SYM1", "1h", htf_df=htf_data["SYM1"])
+        assert by_symbol["SYM1"]["htf_hurst_value"] == expected["htf_hurst_value"]
+        assert by_symbol["SYM2"]["htf_hurst_value"] is None
@@ -5,7 +5,7 @@ import time
 import numpy as np
 import pandas as pd
 
-from src.signals.fractals import _hurst_rs, calculate_hurst
+from src.signals.fractals import _hurst_rs, calculate_chop, calculate_hurst, true_range
 
 
 def _make_df(prices: np.ndarray) -> pd.DataFrame:
@@ -88,3 +88,45 @@ class TestHurstRSInternal:
         prices = rng.normal(100, 10, 500).astype(np.float64)
         result = _hurst_rs(prices)
         assert isinstance(result, (float, np.floating))
+
+
+class TestTrueRange:
+    def test_matches_pandas_concat_max(self):
+        rng = np.random.default_rng(3)
+        close = 100.0 + np.cumsum(rng.normal(0, 1, 200))
+        high = close + rng.random(200)
+        low = close - rng.random(200)
+        h, lo, c = pd.Series(high), pd.Series(low), pd.Series(close)
+        expected = pd.concat([h - lo, (h - c.shift(1)).abs(), (lo - c.shift(1)).abs()], axis=1).max(axis=1)
+
+        result = true_range(high, low, close)
+        np.testing.assert_allclose(result, expected.to_numpy())
+        assert result[0] == high[0] - low[0]
+
+
+class TestCalculateChop:
+    def test_matches_pandas_rolling_reference(self):
+        rng = np.random.default_rng(5)
+        close = 100.0 + np.cumsum(rng.normal(0, 1, 300))
+        df = pd.DataFrame({"high_price": close + rng.random(300), "low_price": close - rng.random(300), "close_price": close})
+        df.iloc[150:154] = 100.0  # flat stretch of zero range
+
+        tr = pd.Series(true_range(df["high_price"].to_numpy(), df["low_price"].to_numpy(), df["close_price"].to_numpy()))
+        range_hl = (df["high_price"].rolling(14).max() - df["low_price"].rolling(14).min()).replace(0, np.nan)
+        expected = (100 * np.log10(tr.rolling(14).sum() / range_hl) / np.log10(14)).fillna(50.0)
+
+        np.testing.assert_allclose(calculate_chop(df, 14).to_numpy(), expected.to_numpy(), rtol=1e-12)
+
+    def test_nan_bar_blanks_only_its_windows(self):
+        rng = np.random.default_rng(6)
+        close = 100.0 + np.cumsum(rng.normal(0, 1, 300))
+        df = pd.DataFrame({"high_price": close + rng.random(300), "low_price": close - rng.random(300), "close_price": close})
+        df.loc[120, "high_price"] = np.nan
+
+        tr = pd.Series(true_range(df["high_price"].to_numpy(), df["low_price"].to_numpy(), df["close_price"].to_numpy()))
+        range_hl = (df["high_price"].rolling(14).max() - df["low_price"].rolling(14).min()).replace(0, np.nan)
+        expected = (100 * np.log10(tr.rolling(14).sum() / range_hl) / np.log10(14)).fillna(50.0)
+
+        result = calculate_chop(df, 14).to_numpy()
+        np.testing.assert_allclose(result, expected.to_numpy(), rtol=1e-10)
+        assert (result[120:134] == 50.0).all()
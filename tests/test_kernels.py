@@ -0,0 +1,106 @@
+"""Tests for src/backtest/_kernels.py — Numba indicator kernels."""
+
+import numpy as np
+import pandas as pd
+
+from src.backtest._kernels import (
+    _atr_sma,
+    _atr_sma_grouped,
+    _ltf_indicators,
+    _ltf_indicators_grouped,
+    group_starts,
+    sma,
+)
+from src.signals.filters import calculate_atr_zscore_series
+from src.signals.fractals import calculate_chop
+
+
+def _make_ohlc(n: int = 300):
+    rng = np.random.default_rng(7)
+    close = 100.0 + np.cumsum(rng.normal(0, 1, n))
+    high = close + rng.random(n) * 2
+    low = close - rng.random(n) * 2
+    return high, low, close
+
+
+class TestAtrSma:
+    def test_matches_pandas_reference(self):
+        high, low, close = _make_ohlc()
+        h, lo, c = pd.Series(high), pd.Series(low), pd.Series(close)
+        tr = pd.concat([h - lo, (h - c.shift(1)).abs(), (lo - c.shift(1)).abs()], axis=1).max(axis=1)
+        expected = tr.rolling(window=14).mean().to_numpy()
+
+        result = _atr_sma(high, low, close, 14)
+        np.testing.assert_allclose(result, expected, rtol=1e-10, equal_nan=True)
+
+    def test_warmup_is_nan(self):
+        high, low, close = _make_ohlc(20)
+        result = _atr_sma(high, low, close, 14)
+        assert np.isnan(result[:13]).all()
+        assert not np.isnan(result[13:]).any()
+
+    def test_short_input(self):
+        high, low, close = _make_ohlc(5)
+        assert np.isnan(_atr_sma(high, low, close, 14)).all()
+
+    def test_nan_poisons_only_its_windows(self):
+        high, low, close = _make_ohlc()
+        high[100] = low[100] = np.nan  # every TR leg NaN
+        close[150] = np.nan  # only the |h-c[-1]| / |l-c[-1]| legs of bar 151 are NaN
+        h, lo, c = pd.Series(high), pd.Series(low), pd.Series(close)
+        tr = pd.concat([h - lo, (h - c.shift(1)).abs(), (lo - c.shift(1)).abs()], axis=1).max(axis=1)
+        expected = tr.rolling(window=14).mean().to_numpy()
+
+        result = _atr_sma(high, low, close, 14)
+        np.testing.assert_allclose(result, expected, rtol=1e-10, equal_nan=True)
+        assert np.isnan(result[100:114]).all()
+        assert not np.isnan(result[114:]).any()
+
+
+class TestAtrSmaGrouped:
+    def test_matches_per_segment_kernel(self):
+        high, low, close = _make_ohlc(300)
+        starts = np.array([0, 100, 105, 300], dtype=np.int64)
+        result = _atr_sma_grouped(high, low, close, starts, 14)
+        for s, e in zip(starts[:-1], starts[1:]):
+            np.testing.assert_array_equal(result[s:e], _atr_sma(high[s:e], low[s:e], close[s:e], 14))
+
+    def test_group_starts(self):
+        keys = np.array(["A", "A", "B", "C", "C", "C"], dtype=object)
+        np.testing.assert_array_equal(group_starts(keys), [0, 2, 3, 6])
+        np.testing.assert_array_equal(group_starts(np.array([], dtype=object)), [0])
+
+
+class TestLtfIndicators:
+    def test_matches_separate_indicators(self):
+        high, low, close = _make_ohlc(300)
+        df = pd.DataFrame({"high_price": high, "low_price": low, "close_price": close})
+        atr, chop, vol_z = _ltf_indicators(high, low, close, 14, 14, 50)
+
+        np.testing.assert_allclose(atr, _atr_sma(high, low, close, 14), rtol=1e-10, equal_nan=True)
+        np.testing.assert_allclose(np.nan_to_num(chop, nan=50.0), calculate_chop(df, 14).to_numpy(), rtol=1e-10)
+        np.testing.assert_allclose(np.nan_to_num(vol_z), calculate_atr_zscore_series(df).to_numpy(), rtol=1e-8, atol=1e-10)
+
+    def test_grouped_matches_per_segment_kernel(self):
+        high, low, close = _make_ohlc(300)
+        starts = np.array([0, 100, 105, 300], dtype=np.int64)
+        grouped = _ltf_indicators_grouped(high, low, close, starts, 14, 14, 50)
+        for s, e in zip(starts[:-1], starts[1:]):
+            for whole, part in zip(grouped, _ltf_indicators(high[s:e], low[s:e], close[s:e], 14, 14, 50)):
+                np.testing.assert_array_equal(whole[s:e], part)
+
+
+class TestSma:
+    def test_matches_pandas_rolling_mean(self):
+        _, _, close = _make_ohlc(300)
+        expected = pd.Series(close).rolling(window=50).mean().to_numpy()
+        np.testing.assert_allclose(sma(close, 50), expected, rtol=1e-10, equal_nan=True)
+
+    def test_nan_poisons_only_its_windows(self):
+        values = np.arange(10, dtype=np.float64)
+        values[4] = np.nan
+        expected = pd.Series(values).rolling(window=3).mean().to_numpy()
+        np.testing.assert_allclose(sma(values, 3), expected, equal_nan=True)
+
+    def test_short_input(self):
+        assert np.isnan(sma(np.ones(3), 5)).all()
@@ -0,0 +1,113 @@
+"""Tests for main.py — CLI entry point helpers."""
+
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import main
+import src.config as config
+
+
+class TestMain:
+    def test_help_skips_config_load(self, monkeypatch):
+        def fail():
+            raise AssertionError("load_config() called for --help")
+
+        monkeypatch.setattr(config, "load_config", fail)
+        monkeypatch.setattr("sys.argv", ["rabbit-quant", "--help"])
+        with pytest.raises(SystemExit) as exc:
+            main.main()
+        assert exc.value.code == 0
+
+    def test_import_does_not_load_heavy_modules(self):
+        code = "import sys, main; print(sorted({'pandas', 'numpy', 'duckdb', 'loguru'} & set(sys.modules)))"
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        assert out.strip() == "[]"
+
+    def test_config_commands_cover_every_subcommand_but_dashboard(self):
+        parser = main._build_parser()
+        subparsers = next(a for a in parser._actions if isinstance(a, argparse._SubParsersAction))
+        assert set(subparsers.choices) - main._CONFIG_COMMANDS == {"dashboard"}
+
+
+class TestRepl:
+    def test_reloads_strategy_before_each_command(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "CONFIG_DIR", tmp_path)
+        monkeypatch.setattr(config, "CONFIG_CACHE_DIR", tmp_path / "cache")
+        toml_path = tmp_path / "strategy.toml"
+        toml_path.write_text("[hurst]\nthreshold = 0.4\n")
+        main._reload_strategy()
+        assert main._strategy.hurst_threshold == 0.4
+
+        # e.g. a sweep's "apply" rewrote strategy.toml during the session
+        toml_path.write_text("[hurst]\nthreshold = 0.7\n")
+        st = toml_path.stat()
+        os.utime(toml_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        seen = []
+        monkeypatch.setattr(main, "cmd_fetch", lambda args: seen.append(main._strategy.hurst_threshold))
+        monkeypatch.setattr("sys.stdin", io.StringIO("fetch\nquit\n"))
+        main.cmd_repl(None)
+        assert seen == [0.7]
+
+
+class TestBacktestJson:
+    def test_no_data_emits_json_error(self, capfd, monkeypatch, tmp_path):
+        settings = config.AppSettings(
+            duckdb_path=str(tmp_path / "t.duckdb"),
+            database_host="", database_name="", database_user="",
+        )
+        monkeypatch.setattr(main, "_settings", settings, raising=False)
+        main._reload_strategy()
+        args = main._build_parser().parse_args(["backtest", "--symbol", "ZZZ/USDT", "--json"])
+        args.func(args)
+        payload = json.loads(capfd.readouterr().out)
+        assert payload["error"] == "no data"
+
+
+class TestPrepareSymbol:
+    def _frame(self, n=400):
+        import numpy as np
+        import pandas as pd
+
+        t = np.arange(n, dtype=np.float64)
+        close = 100.0 + 10.0 * np.sin(2.0 * np.pi * t / 40)
+        return pd.DataFrame({
+            "timestamp": pd.date_range("2024-01-01", periods=n, freq="h"),
+            "open_price": close, "high_price": close + 1.0, "low_price": close - 1.0,
+            "close_price": close, "volume": 1.0,
+        })
+
+    def test_cached_signals_are_reused(self):
+        import numpy as np
+
+        from src.config import StrategyConfig
+
+        df = self._frame()
+        signals = (np.zeros(len(df)), 0.42)
+        features, out = main._prepare_symbol(df, np.ones(len(df)), signals, StrategyConfig())
+        assert out is signals
+        assert set(features) == {
+            "ltf", "vol_z", "htf", "htf_dir", "phase",
+            "bb_upper", "bb_lower", "kc_upper", "kc_lower", "atr_ma",
+        }
+        assert (features["phase"] == 0.0).all()
+        assert features["ltf"].index.equals(features["atr_ma"].index)
+
+    def test_htf_direction_is_signed_previous_day(self):
+        import numpy as np
+
+        from src.config import StrategyConfig
+
+        # 60 days of hourly bars so the daily SMA-50 is defined for the last days
+        df = self._frame(n=24 * 60)
+        features, _ = main._prepare_symbol(df, np.ones(len(df)), (np.zeros(len(df)), 0.5), StrategyConfig())
+        htf_dir = features["htf_dir"].to_numpy()
+        assert set(np.unique(htf_dir)) <= {-1, 0, 1}
+        assert (htf_dir[:24] == 0).all()  # no previous day on the first day
+        assert (htf_dir[24:] != 0).all()
@@ -78,6 +78,7 @@ class TestFetchAllAssets:
         assert result.success == 2
         assert result.failed == 0
         assert result.rows_upserted == 2
+        assert len(result.updated) == 2
 
     @pytest.mark.asyncio
     @patch("src.fetchers.orchestrator.fetch_crypto_ohlcv", new_callable=AsyncMock)
@@ -128,3 +129,16 @@ class TestFetchAllAssets:
         # Stock failed with exception, crypto succeeded
         assert result.success == 1
         assert result.failed == 1
+
+    @pytest.mark.asyncio
+    @patch("src.fetchers.orchestrator.fetch_crypto_ohlcv", new_callable=AsyncMock)
+    @patch("src.fetchers.orchestrator.fetch_stock_ohlcv")
+    async def test_forwards_shared_exchange(self, mock_stock, mock_crypto, db_conn, mock_assets, mock_timeframes):
+        mock_stock.return_value = _make_stock_df()
+        mock_crypto.return_value = _make_crypto_df()
+        shared = AsyncMock()
+
+        await fetch_all_assets(db_conn, mock_assets, mock_timeframes, exchange=shared)
+
+        assert mock_crypto.call_args.kwargs["exchange"] is shared
+        shared.close.assert_not_called()
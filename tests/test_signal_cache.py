@@ -0,0 +1,224 @@
+"""Tests for src/signals/cache.py — on-disk cycle/Hurst memoization."""
+
+import numpy as np
+import pandas as pd
+
+from src.config import AppSettings
+from src.data_loader import get_connection, query_signals, upsert_ohlcv
+from src.signals.cache import (
+    _resample_daily,
+    compute_cycle_and_hurst,
+    load_cycle_and_hurst,
+    load_daily_htf,
+    lookup_cycle_and_hurst,
+    ohlcv_content_hash,
+    refresh_signals,
+    store_cycle_and_hurst,
+)
+
+
+def _make_df(n: int = 500, period: int = 50) -> pd.DataFrame:
+    t = np.arange(n, dtype=np.float64)
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n, freq="h"),
+        "close_price": 100.0 + 10.0 * np.sin(2.0 * np.pi * t / period),
+    })
+
+
+class TestLoadCycleAndHurst:
+    def test_writes_then_reads_cache(self, tmp_path):
+        df = _make_df()
+        first = load_cycle_and_hurst(df, "BTC/USDT", "1h", cutoff=0.1, cache_dir=tmp_path)
+        files = list(tmp_path.glob("*.npz"))
+        assert len(files) == 1
+        assert files[0].name == "BTC-USDT_1h.npz"
+
+        second = load_cycle_and_hurst(df, "BTC/USDT", "1h", cutoff=0.1, cache_dir=tmp_path)
+        np.testing.assert_array_equal(first[0], second[0])
+        assert first[1] == second[1]
+
+    def test_new_data_overwrites_entry(self, tmp_path):
+        df = _make_df()
+        load_cycle_and_hurst(df, "BTC/USDT", "1h", cutoff=0.1, cache_dir=tmp_path)
+        longer = _make_df(n=520)
+        fresh = load_cycle_and_hurst(longer, "BTC/USDT", "1h", cutoff=0.1, cache_dir=tmp_path)
+        assert len(fresh[0]) == 520
+        assert [f.name for f in tmp_path.glob("*.npz")] == ["BTC-USDT_1h.npz"]
+
+    def test_no_cache_leaves_directory_empty(self, tmp_path):
+        result = load_cycle_and_hurst(_make_df(), "ETH/USDT", "1h", cutoff=0.1, use_cache=False, cache_dir=tmp_path)
+        assert result is not None
+        assert not any(tmp_path.iterdir())
+
+    def test_hash_changes_with_data_and_cutoff(self):
+        df = _make_df()
+        changed = df.copy()
+        changed.loc[10, "close_price"] += 1.0
+        assert ohlcv_content_hash(df, 0.1) == ohlcv_content_hash(df.copy(), 0.1)
+        assert ohlcv_content_hash(df, 0.1) != ohlcv_content_hash(changed, 0.1)
+        assert ohlcv_content_hash(df, 0.1) != ohlcv_content_hash(df, 0.2)
+
+    def test_version_bump_invalidates_npz(self, tmp_path, monkeypatch):
+        import src.signals.cache as cache
+
+        df = _make_df()
+        load_cycle_and_hurst(df, "BTC/USDT", "1h", cutoff=0.1, cache_dir=tmp_path)
+        assert lookup_cycle_and_hurst(df, "BTC/USDT", "1h", 0.1, cache_dir=tmp_path) is not None
+
+        monkeypatch.setattr(cache, "SIGNAL_CACHE_VERSION", cache.SIGNAL_CACHE_VERSION + 1)
+        assert lookup_cycle_and_hurst(df, "BTC/USDT", "1h", 0.1, cache_dir=tmp_path) is None
+
+    def test_uses_signal_table(self, tmp_path):
+        conn = get_connection(AppSettings(duckdb_path=str(tmp_path / "s.duckdb")))
+        try:
+            df = _make_df()
+            first = load_cycle_and_hurst(df, "BTC/USDT", "1h", cutoff=0.1, cache_dir=tmp_path / "npz", conn=conn)
+            key = ohlcv_content_hash(df, 0.1)
+            stored = query_signals(conn, "BTC/USDT", "1h", key)
+            assert stored is not None
+            np.testing.assert_array_equal(stored[0], first[0])
+            assert not (tmp_path / "npz").exists()
+        finally:
+            conn.close()
+
+
+class TestLookupAndStore:
+    def test_lookup_misses_until_stored(self, tmp_path):
+        df = _make_df()
+        assert lookup_cycle_and_hurst(df, "BTC/USDT", "1h", 0.1, cache_dir=tmp_path) is None
+
+        signals = compute_cycle_and_hurst(df, 0.1)
+        store_cycle_and_hurst(df, "BTC/USDT", "1h", 0.1, signals, cache_dir=tmp_path)
+        hit = lookup_cycle_and_hurst(df, "BTC/USDT", "1h", 0.1, cache_dir=tmp_path)
+        np.testing.assert_array_equal(hit[0], signals[0])
+        assert hit[1] == signals[1]
+
+    def test_lookup_misses_on_different_cutoff(self, tmp_path):
+        df = _make_df()
+        store_cycle_and_hurst(df, "BTC/USDT", "1h", 0.1, compute_cycle_and_hurst(df, 0.1), cache_dir=tmp_path)
+        assert lookup_cycle_and_hurst(df, "BTC/USDT", "1h", 0.2, cache_dir=tmp_path) is None
+
+
+def _make_ohlcv_time(n: int = 24 * 120) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    close = 100.0 + np.cumsum(rng.normal(0.0, 1.0, n))
+    return pd.DataFrame({
+        "open_price": close, "high_price": close + 1.0, "low_price": close - 1.0,
+        "close_price": close, "volume": 1.0,
+    }, index=pd.date_range("2024-01-01", periods=n, freq="h", name="timestamp"))
+
+
+class TestLoadDailyHtf:
+    def test_incremental_update_matches_full_recompute(self, tmp_path):
+        full = _make_ohlcv_time()
+        # Cut mid-day so the cached last day is partial
+        load_daily_htf(full.iloc[:-30], "BTC/USDT", "1h", cache_dir=tmp_path)
+        extended = load_daily_htf(full, "BTC/USDT", "1h", cache_dir=tmp_path)
+        expected = load_daily_htf(full, "BTC/USDT", "1h", use_cache=False)
+        pd.testing.assert_frame_equal(extended, expected, check_freq=False, rtol=1e-9)
+        assert [f.name for f in tmp_path.iterdir()] == ["BTC-USDT_1h.v1.parquet"]
+
+    def test_changed_history_rebuilds(self, tmp_path):
+        full = _make_ohlcv_time()
+        load_daily_htf(full, "BTC/USDT", "1h", cache_dir=tmp_path)
+        revised = full.iloc[48:]
+        result = load_daily_htf(revised, "BTC/USDT", "1h", cache_dir=tmp_path)
+        expected = load_daily_htf(revised, "BTC/USDT", "1h", use_cache=False)
+        pd.testing.assert_frame_equal(result, expected, check_freq=False)
+
+    def test_revised_bar_with_same_count_rebuilds(self, tmp_path):
+        full = _make_ohlcv_time()
+        load_daily_htf(full.iloc[:-30], "BTC/USDT", "1h", cache_dir=tmp_path)
+        revised = full.copy()
+        revised.iloc[24 * 10 + 5, revised.columns.get_loc("high_price")] += 50.0  # mid-day bar, same bar count
+        result = load_daily_htf(revised, "BTC/USDT", "1h", cache_dir=tmp_path)
+        expected = load_daily_htf(revised, "BTC/USDT", "1h", use_cache=False)
+        pd.testing.assert_frame_equal(result, expected, check_freq=False)
+
+    def test_database_daily_candles_match_resample(self, tmp_path):
+        full = _make_ohlcv_time()
+        expected = load_daily_htf(full, "BTC/USDT", "1h", use_cache=False)
+        candles = expected.drop(columns=["chop", "sma_50"])
+
+        load_daily_htf(full.iloc[:-30], "BTC/USDT", "1h", cache_dir=tmp_path)
+        result = load_daily_htf(full, "BTC/USDT", "1h", cache_dir=tmp_path, daily_ohlcv=candles)
+        pd.testing.assert_frame_equal(result, expected, check_freq=False, rtol=1e-9)
+
+    def test_resample_daily_matches_pandas_resample(self):
+        full = _make_ohlcv_time()
+        full.iloc[47, full.columns.get_loc("close_price")] = np.nan  # last bar of day 2
+        full.iloc[48, full.columns.get_loc("open_price")] = np.nan  # first bar of day 3
+        full.iloc[60, full.columns.get_loc("high_price")] = np.nan
+        full = full.iloc[5:-7]  # partial first and last days
+        expected = full.resample("1D").agg({
+            "open_price": "first", "high_price": "max", "low_price": "min",
+            "close_price": "last", "volume": "sum"
+        }).dropna()
+        expected["n_bars"] = full["close_price"].resample("1D").count().astype(np.int64)
+        pd.testing.assert_frame_equal(_resample_daily(full), expected, check_freq=False)
+
+    def test_no_cache_leaves_directory_empty(self, tmp_path):
+        daily = load_daily_htf(_make_ohlcv_time(), "BTC/USDT", "1h", use_cache=False, cache_dir=tmp_path)
+        assert {"chop", "sma_50"} <= set(daily.columns)
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestRefreshSignals:
+    def test_precomputes_updated_pairs(self, tmp_path):
+        conn = get_connection(AppSettings(duckdb_path=str(tmp_path / "s.duckdb")))
+        try:
+            df = _make_df()
+            ohlcv = df.assign(
+                symbol="BTC/USDT", timeframe="1h", open_price=df["close_price"],
+                high_price=df["close_price"] + 1, low_price=df["close_price"] - 1, volume=1.0,
+            )
+            upsert_ohlcv(conn, ohlcv)
+            assert refresh_signals(conn, [("BTC/USDT", "1h"), ("ETH/USDT", "1h")], cutoff=0.1) == 1
+            assert query_signals(conn, "BTC/USDT", "1h", ohlcv_content_hash(df, 0.1)) is not None
+            assert refresh_signals(conn, [], cutoff=0.1) == 0
+        finally:
+            conn.close()
+
+    def test_failing_pair_is_skipped(self, tmp_path, monkeypatch):
+        import src.signals.cache as cache
+
+        conn = get_connection(AppSettings(duckdb_path=str(tmp_path / "s.duckdb")))
+        try:
+            df = _make_df()
+            for symbol in ("BTC/USDT", "ETH/USDT"):
+                upsert_ohlcv(conn, df.assign(
+                    symbol=symbol, timeframe="1h", open_price=df["close_price"],
+                    high_price=df["close_price"] + 1, low_price=df["close_price"] - 1, volume=1.0,
+                ))
+            real_load = cache.load_cycle_and_hurst
+
+            def flaky_load(df, symbol, *args, **kwargs):
+                if symbol == "BTC/USDT":
+                    raise ValueError("boom")
+                return real_load(df, symbol, *args, **kwargs)
+
+            monkeypatch.setattr(cache, "load_cycle_and_hurst", flaky_load)
+            assert refresh_signals(conn, [("BTC/USDT", "1h"), ("ETH/USDT", "1h")], cutoff=0.1) == 1
+        finally:
+            conn.close()
+
+    def test_version_bump_replaces_stored_row(self, tmp_path, monkeypatch):
+        import src.signals.cache as cache
+
+        conn = get_connection(AppSettings(duckdb_path=str(tmp_path / "s.duckdb")))
+        try:
+            df = _make_df()
+            upsert_ohlcv(conn, df.assign(
+                symbol="BTC/USDT", timeframe="1h", open_price=df["close_price"],
+                high_price=df["close_price"] + 1, low_price=df["close_price"] - 1, volume=1.0,
+            ))
+            refresh_signals(conn, [("BTC/USDT", "1h")], cutoff=0.1)
+            old_key = ohlcv_content_hash(df, 0.1)
+
+            monkeypatch.setattr(cache, "SIGNAL_CACHE_VERSION", cache.SIGNAL_CACHE_VERSION + 1)
+            assert lookup_cycle_and_hurst(df, "BTC/USDT", "1h", 0.1, conn=conn) is None
+            assert refresh_signals(conn, [("BTC/USDT", "1h")], cutoff=0.1) == 1
+            assert query_signals(conn, "BTC/USDT", "1h", ohlcv_content_hash(df, 0.1)) is not None
+            assert query_signals(conn, "BTC/USDT", "1h", old_key) is None
+        finally:
+            conn.close()
@@ -3,7 +3,20 @@
 import numpy as np
 import pandas as pd
 
-from src.backtest.vbt_runner import build_entries_exits, run_backtest, run_parameter_sweep
+from src.backtest._kernels import _atr_sma_grouped, group_starts
+from src.backtest.vbt_runner import (
+    _attach_shared_input,
+    _dispatch_sweep,
+    _position_size,
+    _share_sweep_inputs,
+    _wrap_phase,
+    build_entries_exits,
+    iter_parameter_sweep,
+    run_backtest,
+    run_multires_sweep,
+    run_parameter_sweep,
+    simulate_portfolio_nb,
+)
 
 
 def _make_price_series(n: int = 500, period: int = 50) -> tuple[pd.Series, np.ndarray]:
@@ -43,6 +56,67 @@ class TestBuildEntriesExits:
         le, lx, se, sx = build_entries_exits(np.array([]), phase_array=np.array([]))
         assert len(le) == 0
 
+    def test_input_layout_reuses_one_kernel_specialization(self):
+        close, phase = _make_price_series(n=200, period=50)
+        c_order = np.column_stack([close.values, close.values * 1.01])
+        f_order = np.asfortranarray(c_order)
+        p_2d = np.column_stack([phase, phase])
+
+        expected = build_entries_exits(c_order, phase_array=p_2d, macro_filter_type="chop")
+        n_signatures = len(simulate_portfolio_nb.signatures)
+        actual = build_entries_exits(f_order, phase_array=np.asfortranarray(p_2d), macro_filter_type="chop")
+        assert len(simulate_portfolio_nb.signatures) == n_signatures
+        for exp, act in zip(expected, actual):
+            np.testing.assert_array_equal(exp, act)
+
+    def test_entries_go_to_best_ranked_assets(self):
+        close, phase = _make_price_series(n=300, period=50)
+        c_2d = np.column_stack([close.values] * 4)
+        p_2d = np.column_stack([phase] * 4)
+        rank = np.tile([1.0, 3.0, 2.0, np.nan], (len(close), 1))
+
+        le, _, _, _ = build_entries_exits(
+            c_2d, phase_array=p_2d, rank_metric=rank, max_concurrent_trades=2, macro_filter_type="chop"
+        )
+        assert le.any()
+        # NaN ranks ahead of any score (as the descending argsort did), then the highest score
+        assert le[:, 3].any() and le[:, 1].any()
+        assert not le[:, 0].any() and not le[:, 2].any()
+
+    def test_scalar_hurst_matches_dense_array(self):
+        close, phase = _make_price_series(n=300, period=50)
+        c_2d = np.column_stack([close.values, close.values * 1.01])
+        p_2d = np.column_stack([phase, phase])
+
+        expected = build_entries_exits(c_2d, phase_array=p_2d, hurst_value=np.full(c_2d.shape, 0.7), macro_filter_type="hurst")
+        actual = build_entries_exits(c_2d, phase_array=p_2d, hurst_value=0.7, macro_filter_type="hurst")
+        for exp, act in zip(expected, actual):
+            np.testing.assert_array_equal(exp, act)
+
+    def test_prewrapped_phase_matches_raw_phase(self):
+        close, phase = _make_price_series(n=300, period=50)
+        raw_phase = phase * 3.0 - 4.0  # outside [0, 2π) on both sides
+        expected = build_entries_exits(close.values, phase_array=raw_phase, macro_filter_type="chop")
+        actual = build_entries_exits(
+            close.values, phase_array=_wrap_phase(raw_phase), phase_wrapped=True, macro_filter_type="chop"
+        )
+        for exp, act in zip(expected, actual):
+            np.testing.assert_array_equal(exp, act)
+
+    def test_float32_signals_match_float64(self):
+        close, phase = _make_price_series(n=500, period=50)
+        rng = np.random.default_rng(3)
+        ltf = rng.uniform(20.0, 80.0, len(close))
+        vol_z = rng.normal(0.0, 1.0, len(close))
+        kwargs = dict(macro_filter_type="chop", htf_threshold=100.0)
+        expected = build_entries_exits(close.values, phase_array=phase, ltf_metric=ltf, volatility_zscore=vol_z, **kwargs)
+        actual = build_entries_exits(
+            close.values, phase_array=phase.astype(np.float32),
+            ltf_metric=ltf.astype(np.float32), volatility_zscore=vol_z.astype(np.float32), **kwargs,
+        )
+        for exp, act in zip(expected, actual):
+            np.testing.assert_array_equal(exp, act)
+
 
 class TestRunBacktest:
     def test_returns_dict_with_metrics(self):
@@ -74,6 +148,30 @@ class TestRunBacktest:
         assert result is not None
 
 
+class TestPositionSize:
+    def test_matches_vectorized_formula(self):
+        rng = np.random.default_rng(0)
+        close = 100.0 + rng.random((50, 3))
+        atr = rng.random((50, 3))
+        atr[5, 1] = np.nan
+        close[7, 2] = np.nan
+        long_entries = rng.random((50, 3)) < 0.3
+        short_entries = ~long_entries & (rng.random((50, 3)) < 0.3)
+        long_entries[[5, 7], [1, 2]] = True
+
+        fraction = np.minimum(0.02 * (close / (2.0 * np.maximum(atr, close * 0.002))), 1.0)
+        expected = np.where(long_entries | short_entries, fraction, np.nan)
+        np.testing.assert_array_equal(_position_size(close, atr, long_entries, short_entries, 0.02, 2.0), expected)
+
+    def test_1d_and_missing_atr(self):
+        close = np.array([100.0, 101.0, 102.0])
+        entries = np.array([False, True, False])
+        size = _position_size(close, np.array([1.0, 0.01, 1.0]), entries, np.zeros(3, dtype=bool), 0.02, 2.0)
+        assert size.shape == (3,)
+        assert size[1] == 1.0  # floored ATR, capped at full equity
+        assert np.isnan(_position_size(close, None, entries, entries, 0.02, 2.0)).all()
+
+
 class TestRunParameterSweep:
     def test_returns_dataframe_with_expected_columns(self):
         close, phase = _make_price_series(n=300)
@@ -102,3 +200,170 @@ class TestRunParameterSweep:
         close, phase = _make_price_series(n=300)
         df = run_parameter_sweep(close, phase_array=phase)
         assert len(df) == 450
+
+    def test_parallel_sweep_matches_serial(self):
+        close, phase = _make_price_series(n=300)
+        kwargs = dict(
+            phase_array=phase,
+            hurst_range=[0.5, 0.6],
+            phase_long_range=[4.0, 5.0],
+            phase_short_range=[1.0],
+            trailing_multiplier_range=[2.0],
+        )
+        serial = run_parameter_sweep(close, **kwargs)
+        parallel = run_parameter_sweep(close, workers=2, **kwargs)
+        pd.testing.assert_frame_equal(serial, parallel)
+
+    def test_parallel_sweep_after_indicator_kernels(self):
+        # cmd_backtest runs the ATR kernel before forking the sweep pool
+        close, phase = _make_price_series(n=300)
+        arr = close.to_numpy()
+        _atr_sma_grouped(arr + 1.0, arr - 1.0, arr, group_starts(np.zeros(len(arr))), 14)
+        df = run_parameter_sweep(
+            close, phase_array=phase, workers=2,
+            hurst_range=[0.5], phase_long_range=[4.0, 5.0],
+            phase_short_range=[1.0], trailing_multiplier_range=[2.0],
+        )
+        assert len(df) == 2
+
+    def test_shared_inputs_round_trip(self):
+        close, phase = _make_price_series(n=50)
+        shared, blocks = _share_sweep_inputs({"close": close, "phase_array": phase, "freq": "1D"})
+        try:
+            assert shared["freq"] == "1D"
+            assert shared["close"][0] == "__shm__"
+            pd.testing.assert_series_equal(_attach_shared_input(shared["close"][1]), close)
+            np.testing.assert_array_equal(_attach_shared_input(shared["phase_array"][1]), phase)
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+
+    def test_iter_sweep_yields_rows_lazily(self):
+        close, phase = _make_price_series(n=300)
+        rows = iter_parameter_sweep(
+            close, phase_array=phase,
+            hurst_range=[0.5, 0.6],
+            phase_long_range=[4.712],
+            phase_short_range=[1.571],
+            trailing_multiplier_range=[2.0],
+        )
+        first = next(rows)
+        assert first["hurst_threshold"] == 0.5
+        assert [r["hurst_threshold"] for r in rows] == [0.6]
+
+    def test_closing_parallel_sweep_cancels_pending_combos(self, monkeypatch):
+        from concurrent.futures import ProcessPoolExecutor
+
+        calls = []
+        original = ProcessPoolExecutor.shutdown
+
+        def shutdown(self, wait=True, *, cancel_futures=False):
+            calls.append(cancel_futures)
+            return original(self, wait=wait, cancel_futures=cancel_futures)
+
+        monkeypatch.setattr(ProcessPoolExecutor, "shutdown", shutdown)
+        close, phase = _make_price_series(n=300)
+        rows = iter_parameter_sweep(
+            close, phase_array=phase, workers=2,
+            hurst_range=[0.5, 0.6], phase_long_range=[4.0, 4.5, 5.0, 5.5],
+            phase_short_range=[1.0, 1.5], trailing_multiplier_range=[2.0],
+        )
+        next(rows)
+        rows.close()
+        assert calls[0] is True
+
+    def test_prune_skips_dominated_siblings(self):
+        from itertools import product
+
+        combos = list(product([0.5, 0.6], range(12), [1.0], [2.0], ["both"]))
+
+        def evaluate(batch):
+            return [
+                {"hurst_threshold": p[0], "phase_long": p[1], "sharpe_ratio": -10.0 if p[1] == 0 else 1.0, "total_trades": 5}
+                for p in batch
+            ]
+
+        rows = list(_dispatch_sweep(combos, evaluate, prune=True))
+        assert len(rows) == 23
+        assert not any(r["hurst_threshold"] == 0.6 and r["phase_long"] == 0 for r in rows)
+        assert len(list(_dispatch_sweep(combos, evaluate, prune=False))) == 24
+
+    def test_batched_sweep_matches_run_backtest(self):
+        close, phase = _make_price_series(n=300)
+        atr = pd.Series(1.0, index=close.index)
+        df = run_parameter_sweep(
+            close, atr=atr, phase_array=phase, hurst_value=0.7,
+            hurst_range=[0.5, 0.6], phase_long_range=[4.0, 4.712],
+            phase_short_range=[1.571], trailing_multiplier_range=[2.0],
+        )
+        for row in df.itertuples():
+            single = run_backtest(
+                close, atr=atr, phase_array=phase, hurst_value=0.7,
+                hurst_threshold=row.hurst_threshold, ltf_threshold=50 - 118 * (row.hurst_threshold - 0.5),
+                htf_threshold=45, macro_filter_type="both", trailing_multiplier=2.0,
+                phase_long_center=row.phase_long, phase_short_center=row.phase_short,
+                breakeven_threshold=2.0, risk_per_trade=0.02,
+            )
+            assert row.total_trades == single["total_trades"]
+            np.testing.assert_allclose(row.total_return, single["total_return"])
+            np.testing.assert_allclose(row.sharpe_ratio, single["sharpe_ratio"])
+
+    def test_sweep_keeps_every_macro_filter_type(self):
+        close, phase = _make_price_series(n=300)
+        df = run_parameter_sweep(
+            close, phase_array=phase,
+            hurst_range=[0.5],
+            phase_long_range=[4.712],
+            phase_short_range=[1.571],
+            trailing_multiplier_range=[2.0],
+            macro_filter_type_range=["hurst", "chop", "both"],
+        )
+        assert sorted(df["macro_filter_type"]) == ["both", "chop", "hurst"]
+
+
+class TestRunMultiresSweep:
+    def test_refines_around_coarse_winner(self):
+        close, phase = _make_price_series(n=300)
+        df = run_multires_sweep(
+            close, phase_array=phase,
+            hurst_range=[0.5, 0.6],
+            phase_long_range=[4.0, 4.4, 4.712, 5.0, 5.5, 6.0, 6.2, 6.28],
+            phase_short_range=[1.571],
+            trailing_multiplier_range=[2.0],
+            refine_factor=3,
+        )
+        assert "sharpe_ratio" in df.columns
+        # Coarse stage covers phase_long endpoints + midpoint, refinement adds neighbours
+        assert len(df) > 2 * 3
+        assert not df.duplicated(subset=["hurst_threshold", "phase_long", "phase_short", "trailing_multiplier", "macro_filter_type"]).any()
+
+    def test_evaluates_fewer_points_than_grid_for_default_ranges(self, monkeypatch):
+        from src.backtest import vbt_runner
+        from src.config import StrategyConfig
+
+        evaluated = []
+
+        def fake_batch(batch, inputs=None):
+            evaluated.extend(batch)
+            return [
+                {
+                    "hurst_threshold": h, "phase_long": pl, "phase_short": ps,
+                    "trailing_multiplier": tm, "macro_filter_type": mft,
+                    "sharpe_ratio": -abs(h - 0.45) - abs(pl - 4.712), "total_trades": 5,
+                }
+                for h, pl, ps, tm, mft in batch
+            ]
+
+        monkeypatch.setattr(vbt_runner, "_run_sweep_batch", fake_batch)
+        strategy = StrategyConfig()
+        ranges = (
+            strategy.backtest_hurst_range, strategy.backtest_phase_long_range,
+            strategy.backtest_phase_short_range, strategy.backtest_trailing_atr_multiplier_range,
+        )
+        close, _ = _make_price_series(n=50)
+        df = run_multires_sweep(close, *ranges, refine_factor=3)
+
+        grid_size = int(np.prod([len(r) for r in ranges]))
+        assert len(evaluated) < grid_size
+        assert len(evaluated) == len(set(evaluated)) == len(df)